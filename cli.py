@@ -0,0 +1,255 @@
+"""
+Командная строка пакетных расчетов
+Читает конфигурации из CSV или JSON Lines, рассчитывает массу пакетным
+калькулятором и потоково выводит результаты без графического интерфейса.
+
+Конфигурация - строка со столбцами слотов (frame, motor, battery,
+flight_controller, propeller, camera), значения - ID или название
+компонента; количества задаются столбцами <слот>_qty (по умолчанию 1),
+необязательный столбец label переносится в результат.
+
+Использование:
+    python cli.py [файл] [--input-format csv|jsonl] [--output ФАЙЛ]
+                  [--output-format csv|jsonl] [--reports-dir ДИР]
+                  [--report-format text] [--workers N] [--chunk-size N] [--db ПУТЬ]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from database.db_manager import DatabaseManager
+from modules.batch import BatchCalculator, CatalogLookup, load_catalog
+from modules.calculator import DroneCalculator
+from modules.report import REPORT_FORMATS, ReportGenerator
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(ROOT, "database", "drone_components.db")
+
+# Столбцы результата
+OUTPUT_COLUMNS = ['row', 'label', 'total_mass', 'category', 'error']
+
+
+def read_configurations(stream: TextIO, input_format: str) -> Iterator[Dict]:
+    """
+    Читает конфигурации из потока
+
+    Args:
+        stream: Текстовый поток
+        input_format: 'csv' (с заголовком) или 'jsonl' (объект на строку)
+
+    Yields:
+        Словари {столбец: значение}
+    """
+    if input_format == 'csv':
+        yield from csv.DictReader(stream)
+    elif input_format == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Неизвестный формат ввода: {input_format}")
+
+
+def evaluate_rows(items: List[Tuple[int, Dict]], lookup: CatalogLookup,
+                  batch_calculator: BatchCalculator,
+                  report_gen: Optional[ReportGenerator] = None,
+                  reports_dir: Optional[str] = None,
+                  report_format: str = 'text') -> List[Dict]:
+    """
+    Рассчитывает порцию конфигураций одним векторным проходом
+
+    Args:
+        items: Список (номер строки, конфигурация)
+        lookup: Поиск компонентов каталога
+        batch_calculator: Пакетный калькулятор
+        report_gen: Генератор отчетов (нужен при reports_dir)
+        reports_dir: Директория для отчетов по валидным строкам
+        report_format: Формат отчетов из REPORT_FORMATS
+
+    Returns:
+        Список результатов {'row', 'label', 'total_mass', 'category', 'error'}
+    """
+    results, configurations = batch_calculator.calculate_configurations(
+        [row for _, row in items], lookup)
+
+    for (number, _), result, components in zip(items, results, configurations):
+        result['row'] = number
+        if reports_dir and result['total_mass'] is not None:
+            report = report_gen.render_report(
+                batch_calculator.calculator.calculate_total_mass(components), None, report_format)
+            path = os.path.join(reports_dir, f"report_{number:08d}{REPORT_FORMATS[report_format]}")
+            with open(path, 'w', encoding='utf-8', newline='' if report_format == 'csv' else None) as f:
+                f.write(report)
+
+    return [{column: result[column] for column in OUTPUT_COLUMNS} for result in results]
+
+
+# Объекты рабочего процесса создаются один раз на процесс
+_worker_state = {}
+
+
+def _init_worker(db_path: str):
+    """Загружает каталог и создает калькуляторы рабочего процесса"""
+    calculator = DroneCalculator()
+    _worker_state['lookup'] = CatalogLookup(load_catalog(DatabaseManager(db_path)))
+    _worker_state['batch'] = BatchCalculator(calculator=calculator)
+    _worker_state['report_gen'] = ReportGenerator()
+
+
+def _evaluate_batch(items: List[Tuple[int, Dict]], reports_dir: Optional[str],
+                    report_format: str) -> List[Dict]:
+    """Рассчитывает порцию в рабочем процессе"""
+    return evaluate_rows(items, _worker_state['lookup'], _worker_state['batch'],
+                         _worker_state['report_gen'], reports_dir, report_format)
+
+
+def _batched(rows: Iterable[Dict], size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    """Делит поток конфигураций на порции с номерами строк"""
+    batch = []
+    for number, row in enumerate(rows, 1):
+        batch.append((number, row))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ResultWriter:
+    """Потоковая запись результатов в CSV или JSON Lines"""
+
+    def __init__(self, stream: TextIO, output_format: str):
+        if output_format not in ('csv', 'jsonl'):
+            raise ValueError(f"Неизвестный формат вывода: {output_format}")
+        self.stream = stream
+        self.writer = None
+        if output_format == 'csv':
+            self.writer = csv.DictWriter(stream, fieldnames=OUTPUT_COLUMNS, lineterminator='\n')
+            self.writer.writeheader()
+
+    def write(self, results: List[Dict]):
+        """Записывает порцию результатов"""
+        if self.writer:
+            self.writer.writerows(results)
+        else:
+            self.stream.writelines(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+        self.stream.flush()
+
+
+def run(rows: Iterable[Dict], output: TextIO, db_path: str = DEFAULT_DB_PATH,
+        output_format: str = 'csv', workers: int = 1, chunk_size: int = 10000,
+        reports_dir: Optional[str] = None, report_format: str = 'text') -> Dict:
+    """
+    Рассчитывает конфигурации и потоково записывает результаты
+
+    Порции рассчитываются в пуле процессов (при workers > 1), результаты
+    записываются в порядке входных строк; в памяти одновременно находится
+    не больше 2 * workers порций.
+
+    Args:
+        rows: Итератор конфигураций
+        output: Поток для результатов
+        db_path: Путь к базе данных компонентов
+        output_format: 'csv' или 'jsonl'
+        workers: Количество процессов
+        chunk_size: Количество конфигураций в порции
+        reports_dir: Директория для отчетов (None - без отчетов)
+        report_format: Формат отчетов из REPORT_FORMATS
+
+    Returns:
+        Словарь {'rows', 'valid', 'rejected', 'elapsed', 'rows_per_second'}
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {report_format}")
+    if reports_dir:
+        os.makedirs(reports_dir, exist_ok=True)
+
+    writer = ResultWriter(output, output_format)
+    started = time.perf_counter()
+    stats = {'rows': 0, 'valid': 0, 'rejected': 0}
+
+    def write(results: List[Dict]):
+        writer.write(results)
+        stats['rows'] += len(results)
+        stats['rejected'] += sum(1 for result in results if result['error'])
+
+    if workers <= 1:
+        _init_worker(db_path)
+        for batch in _batched(rows, chunk_size):
+            write(_evaluate_batch(batch, reports_dir, report_format))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(db_path,)) as executor:
+            pending = deque()
+            for batch in _batched(rows, chunk_size):
+                # Окно задач ограничено, чтобы не держать весь ввод в памяти
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+                pending.append(executor.submit(_evaluate_batch, batch, reports_dir, report_format))
+            while pending:
+                write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - started
+    stats['valid'] = stats['rows'] - stats['rejected']
+    stats['elapsed'] = elapsed
+    stats['rows_per_second'] = stats['rows'] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+
+def _detect_format(path: Optional[str], stream: TextIO) -> str:
+    """Определяет формат ввода по расширению или первому символу потока"""
+    if path and path != '-':
+        return 'jsonl' if path.lower().endswith(('.jsonl', '.json')) else 'csv'
+    first = stream.buffer.peek(1)[:1] if hasattr(stream, 'buffer') else b''
+    return 'jsonl' if first == b'{' else 'csv'
+
+
+def main(argv: List[str] = None) -> int:
+    """Главная функция командной строки"""
+    parser = argparse.ArgumentParser(description="Пакетный расчет массы конфигураций дрона")
+    parser.add_argument('input', nargs='?', default='-', help="Файл конфигураций (- или пусто - stdin)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'], default=None,
+                        help="Формат ввода (по умолчанию - по расширению или содержимому)")
+    parser.add_argument('--output', default='-', help="Файл результатов (по умолчанию - stdout)")
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], default='csv',
+                        help="Формат результатов")
+    parser.add_argument('--reports-dir', default=None, help="Директория для отчетов по конфигурациям")
+    parser.add_argument('--report-format', choices=list(REPORT_FORMATS), default='text',
+                        help="Формат отчетов")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Количество процессов")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Конфигураций в порции")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Путь к базе данных компонентов")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8-sig', newline='')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        input_format = args.input_format or _detect_format(args.input, source)
+        stats = run(read_configurations(source, input_format), target, args.db,
+                    args.output_format, args.workers, args.chunk_size,
+                    args.reports_dir, args.report_format)
+    except (OSError, ValueError) as e:
+        print(f"✗ Ошибка: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"Обработано строк: {stats['rows']} (валидных {stats['valid']}, "
+          f"отклонено {stats['rejected']}) за {stats['elapsed']:.2f} с - "
+          f"{stats['rows_per_second']:.0f} строк/с", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,21 +5,85 @@
 
 import sqlite3
 import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+
+# Максимум параметров в одном запросе WHERE id IN (...)
+MAX_QUERY_IDS = 500
+
+# Ожидание снятия блокировки внутри SQLite, секунды
+BUSY_TIMEOUT = 5.0
+# Повторы операции при SQLITE_BUSY и задержки между ними, секунды
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.05
+RETRY_MAX_DELAY = 1.0
+# Максимум операций записи в одной транзакции
+MAX_WRITE_BATCH = 100
+# Простой, после которого поток записи завершается, секунды
+WRITER_IDLE_TIMEOUT = 1.0
+
+# Слоты истории расчетов: таблица без любого из их столбцов пересоздается
+HISTORY_SLOTS = ('frame', 'motor', 'battery', 'flight_controller', 'propeller', 'camera')
+HISTORY_COLUMNS = {'id', 'timestamp', 'total_mass'} | {
+    f'{slot}_{field}' for slot in HISTORY_SLOTS for field in ('id', 'name', 'mass', 'qty')
+}
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """Проверяет, вызвана ли ошибка занятой базой данных (SQLITE_BUSY/SQLITE_LOCKED)"""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
 
-class DatabaseManager:
-    """Класс для управления базой данных дронов"""
 
-    def __init__(self, db_path: str = "database/drone_components.db"):
+class DatabaseManager:
+    """
+    Класс для управления базой данных дронов
+
+    Один экземпляр можно использовать из нескольких потоков:
+    - чтение выполняется в вызывающем потоке на отдельном соединении,
+      поэтому читатели не ждут друг друга;
+    - записи ставятся в очередь и выполняются по одной потоком записи,
+      накопившиеся в очереди записи фиксируются одной транзакцией
+      (ошибка одной записи откатывает только ее);
+    - при занятой базе данных (в том числе другим процессом) SQLite ждет
+      busy_timeout, после чего операция повторяется с нарастающей задержкой.
+    """
+
+    def __init__(self, db_path: str = "database/drone_components.db",
+                 busy_timeout: float = BUSY_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 wal: bool = False):
         """
         Инициализация менеджера базы данных
 
         Args:
             db_path: Путь к файлу базы данных
+            busy_timeout: Ожидание блокировки внутри SQLite в секундах
+            max_retries: Количество повторов операции при SQLITE_BUSY
+            wal: Перевести базу данных в режим WAL (чтение не блокируется
+                записью; режим сохраняется в файле базы данных)
         """
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.max_retries = max_retries
+        # Подписчики на изменения данных (см. subscribe)
+        self._subscribers = []
+
+        # Очередь записей: [(функция, Future)], обслуживается потоком записи
+        self._write_queue = deque()
+        self._writer_condition = threading.Condition()
+        self._writer_running = False
+
         self._ensure_database_exists()
+        if wal:
+            self._read(lambda conn: conn.execute("PRAGMA journal_mode=WAL").fetchone())
         self._create_tables()
         self._populate_initial_data()
 
@@ -29,13 +93,130 @@ class DatabaseManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Создает подключение к базе данных"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
         conn.row_factory = sqlite3.Row
         return conn
 
+    def _retry(self, func: Callable, *args):
+        """
+        Выполняет операцию, повторяя ее при SQLITE_BUSY
+
+        Задержка между попытками удваивается (со случайным разбросом,
+        чтобы конкурирующие потоки не повторяли одновременно).
+
+        Args:
+            func: Операция
+            *args: Аргументы операции
+
+        Returns:
+            Результат операции
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                if attempt == self.max_retries or not _is_busy(e):
+                    raise
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _read(self, func: Callable[[sqlite3.Connection], object]):
+        """
+        Выполняет чтение на отдельном соединении вызывающего потока
+
+        Args:
+            func: Функция, получающая соединение
+
+        Returns:
+            Результат функции
+        """
+        def attempt():
+            conn = self._get_connection()
+            try:
+                return func(conn)
+            finally:
+                conn.close()
+        return self._retry(attempt)
+
+    def _query(self, query: str, params=()) -> List[Dict]:
+        """Выполняет SELECT и возвращает строки словарями"""
+        return self._read(lambda conn: [dict(row) for row in conn.execute(query, params).fetchall()])
+
+    def _write(self, func: Callable[[sqlite3.Connection], object]):
+        """
+        Выполняет запись в потоке записи и ждет ее фиксации
+
+        Args:
+            func: Функция, получающая соединение с открытой транзакцией
+                (фиксировать транзакцию не нужно)
+
+        Returns:
+            Результат функции
+        """
+        future = Future()
+        with self._writer_condition:
+            self._write_queue.append((func, future))
+            if not self._writer_running:
+                self._writer_running = True
+                threading.Thread(target=self._writer_loop, name='db-writer', daemon=True).start()
+            self._writer_condition.notify()
+        return future.result()
+
+    def _writer_loop(self):
+        """Обслуживает очередь записей; завершается после простоя"""
+        while True:
+            with self._writer_condition:
+                if not self._write_queue:
+                    self._writer_condition.wait(WRITER_IDLE_TIMEOUT)
+                if not self._write_queue:
+                    self._writer_running = False
+                    return
+                count = min(len(self._write_queue), MAX_WRITE_BATCH)
+                batch = [self._write_queue.popleft() for _ in range(count)]
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: List[Tuple[Callable, Future]]):
+        """Выполняет порцию записей одной транзакцией"""
+        outcomes = []
+        conn = None
+        try:
+            conn = self._get_connection()
+            # Транзакции управляются явно: BEGIN IMMEDIATE сразу берет блокировку записи
+            conn.isolation_level = None
+            self._retry(conn.execute, "BEGIN IMMEDIATE")
+            for func, future in batch:
+                conn.execute("SAVEPOINT write_operation")
+                try:
+                    result = func(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_operation")
+                    outcomes.append((future, None, e))
+                else:
+                    outcomes.append((future, result, None))
+                conn.execute("RELEASE write_operation")
+            self._retry(conn.execute, "COMMIT")
+        except Exception as e:
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            if conn is not None:
+                conn.close()
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
     def _create_tables(self):
         """Создает таблицы в базе данных"""
-        conn = self._get_connection()
+        self._write(self._create_schema)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Создает таблицы (в транзакции потока записи)"""
         cursor = conn.cursor()
 
         # Таблица корпусов
@@ -100,8 +281,10 @@ class DatabaseManager:
             )
         """)
 
-        # Таблица истории расчетов
-        cursor.execute("DROP TABLE IF EXISTS calculations_history;")
+        # Таблица истории расчетов (пересоздается, только если схема устарела)
+        history_columns = {row['name'] for row in cursor.execute("PRAGMA table_info(calculations_history)")}
+        if history_columns and not HISTORY_COLUMNS <= history_columns:
+            cursor.execute("DROP TABLE calculations_history")
         cursor.execute("""
                        CREATE TABLE IF NOT EXISTS calculations_history
                        (
@@ -142,18 +325,17 @@ class DatabaseManager:
                        );
                        """)
 
-        conn.commit()
-        conn.close()
-
     def _populate_initial_data(self):
         """Заполняет базу данных начальными данными"""
-        conn = self._get_connection()
+        self._write(self._insert_initial_data)
+
+    def _insert_initial_data(self, conn: sqlite3.Connection):
+        """Добавляет начальные компоненты в пустую базу (в транзакции потока записи)"""
         cursor = conn.cursor()
 
-        # Проверяем, есть ли уже данные
+        # Проверяем, есть ли уже данные (в той же транзакции, что и вставка)
         cursor.execute("SELECT COUNT(*) FROM frames")
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return
 
         # Корпуса
@@ -234,8 +416,42 @@ class DatabaseManager:
             cameras_data
         )
 
-        conn.commit()
-        conn.close()
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """
+        Подписывает на изменения данных
+
+        Обработчик вызывается после фиксации изменений в том потоке,
+        который вызвал изменяющий метод, со словарем
+        {'table': str, 'inserted': [ID], 'updated': [ID], 'deleted': [ID]}.
+
+        Args:
+            callback: Обработчик изменений
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        """
+        Отменяет подписку на изменения данных
+
+        Args:
+            callback: Обработчик, переданный в subscribe
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _notify(self, table_name: str, inserted: List[int] = (), updated: List[int] = (),
+                deleted: List[int] = ()):
+        """Передает изменение таблицы подписчикам"""
+        if not self._subscribers:
+            return
+        event = {
+            'table': table_name,
+            'inserted': list(inserted),
+            'updated': list(updated),
+            'deleted': list(deleted)
+        }
+        for callback in list(self._subscribers):
+            callback(event)
 
     def get_components(self, table_name: str) -> List[Dict]:
         """
@@ -247,13 +463,7 @@ class DatabaseManager:
         Returns:
             Список словарей с данными компонентов
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [dict(row) for row in rows]
+        return self._query(f"SELECT * FROM {table_name}")
 
     def add_component(self, table_name: str, data: Dict) -> int:
         """
@@ -266,20 +476,57 @@ class DatabaseManager:
         Returns:
             ID добавленного компонента
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['?' for _ in data])
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        values = list(data.values())
 
-        cursor.execute(query, list(data.values()))
-        component_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        component_id = self._write(lambda conn: conn.execute(query, values).lastrowid)
 
+        self._notify(table_name, inserted=[component_id])
         return component_id
 
+    def add_components(self, table_name: str, rows: List[Dict]) -> int:
+        """
+        Добавляет несколько компонентов одной транзакцией
+
+        Args:
+            table_name: Название таблицы
+            rows: Список словарей с одинаковым набором полей
+
+        Returns:
+            Количество добавленных компонентов
+        """
+        if not rows:
+            return 0
+
+        keys = list(rows[0].keys())
+        columns = ', '.join(keys)
+        placeholders = ', '.join(['?' for _ in keys])
+        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+
+        def insert(conn):
+            conn.executemany(query, ([row[key] for key in keys] for row in rows))
+            # В одной транзакции AUTOINCREMENT выдает идущие подряд ID
+            return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        last_id = self._write(insert)
+
+        self._notify(table_name, inserted=range(last_id - len(rows) + 1, last_id + 1))
+        return len(rows)
+
+    def get_table_columns(self, table_name: str) -> List[str]:
+        """
+        Получает список столбцов таблицы
+
+        Args:
+            table_name: Название таблицы
+
+        Returns:
+            Список названий столбцов
+        """
+        return [row['name'] for row in self._query(f"PRAGMA table_info({table_name})")]
+
     def update_component(self, table_name: str, component_id: int, data: Dict):
         """
         Обновляет данные компонента
@@ -289,15 +536,13 @@ class DatabaseManager:
             component_id: ID компонента
             data: Словарь с новыми данными
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         set_clause = ', '.join([f"{key} = ?" for key in data.keys()])
         query = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+        values = list(data.values()) + [component_id]
+
+        self._write(lambda conn: conn.execute(query, values))
 
-        cursor.execute(query, list(data.values()) + [component_id])
-        conn.commit()
-        conn.close()
+        self._notify(table_name, updated=[component_id])
 
     def delete_component(self, table_name: str, component_id: int):
         """
@@ -307,11 +552,9 @@ class DatabaseManager:
             table_name: Название таблицы
             component_id: ID компонента
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (component_id,))
-        conn.commit()
-        conn.close()
+        self._write(lambda conn: conn.execute(f"DELETE FROM {table_name} WHERE id = ?", (component_id,)))
+
+        self._notify(table_name, deleted=[component_id])
 
     def save_calculation(self, calculation_data: Dict) -> int:
         """
@@ -323,20 +566,16 @@ class DatabaseManager:
         Returns:
             ID сохраненного расчета
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         calculation_data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         columns = ', '.join(calculation_data.keys())
         placeholders = ', '.join(['?' for _ in calculation_data])
         query = f"INSERT INTO calculations_history ({columns}) VALUES ({placeholders})"
+        values = list(calculation_data.values())
 
-        cursor.execute(query, list(calculation_data.values()))
-        calc_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        calc_id = self._write(lambda conn: conn.execute(query, values).lastrowid)
 
+        self._notify('calculations_history', inserted=[calc_id])
         return calc_id
 
     def get_calculation_history(self, limit: int = 50) -> List[Dict]:
@@ -349,16 +588,162 @@ class DatabaseManager:
         Returns:
             Список расчетов
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        return self._query(
             "SELECT * FROM calculations_history ORDER BY timestamp DESC LIMIT ?",
             (limit,)
         )
-        rows = cursor.fetchall()
-        conn.close()
 
-        return [dict(row) for row in rows]
+    def get_calculation_page(self, before_id: Optional[int] = None, limit: int = 50) -> List[Dict]:
+        """
+        Получает страницу истории расчетов (новые записи первыми)
+
+        Страница выбирается по ключу (id < before_id) через индекс первичного
+        ключа, поэтому время чтения не зависит от глубины страницы.
+
+        Args:
+            before_id: ID последней записи предыдущей страницы (None - с начала)
+            limit: Размер страницы
+
+        Returns:
+            Список расчетов
+        """
+        if before_id is None:
+            return self._query(
+                "SELECT * FROM calculations_history ORDER BY id DESC LIMIT ?", (limit,)
+            )
+        return self._query(
+            "SELECT * FROM calculations_history WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit)
+        )
+
+    def get_calculation_boundary(self, before_id: Optional[int], skip: int) -> Optional[int]:
+        """
+        Находит границу страницы, отстоящей на skip записей от before_id
+
+        Читается только столбец id, поэтому переход к далекой странице не
+        загружает строки промежуточных страниц.
+
+        Args:
+            before_id: Известная граница (None - начало истории)
+            skip: Количество пропускаемых записей
+
+        Returns:
+            ID для get_calculation_page или None, если записей меньше skip
+        """
+        if skip <= 0:
+            return before_id
+        where, params = ("WHERE id < ? ", [before_id]) if before_id is not None else ("", [])
+        rows = self._query(
+            f"SELECT id FROM calculations_history {where}ORDER BY id DESC LIMIT 1 OFFSET ?",
+            params + [skip - 1]
+        )
+        return rows[0]['id'] if rows else None
+
+    def iter_calculation_history(self, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Построчно перебирает всю историю расчетов
+
+        Записи читаются порциями через fetchmany, поэтому память не
+        зависит от размера истории.
+
+        Args:
+            batch_size: Количество записей в одной порции
+
+        Yields:
+            Словари с данными расчетов в порядке возрастания ID
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM calculations_history ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            conn.close()
+
+    def iter_calculation_rows(self, columns: List[str], after_id: int = 0,
+                              batch_size: int = 1000,
+                              upto_id: Optional[int] = None) -> Iterator[List[tuple]]:
+        """
+        Порциями перебирает выбранные столбцы истории расчетов
+
+        Args:
+            columns: Список столбцов calculations_history
+            after_id: Читать только записи с ID больше указанного
+            batch_size: Количество записей в одной порции
+            upto_id: Читать только записи с ID не больше указанного (None - все)
+
+        Yields:
+            Списки кортежей значений в порядке возрастания ID
+        """
+        known = set(self.get_table_columns('calculations_history'))
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise ValueError(f"Неизвестные столбцы истории: {unknown}")
+
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            where, params = "id > ?", [after_id]
+            if upto_id is not None:
+                where, params = "id > ? AND id <= ?", [after_id, upto_id]
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM calculations_history WHERE {where} ORDER BY id",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_calculation_history_bounds(self) -> Tuple[int, int]:
+        """
+        Получает количество записей истории и максимальный ID
+
+        Returns:
+            Кортеж (количество, максимальный ID или 0)
+        """
+        count, max_id = self._read(lambda conn: tuple(conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM calculations_history"
+        ).fetchone()))
+        return count, max_id
+
+    def get_calculations_by_ids(self, calc_ids: List[int]) -> List[Dict]:
+        """
+        Получает несколько расчетов (запросами по MAX_QUERY_IDS)
+
+        Args:
+            calc_ids: Список ID расчетов
+
+        Returns:
+            Список расчетов в порядке calc_ids (отсутствующие ID пропускаются)
+        """
+        calc_ids = list(calc_ids)
+        if not calc_ids:
+            return []
+
+        def read(conn):
+            rows = {}
+            unique_ids = list(dict.fromkeys(calc_ids))
+            for start in range(0, len(unique_ids), MAX_QUERY_IDS):
+                chunk = unique_ids[start:start + MAX_QUERY_IDS]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT * FROM calculations_history WHERE id IN ({placeholders})",
+                    chunk
+                )
+                rows.update((row['id'], dict(row)) for row in cursor.fetchall())
+            return rows
+
+        rows = self._read(read)
+        return [rows[calc_id] for calc_id in calc_ids if calc_id in rows]
 
     def delete_calculation(self, calc_id: int):
         """
@@ -367,11 +752,9 @@ class DatabaseManager:
         Args:
             calc_id: ID расчета
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM calculations_history WHERE id = ?", (calc_id,))
-        conn.commit()
-        conn.close()
+        self._write(lambda conn: conn.execute("DELETE FROM calculations_history WHERE id = ?", (calc_id,)))
+
+        self._notify('calculations_history', deleted=[calc_id])
 
     def get_component_by_id(self, table_name: str, component_id: int) -> Optional[Dict]:
         """
@@ -384,10 +767,32 @@ class DatabaseManager:
         Returns:
             Словарь с данными компонента или None
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (component_id,))
-        row = cursor.fetchone()
-        conn.close()
+        rows = self._query(f"SELECT * FROM {table_name} WHERE id = ?", (component_id,))
+        return rows[0] if rows else None
 
-        return dict(row) if row else None
+    def get_components_by_ids(self, table_name: str, component_ids: List[int]) -> List[Dict]:
+        """
+        Получает компоненты по списку ID (запросами по MAX_QUERY_IDS)
+
+        Args:
+            table_name: Название таблицы
+            component_ids: ID компонентов
+
+        Returns:
+            Список словарей найденных компонентов
+        """
+        component_ids = list(component_ids)
+
+        def read(conn):
+            components = []
+            for start in range(0, len(component_ids), MAX_QUERY_IDS):
+                chunk = component_ids[start:start + MAX_QUERY_IDS]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT * FROM {table_name} WHERE id IN ({placeholders}) ORDER BY id",
+                    chunk
+                )
+                components.extend(dict(row) for row in cursor.fetchall())
+            return components
+
+        return self._read(read)
@@ -0,0 +1,185 @@
+"""
+Нагрузочное тестирование HTTP-сервиса расчетов
+Отправляет запросы по сценариям с заданным числом одновременных клиентов
+(постоянные соединения) и показывает задержку p50/p99 и запросов в секунду.
+Без --port сервер запускается в этом же процессе на копии базы данных.
+
+Использование:
+    python load_test.py [--host АДРЕС] [--port ПОРТ] [--db ПУТЬ]
+                        [--requests N] [--concurrency N] [--scenario ИМЯ ...]
+                        [--max-p99-ms МС]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(ROOT, "database", "drone_components.db")
+
+
+def _calculate_body(rng: random.Random) -> Dict:
+    """Формирует тело запроса расчета со случайной конфигурацией"""
+    return {'configuration': {'frame': rng.randint(1, 5), 'motor': rng.randint(1, 5),
+                              'motor_qty': 4, 'battery': rng.randint(1, 5)}}
+
+
+# Сценарии: имя -> функция, возвращающая (метод, путь, тело)
+SCENARIOS: Dict[str, Callable[[random.Random], Tuple[str, str, object]]] = {
+    'search': lambda rng: ('GET', f"/components/motor?q={rng.choice(['dji', 't', 'e', 'mn'])}&limit=10", None),
+    'calculate': lambda rng: ('POST', '/calculate', _calculate_body(rng)),
+    'batch': lambda rng: ('POST', '/calculate/batch', {
+        'configurations': [_calculate_body(rng)['configuration'] for _ in range(100)]}),
+    'history': lambda rng: ('GET', f"/history?before={rng.randint(1, 1000)}&limit=20", None),
+    'report': lambda rng: ('POST', '/report', dict(_calculate_body(rng), format='json')),
+}
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                   host: str, method: str, path: str, body) -> int:
+    """Отправляет запрос в постоянном соединении и читает ответ"""
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode('latin-1')
+        + payload
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def run_scenario(host: str, port: int, scenario: str, requests: int,
+                       concurrency: int, seed: int = 0) -> Dict:
+    """
+    Выполняет сценарий нагрузки
+
+    Args:
+        host: Адрес сервера
+        port: Порт сервера
+        scenario: Имя сценария из SCENARIOS
+        requests: Общее количество запросов
+        concurrency: Количество одновременных клиентов
+        seed: Начальное значение генератора запросов
+
+    Returns:
+        Словарь {'requests', 'errors', 'p50_ms', 'p99_ms', 'rps'}
+    """
+    make_request = SCENARIOS[scenario]
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def client(number: int):
+        nonlocal remaining, errors
+        rng = random.Random(seed * 1000 + number)
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                method, path, body = make_request(rng)
+                started = time.perf_counter()
+                status = await _request(reader, writer, host, method, path, body)
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'rps': len(latencies) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Главная функция нагрузочного тестирования"""
+    parser = argparse.ArgumentParser(description="Нагрузочное тестирование сервиса расчетов")
+    parser.add_argument('--host', default='127.0.0.1', help="Адрес сервера")
+    parser.add_argument('--port', type=int, default=None,
+                        help="Порт запущенного сервера (по умолчанию - сервер в этом процессе)")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH,
+                        help="База данных для сервера в этом процессе (используется копия)")
+    parser.add_argument('--requests', type=int, default=2000, help="Запросов на сценарий")
+    parser.add_argument('--concurrency', type=int, default=32, help="Одновременных клиентов")
+    parser.add_argument('--scenario', nargs='*', choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="Сценарии нагрузки")
+    parser.add_argument('--max-p99-ms', type=float, default=None,
+                        help="Допустимая задержка p99; при превышении код возврата 1")
+    args = parser.parse_args(argv)
+
+    background = None
+    temp_dir = None
+    port = args.port
+    if port is None:
+        from database.db_manager import DatabaseManager
+        from modules.service import BackgroundServer
+
+        # Сценарии с сохранением не должны менять рабочую базу данных
+        temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(temp_dir, "load_test.db")
+        if os.path.exists(args.db):
+            shutil.copyfile(args.db, db_path)
+        background = BackgroundServer(DatabaseManager(db_path), args.host)
+        port = background.start()
+
+    print("=" * 60)
+    print(f"НАГРУЗОЧНОЕ ТЕСТИРОВАНИЕ http://{args.host}:{port}")
+    print(f"Запросов на сценарий: {args.requests}, клиентов: {args.concurrency}")
+    print("=" * 60)
+    print(f"{'Сценарий':<12}{'Запросов':>10}{'Ошибок':>8}{'p50, мс':>10}{'p99, мс':>10}{'Запр/с':>10}")
+
+    over_budget = False
+    try:
+        for scenario in args.scenario:
+            result = asyncio.run(run_scenario(args.host, port, scenario,
+                                              args.requests, args.concurrency))
+            print(f"{scenario:<12}{result['requests']:>10}{result['errors']:>8}"
+                  f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['rps']:>10.0f}")
+            if result['errors'] or (args.max_p99_ms is not None and result['p99_ms'] > args.max_p99_ms):
+                over_budget = True
+        if background is not None:
+            batcher = background.service.batcher
+            if batcher.batches:
+                print(f"\nОдиночных расчетов в пакете в среднем: {batcher.requests / batcher.batches:.1f}")
+    except OSError as e:
+        print(f"✗ Ошибка соединения: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if background is not None:
+            background.stop()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
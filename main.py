@@ -9,29 +9,53 @@
 
 import sys
 import os
+import time
 
 # Добавляем текущую директорию в путь Python
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from modules.gui import DroneCalculatorGUI
+class StartupTimer:
+    """Замер длительности этапов запуска приложения"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+
+    def mark(self, stage: str):
+        """
+        Выводит длительность этапа и время с начала запуска
+
+        Args:
+            stage: Название завершившегося этапа
+        """
+        now = time.perf_counter()
+        print(f"  {stage}: {(now - self.last) * 1000:.0f} мс "
+              f"(с начала запуска {(now - self.started) * 1000:.0f} мс)")
+        self.last = now
+
 
 def main():
     """Главная функция приложения"""
+    timer = StartupTimer()
     print("=" * 60)
     print("Запуск приложения: Калькулятор массы дрона")
     print("=" * 60)
     print("\nИнициализация компонентов...")
 
     try:
+        # GUI (customtkinter) импортируется только при запуске приложения
+        from modules.gui import DroneCalculatorGUI
+        timer.mark("Импорт модулей")
+
         # Создаем и запускаем GUI
         app = DroneCalculatorGUI()
+        timer.mark("Создание окна")
         print("✓ GUI инициализирован")
         print("✓ База данных подключена")
-        print("✓ Компоненты загружены")
-        print("\nПриложение готово к работе!")
+        print("\nПриложение готово к работе (каталог загружается в фоне)")
         print("-" * 60)
 
-        app.run()
+        app.run(startup_callback=timer.mark)
 
     except Exception as e:
         print(f"\n✗ Ошибка при запуске приложения: {e}")
@@ -0,0 +1,178 @@
+"""
+Модуль анализа конфигураций.
+Поиск оптимальных сборок по перебору пространства конфигураций.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from modules.batch import BatchCalculator, ConfigurationSpace, load_catalog
+from modules.calculator import DroneCalculator
+
+
+def pareto_frontier(costs: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Находит Парето-оптимальные точки (минимум затрат, максимум ценности)
+
+    Точки сортируются по затратам, после чего один проход с накопленным
+    максимумом ценности отбирает недоминируемые точки - O(n log n).
+
+    Args:
+        costs: Минимизируемый показатель (например, масса)
+        values: Максимизируемый показатель (например, емкость)
+
+    Returns:
+        Индексы точек фронта в порядке возрастания затрат
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if costs.size == 0:
+        return np.array([], dtype=np.int64)
+
+    # При равных затратах первой идет точка с большей ценностью
+    order = np.lexsort((-values, costs))
+    sorted_values = values[order]
+    best_before = np.maximum.accumulate(sorted_values)
+    best_before = np.concatenate(([-np.inf], best_before[:-1]))
+    return order[sorted_values > best_before]
+
+
+class ConfigurationAnalyzer:
+    """Класс для анализа пространства конфигураций дрона"""
+
+    def __init__(self, db, batch_calculator: Optional[BatchCalculator] = None,
+                 calculator: Optional[DroneCalculator] = None):
+        """
+        Инициализация анализатора
+
+        Args:
+            db: Экземпляр DatabaseManager
+            batch_calculator: Пакетный калькулятор (создается по умолчанию)
+            calculator: Калькулятор для определения категорий (создается по умолчанию)
+        """
+        self.db = db
+        self.batch = batch_calculator or BatchCalculator()
+        self.calculator = calculator or DroneCalculator()
+
+    def mass_capacity_frontier(self, fixed: Optional[Dict[str, object]] = None,
+                               quantities: Optional[Dict[str, int]] = None,
+                               max_plot_points: int = 20000) -> Dict:
+        """
+        Находит Парето-фронт "масса - емкость аккумулятора"
+
+        Пространство перебирается блоками: фронт каждого блока сохраняется
+        как кандидат, итоговый фронт строится по объединению кандидатов.
+
+        Args:
+            fixed: Ограничения слотов (см. ConfigurationSpace)
+            quantities: Количество компонентов по слотам
+            max_plot_points: Максимум точек выборки для диаграммы
+
+        Returns:
+            Словарь с результатами:
+            {
+                'frontier': [{'total_mass', 'capacity', 'components'}, ...],
+                'masses': np.ndarray, 'capacities': np.ndarray,  # выборка
+                'evaluated': int
+            }
+        """
+        space = ConfigurationSpace(load_catalog(self.db), quantities, fixed)
+        step = max(1, -(-space.size // max_plot_points))
+
+        candidate_index, candidate_mass, candidate_capacity = [], [], []
+        sample_mass, sample_capacity = [], []
+
+        for start, masses in self.batch.iter_chunks(space):
+            stop = start + len(masses)
+            capacities = space.column_values('battery', 'capacity', start, stop)
+
+            local = pareto_frontier(masses, capacities)
+            candidate_index.append(local + start)
+            candidate_mass.append(masses[local])
+            candidate_capacity.append(capacities[local])
+
+            first = (-start) % step
+            sample_mass.append(masses[first::step])
+            sample_capacity.append(capacities[first::step])
+
+        flat_index = np.concatenate(candidate_index)
+        masses = np.concatenate(candidate_mass)
+        capacities = np.concatenate(candidate_capacity)
+        frontier = pareto_frontier(masses, capacities)
+
+        return {
+            'frontier': [
+                {
+                    'total_mass': float(masses[i]),
+                    'capacity': float(capacities[i]),
+                    'components': space.decode(flat_index[i])
+                }
+                for i in frontier
+            ],
+            'masses': np.concatenate(sample_mass),
+            'capacities': np.concatenate(sample_capacity),
+            'evaluated': space.size
+        }
+
+    def substitution_matrix(self, base_components: Dict[str, Dict]) -> Dict:
+        """
+        Строит матрицу замен "что если" для базовой конфигурации
+
+        Для каждого компонента каталога вычисляется изменение общей массы
+        при его установке в соответствующий слот вместо текущего. Расчет
+        выполняется одной векторной разностью по всему каталогу.
+
+        Args:
+            base_components: Базовая конфигурация в формате calculate_total_mass
+                (незаполненные слоты считаются пустыми)
+
+        Returns:
+            Словарь с результатами:
+            {
+                'base_total': float,
+                'base_category': str,
+                'rows': [{'slot', 'id', 'name', 'unit_mass', 'delta',
+                          'total_mass', 'category', 'category_changed'}, ...]
+            }
+        """
+        catalog = load_catalog(self.db)
+        slots = list(catalog)
+        base_total = self.calculator.calculate_total_mass(base_components)['total_mass']
+        base_category = self.calculator.get_weight_category(base_total)
+
+        # Масса единицы и количество текущего компонента в каждом слоте
+        base_unit = np.zeros(len(slots))
+        quantities = np.ones(len(slots))
+        for position, slot in enumerate(slots):
+            comp_data = base_components.get(slot)
+            if comp_data and comp_data.get('mass') is not None:
+                base_unit[position] = comp_data['mass']
+                quantities[position] = comp_data.get('qty', 1)
+
+        entries = [(position, c) for position, slot in enumerate(slots) for c in catalog[slot]]
+        slot_index = np.array([position for position, _ in entries], dtype=np.int64)
+        unit_mass = np.array([c['mass'] for _, c in entries], dtype=np.float64)
+
+        deltas = (unit_mass - base_unit[slot_index]) * quantities[slot_index]
+        totals = base_total + deltas
+        categories = self.calculator.get_weight_categories(totals)
+
+        rows = []
+        for (position, component), delta, total, category in zip(entries, deltas, totals, categories):
+            rows.append({
+                'slot': slots[position],
+                'id': component['id'],
+                'name': component['name'],
+                'unit_mass': component['mass'],
+                'delta': float(delta),
+                'total_mass': float(total),
+                'category': category,
+                'category_changed': category != base_category
+            })
+
+        return {
+            'base_total': base_total,
+            'base_category': base_category,
+            'rows': rows
+        }
@@ -0,0 +1,296 @@
+"""
+Модуль аналитики истории расчетов.
+Загружает историю в столбцовые массивы NumPy и вычисляет агрегаты векторно.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from modules.calculator import COMPONENT_TABLES
+from modules.categories import WeightCategoryRegistry, get_default_registry
+
+# Периоды группировки по времени (единицы datetime64)
+PERIODS = {
+    'D': 'День',
+    'W': 'Неделя',
+    'M': 'Месяц'
+}
+
+
+class HistoryAnalytics:
+    """Класс для агрегатов по истории расчетов"""
+
+    def __init__(self, db, categories: Optional[WeightCategoryRegistry] = None,
+                 batch_size: int = 1000):
+        """
+        Инициализация аналитики
+
+        Args:
+            db: Экземпляр DatabaseManager
+            categories: Реестр весовых категорий (по умолчанию - общий реестр)
+            batch_size: Количество записей в одной порции чтения
+        """
+        self.db = db
+        self.categories = categories or get_default_registry()
+        self.batch_size = batch_size
+        self.slots = list(COMPONENT_TABLES)
+        self._columns = ['id', 'timestamp', 'total_mass'] + [
+            f'{slot}_{field}' for slot in self.slots for field in ('name', 'mass', 'qty')
+        ]
+        self._reset()
+
+    def _reset(self):
+        """Сбрасывает загруженные столбцы и агрегаты"""
+        self.ids = np.empty(0, dtype=np.int64)
+        self.timestamps = np.empty(0, dtype='datetime64[s]')
+        self.total_mass = np.empty(0, dtype=np.float64)
+        self.slot_masses = np.empty((0, len(self.slots)), dtype=np.float64)
+        self.component_codes = np.empty((0, len(self.slots)), dtype=np.int32)
+
+        # Словари названий компонентов по слотам: {название: код}
+        self.vocabulary = {slot: {} for slot in self.slots}
+        self._names = {slot: [] for slot in self.slots}
+
+        # Агрегаты, обновляемые инкрементально при добавлении записей
+        self._usage = {slot: np.zeros(0, dtype=np.int64) for slot in self.slots}
+        self._count = 0
+        self._sum = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+        self._category_counts = np.zeros(len(self.categories.labels), dtype=np.int64)
+
+        # Агрегаты, пересчитываемые по требованию: {ключ: результат}
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def refresh(self) -> int:
+        """
+        Дочитывает новые записи истории
+
+        Читаются только записи с ID больше последнего загруженного и не
+        больше максимального ID, прочитанного вместе с количеством записей:
+        расчеты, сохраненные во время чтения, попадут в следующее обновление.
+        Если записи были удалены, столбцы загружаются заново.
+
+        Returns:
+            Количество добавленных записей
+        """
+        count, max_id = self.db.get_calculation_history_bounds()
+        last_id = int(self.ids[-1]) if len(self.ids) else 0
+        if count < len(self) or max_id < last_id:
+            self._reset()
+            last_id = 0
+
+        added = 0
+        for rows in self.db.iter_calculation_rows(self._columns, after_id=last_id,
+                                                  batch_size=self.batch_size, upto_id=max_id):
+            self._append(rows)
+            added += len(rows)
+
+        if len(self) != count:
+            # Записи до max_id удалены: среди загруженных (больше count)
+            # или во время чтения (меньше count)
+            self._reset()
+            return self.refresh()
+
+        if added:
+            self._cache.clear()
+        return added
+
+    def _append(self, rows: List[tuple]):
+        """Преобразует порцию строк в столбцы и добавляет ее"""
+        columns = dict(zip(self._columns, zip(*rows)))
+        n = len(rows)
+
+        ids = np.array(columns['id'], dtype=np.int64)
+        timestamps = np.array(columns['timestamp'], dtype='datetime64[s]')
+        total_mass = np.array(columns['total_mass'], dtype=np.float64)
+
+        slot_masses = np.zeros((n, len(self.slots)), dtype=np.float64)
+        codes = np.full((n, len(self.slots)), -1, dtype=np.int32)
+        for column, slot in enumerate(self.slots):
+            names = np.array(columns[f'{slot}_name'], dtype=object)
+            present = np.not_equal(names, None)
+            if not present.any():
+                continue
+
+            masses = np.array(columns[f'{slot}_mass'], dtype=np.float64)
+            quantities = np.array(columns[f'{slot}_qty'], dtype=np.float64)
+            quantities = np.where(np.isnan(quantities), 1.0, quantities)
+            slot_masses[:, column] = np.where(present, np.nan_to_num(masses) * quantities, 0.0)
+
+            # Названия кодируются через уникальные значения порции
+            unique, inverse = np.unique(names[present].astype(str), return_inverse=True)
+            vocabulary = self.vocabulary[slot]
+            for name in unique.tolist():
+                if name not in vocabulary:
+                    vocabulary[name] = len(vocabulary)
+                    self._names[slot].append(name)
+            unique_codes = np.array([vocabulary[name] for name in unique.tolist()], dtype=np.int32)
+            codes[present, column] = unique_codes[inverse]
+
+            usage = np.bincount(codes[present, column], minlength=len(vocabulary))
+            usage[:len(self._usage[slot])] += self._usage[slot]
+            self._usage[slot] = usage
+
+        self.ids = np.concatenate((self.ids, ids))
+        self.timestamps = np.concatenate((self.timestamps, timestamps))
+        self.total_mass = np.concatenate((self.total_mass, total_mass))
+        self.slot_masses = np.concatenate((self.slot_masses, slot_masses))
+        self.component_codes = np.concatenate((self.component_codes, codes))
+
+        self._count += n
+        self._sum += float(total_mass.sum())
+        self._min = min(self._min, float(total_mass.min()))
+        self._max = max(self._max, float(total_mass.max()))
+        self._category_counts += self.categories.count(total_mass)
+
+    def summary(self) -> Dict:
+        """
+        Получает сводные показатели истории
+
+        Returns:
+            Словарь {'count', 'mean', 'min', 'max', 'category_counts': {категория: количество}}
+        """
+        empty = self._count == 0
+        return {
+            'count': self._count,
+            'mean': 0.0 if empty else self._sum / self._count,
+            'min': 0.0 if empty else self._min,
+            'max': 0.0 if empty else self._max,
+            'category_counts': dict(zip(self.categories.labels, self._category_counts.tolist()))
+        }
+
+    def mass_histogram(self, bins: int = 10) -> Dict:
+        """
+        Строит гистограмму общей массы
+
+        Args:
+            bins: Количество интервалов
+
+        Returns:
+            Словарь {'counts': массив, 'edges': массив границ}
+        """
+        key = ('histogram', bins)
+        if key not in self._cache:
+            counts, edges = np.histogram(self.total_mass, bins=bins) if len(self) \
+                else (np.zeros(0, dtype=np.int64), np.zeros(0))
+            self._cache[key] = {'counts': counts, 'edges': edges}
+        return self._cache[key]
+
+    def mean_mass_by_period(self, period: str = 'D') -> Dict:
+        """
+        Вычисляет среднюю массу по периодам времени
+
+        Args:
+            period: Период группировки из PERIODS ('D', 'W', 'M')
+
+        Returns:
+            Словарь {'periods': массив начал периодов (datetime64[D]),
+                     'means': массив, 'counts': массив}
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Неизвестный период: {period}")
+
+        key = ('period', period)
+        if key not in self._cache:
+            if period == 'W':
+                # datetime64[W] отсчитывает недели от четверга 1970-01-01;
+                # сдвиг на 3 дня дает недели с понедельника
+                shift = np.timedelta64(3, 'D')
+                buckets = (self.timestamps + shift).astype('datetime64[W]') - shift
+            else:
+                buckets = self.timestamps.astype(f'datetime64[{period}]')
+            periods, inverse = np.unique(buckets, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(periods))
+            sums = np.bincount(inverse, weights=self.total_mass, minlength=len(periods))
+            self._cache[key] = {
+                'periods': periods.astype('datetime64[D]'),
+                'means': sums / np.maximum(counts, 1),
+                'counts': counts
+            }
+        return self._cache[key]
+
+    def component_usage(self, top: int = 10) -> Dict[str, List]:
+        """
+        Получает самые используемые компоненты по слотам
+
+        Args:
+            top: Количество компонентов на слот
+
+        Returns:
+            Словарь {слот: [(название, количество расчетов), ...]}
+        """
+        result = {}
+        for slot in self.slots:
+            usage = self._usage[slot]
+            order = np.argsort(-usage, kind='stable')[:top]
+            result[slot] = [(self._names[slot][i], int(usage[i])) for i in order.tolist() if usage[i] > 0]
+        return result
+
+    def slot_mass_share(self) -> Dict[str, float]:
+        """
+        Вычисляет долю каждого слота в суммарной массе всех расчетов
+
+        Returns:
+            Словарь {слот: доля от 0 до 1} (только слоты с ненулевой массой)
+        """
+        if 'share' not in self._cache:
+            totals = self.slot_masses.sum(axis=0)
+            grand_total = totals.sum()
+            self._cache['share'] = {
+                slot: float(total / grand_total)
+                for slot, total in zip(self.slots, totals.tolist()) if total > 0
+            } if grand_total > 0 else {}
+        return self._cache['share']
+
+    def dashboard_data(self, bins: int = 10, period: str = 'D', top: int = 10,
+                       slot_names: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Готовит данные диаграмм панели аналитики
+
+        Args:
+            bins: Количество интервалов гистограммы
+            period: Период группировки средней массы
+            top: Количество компонентов в диаграмме использования
+            slot_names: Отображаемые названия слотов
+
+        Returns:
+            Словарь {'histogram', 'trend', 'usage', 'share'} со словарями
+            {подпись: значение} для DroneVisualizer ('share' - средняя
+            масса слота на расчет в граммах)
+        """
+        slot_names = slot_names or {}
+        histogram = self.mass_histogram(bins)
+        edges = histogram['edges'].tolist()
+        # Точность подписей интервалов зависит от их ширины, чтобы подписи не совпадали
+        width = edges[1] - edges[0] if len(edges) > 1 else 1.0
+        digits = int(np.ceil(-np.log10(width))) if 0 < width < 1 else 0
+        trend = self.mean_mass_by_period(period)
+
+        usage = [
+            (f"{name} ({slot_names.get(slot, slot)})", count)
+            for slot, items in self.component_usage(top).items() for name, count in items
+        ]
+        usage.sort(key=lambda item: item[1], reverse=True)
+
+        return {
+            'histogram': {
+                f"{edges[i]:.{digits}f}-{edges[i + 1]:.{digits}f}": float(count)
+                for i, count in enumerate(histogram['counts'].tolist())
+            },
+            'trend': {
+                str(day): float(mean)
+                for day, mean in zip(trend['periods'].tolist(), trend['means'].tolist())
+            },
+            'usage': {label: float(count) for label, count in usage[:top]},
+            # Средняя масса слота на расчет: доли секторов совпадают с slot_mass_share
+            'share': {
+                slot_names.get(slot, slot): float(mean)
+                for slot, mean in zip(self.slots, self.slot_masses.mean(axis=0).tolist())
+                if mean > 0
+            } if len(self) else {}
+        }
@@ -0,0 +1,365 @@
+"""
+Модуль пакетных расчетов.
+Векторизованный расчет массы для множества конфигураций с помощью NumPy.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import math
+
+import numpy as np
+
+from modules.calculator import COMPONENT_TABLES, VALID, VALIDATION_MESSAGES, DroneCalculator
+
+
+class ConfigurationSpace:
+    """
+    Пространство конфигураций - декартово произведение кандидатов по слотам.
+
+    Каждая конфигурация задается плоским индексом в диапазоне [0, size),
+    что позволяет обрабатывать пространство блоками без построения
+    полного списка комбинаций в памяти.
+    """
+
+    def __init__(self, catalog: Dict[str, List[Dict]],
+                 quantities: Optional[Dict[str, int]] = None,
+                 fixed: Optional[Dict[str, object]] = None):
+        """
+        Инициализация пространства конфигураций
+
+        Args:
+            catalog: Словарь {слот: список компонентов из базы данных}
+            quantities: Количество компонентов по слотам (по умолчанию 1)
+            fixed: Ограничения по слотам:
+                ID компонента - слот зафиксирован,
+                список ID - перебираются только указанные компоненты,
+                None - слот исключен из конфигурации.
+                Слоты без ограничений перебирают весь каталог.
+        """
+        quantities = quantities or {}
+        fixed = fixed or {}
+
+        self.slots = []
+        self.components = {}
+        self.unit_masses = {}
+        self.quantities = {}
+
+        for slot, components in catalog.items():
+            if slot in fixed:
+                choice = fixed[slot]
+                if choice is None:
+                    continue
+                allowed = set(choice) if isinstance(choice, (list, tuple, set)) else {choice}
+                components = [c for c in components if c['id'] in allowed]
+
+            if not components:
+                raise ValueError(f"Нет компонентов-кандидатов для слота '{slot}'")
+
+            self.slots.append(slot)
+            self.components[slot] = components
+            self.unit_masses[slot] = np.array([c['mass'] for c in components], dtype=np.float64)
+            self.quantities[slot] = quantities.get(slot, 1)
+
+        if not self.slots:
+            raise ValueError("Пространство конфигураций не содержит ни одного слота")
+
+        self.shape = tuple(len(self.components[slot]) for slot in self.slots)
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    def indices(self, start: int = 0, stop: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        """
+        Возвращает индексы компонентов по слотам для диапазона конфигураций
+
+        Args:
+            start: Первый плоский индекс
+            stop: Индекс после последнего (по умолчанию - конец пространства)
+
+        Returns:
+            Кортеж массивов индексов, по одному на слот
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        flat = np.arange(start, stop, dtype=np.int64)
+        return np.unravel_index(flat, self.shape)
+
+    def mass_matrix(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Строит матрицу масс единиц компонентов (конфигурация x слот)
+
+        Args:
+            start: Первый плоский индекс
+            stop: Индекс после последнего
+
+        Returns:
+            Массив формы (n, количество слотов)
+        """
+        idx = self.indices(start, stop)
+        return np.column_stack([self.unit_masses[slot][i] for slot, i in zip(self.slots, idx)])
+
+    def quantity_vector(self) -> np.ndarray:
+        """Возвращает вектор количеств в порядке слотов"""
+        return np.array([self.quantities[slot] for slot in self.slots], dtype=np.float64)
+
+    def column_values(self, slot: str, column: str,
+                      start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Возвращает значения произвольного столбца компонента с учетом количества
+
+        Args:
+            slot: Слот конфигурации
+            column: Название столбца таблицы (например, 'capacity')
+            start: Первый плоский индекс
+            stop: Индекс после последнего
+
+        Returns:
+            Массив значений (нули, если слот не входит в пространство)
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if slot not in self.slots:
+            return np.zeros(stop - start, dtype=np.float64)
+
+        values = np.array([c.get(column) or 0 for c in self.components[slot]], dtype=np.float64)
+        position = self.slots.index(slot)
+        slot_index = self.indices(start, stop)[position]
+        return values[slot_index] * self.quantities[slot]
+
+    def decode(self, flat_index: int) -> Dict[str, Dict]:
+        """
+        Восстанавливает конфигурацию по плоскому индексу
+
+        Args:
+            flat_index: Плоский индекс конфигурации
+
+        Returns:
+            Словарь компонентов в формате DroneCalculator.calculate_total_mass
+        """
+        idx = np.unravel_index(int(flat_index), self.shape)
+        components_data = {}
+        for slot, i in zip(self.slots, idx):
+            component = self.components[slot][int(i)]
+            components_data[slot] = {
+                'id': component['id'],
+                'name': component['name'],
+                'mass': component['mass'],
+                'qty': self.quantities[slot]
+            }
+        return components_data
+
+
+class BatchCalculator:
+    """Класс для векторизованного расчета массы множества конфигураций"""
+
+    def __init__(self, chunk_size: int = 65536, calculator: Optional[DroneCalculator] = None):
+        """
+        Инициализация пакетного калькулятора
+
+        Args:
+            chunk_size: Количество конфигураций в одном блоке вычислений
+            calculator: Калькулятор с правилами валидации (создается по умолчанию)
+        """
+        self.chunk_size = chunk_size
+        self.calculator = calculator or DroneCalculator()
+
+    def calculate_totals(self, unit_masses: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """
+        Вычисляет общую массу для набора конфигураций
+
+        Args:
+            unit_masses: Массы единиц компонентов, форма (n, слоты)
+            quantities: Количества, форма (слоты,) или (n, слоты)
+
+        Returns:
+            Массив общих масс формы (n,)
+        """
+        unit_masses = np.asarray(unit_masses, dtype=np.float64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if quantities.ndim == 1:
+            return unit_masses @ quantities
+        return np.einsum('ij,ij->i', unit_masses, quantities)
+
+    def calculate_validated(self, unit_masses: np.ndarray, quantities: np.ndarray) -> Dict:
+        """
+        Проверяет входные данные и вычисляет общую массу валидных конфигураций
+
+        Строки с некорректной массой или количеством отклоняются целиком,
+        без поэлементных проверок на Python.
+
+        Args:
+            unit_masses: Массы единиц компонентов, форма (n, слоты)
+            quantities: Количества, форма (слоты,) или (n, слоты)
+
+        Returns:
+            Словарь с результатами:
+            {
+                'totals': np.ndarray (NaN для отклоненных строк),
+                'valid': np.ndarray маска валидных строк,
+                'codes': np.ndarray код первой ошибки в строке
+            }
+        """
+        unit_masses = np.atleast_2d(np.asarray(unit_masses, dtype=np.float64))
+        quantities = np.broadcast_to(np.asarray(quantities, dtype=np.float64), unit_masses.shape)
+
+        _, mass_codes = self.calculator.validate_mass_array(unit_masses)
+        _, quantity_codes = self.calculator.validate_quantity_array(quantities)
+        cell_codes = np.where(mass_codes != VALID, mass_codes, quantity_codes)
+
+        # Код первой ошибки по строке
+        first_error = np.argmax(cell_codes != VALID, axis=1)
+        codes = cell_codes[np.arange(len(cell_codes)), first_error]
+        valid = codes == VALID
+
+        totals = np.full(len(unit_masses), np.nan)
+        totals[valid] = self.calculate_totals(unit_masses[valid], quantities[valid])
+        return {'totals': totals, 'valid': valid, 'codes': codes}
+
+    def evaluate(self, space: ConfigurationSpace,
+                 start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Вычисляет общую массу для диапазона конфигураций пространства
+
+        Args:
+            space: Пространство конфигураций
+            start: Первый плоский индекс
+            stop: Индекс после последнего
+
+        Returns:
+            Массив общих масс
+        """
+        return self.calculate_totals(space.mass_matrix(start, stop), space.quantity_vector())
+
+    def iter_chunks(self, space: ConfigurationSpace) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Перебирает пространство конфигураций блоками
+
+        Args:
+            space: Пространство конфигураций
+
+        Yields:
+            Кортеж (первый плоский индекс блока, массив общих масс)
+        """
+        for start in range(0, space.size, self.chunk_size):
+            yield start, self.evaluate(space, start, start + self.chunk_size)
+
+    def calculate_configurations(self, rows: List[Dict],
+                                 lookup: 'CatalogLookup') -> Tuple[List[Dict], List[Dict]]:
+        """
+        Рассчитывает конфигурации, заданные компонентами каталога
+
+        Компоненты ищутся по ID или названию, затем все строки проверяются
+        и рассчитываются одним векторным проходом. Ошибка строки (неизвестный
+        компонент, некорректное количество, пустая конфигурация) не влияет
+        на остальные строки.
+
+        Args:
+            rows: Конфигурации {слот: ID или название, '<слот>_qty': количество,
+                'label': подпись}; количество по умолчанию 1
+            lookup: Поиск компонентов каталога
+
+        Returns:
+            Кортеж (результаты {'label', 'total_mass', 'category', 'error'},
+            компоненты строк в формате DroneCalculator.calculate_total_mass;
+            total_mass равна None для отклоненных строк)
+        """
+        slots = list(COMPONENT_TABLES)
+        count = len(rows)
+        unit_masses = np.zeros((count, len(slots)))
+        quantities = np.zeros((count, len(slots)))
+        errors = [None] * count
+        configurations = [{} for _ in range(count)]
+
+        for i, row in enumerate(rows):
+            for j, slot in enumerate(slots):
+                value = row.get(slot)
+                if value is None or value == '':
+                    continue
+                component = lookup.resolve(slot, value)
+                if component is None:
+                    errors[i] = errors[i] or f"Неизвестный компонент {slot}: {value}"
+                    continue
+                unit_masses[i, j] = component['mass']
+                quantities[i, j] = _to_quantity(row.get(f'{slot}_qty'))
+                configurations[i][slot] = {'id': component['id'], 'name': component['name'],
+                                           'mass': component['mass'], 'qty': quantities[i, j]}
+            if not configurations[i] and errors[i] is None:
+                errors[i] = "Не выбрано ни одного компонента"
+
+        checked = self.calculate_validated(unit_masses, quantities)
+        valid = checked['valid'] & np.array([error is None for error in errors], dtype=bool)
+        categories = self.calculator.get_weight_categories(np.where(valid, checked['totals'], 0.0))
+
+        results = []
+        for i, row in enumerate(rows):
+            error = errors[i]
+            if error is None and not valid[i]:
+                error = VALIDATION_MESSAGES[int(checked['codes'][i])]
+            if valid[i]:
+                for data in configurations[i].values():
+                    data['qty'] = int(data['qty'])
+            results.append({
+                'label': row.get('label') or '',
+                'total_mass': float(checked['totals'][i]) if valid[i] else None,
+                'category': str(categories[i]) if valid[i] else '',
+                'error': error or ''
+            })
+        return results, configurations
+
+
+def _to_quantity(value) -> float:
+    """Преобразует количество (NaN для некорректных значений, 1 - если не задано)"""
+    if value is None or value == '':
+        return 1.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class CatalogLookup:
+    """Класс поиска компонентов каталога по ID или названию"""
+
+    def __init__(self, catalog: Dict[str, List[Dict]]):
+        """
+        Инициализация поиска
+
+        Args:
+            catalog: Словарь {слот: список компонентов} (см. load_catalog)
+        """
+        self.by_id = {slot: {c['id']: c for c in components} for slot, components in catalog.items()}
+        # При совпадении названий выбирается компонент с меньшим ID
+        self.by_name = {slot: {} for slot in catalog}
+        for slot, components in catalog.items():
+            for component in sorted(components, key=lambda c: c['id']):
+                self.by_name[slot].setdefault(component['name'].strip().lower(), component)
+
+    def resolve(self, slot: str, value) -> Optional[Dict]:
+        """
+        Находит компонент слота
+
+        Args:
+            slot: Тип компонента
+            value: ID (число или строка из цифр) или название компонента
+
+        Returns:
+            Запись компонента или None
+        """
+        if slot not in self.by_id:
+            return None
+        if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+            component = self.by_id[slot].get(int(value))
+            if component is not None:
+                return component
+        return self.by_name[slot].get(str(value).strip().lower())
+
+
+def load_catalog(db, slots: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+    """
+    Загружает каталог компонентов из базы данных по слотам
+
+    Args:
+        db: Экземпляр DatabaseManager
+        slots: Список слотов (по умолчанию - все)
+
+    Returns:
+        Словарь {слот: список компонентов}
+    """
+    slots = slots or list(COMPONENT_TABLES)
+    return {slot: db.get_components(COMPONENT_TABLES[slot]) for slot in slots}
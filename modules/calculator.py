@@ -5,13 +5,54 @@
 
 from typing import Dict, Optional, Tuple
 
+import numpy as np
+
+from modules.categories import WeightCategoryRegistry, get_default_registry
+
+# Соответствие типов компонентов (слотов конфигурации) таблицам базы данных
+COMPONENT_TABLES = {
+    'frame': 'frames',
+    'motor': 'motors',
+    'battery': 'batteries',
+    'flight_controller': 'flight_controllers',
+    'propeller': 'propellers',
+    'camera': 'cameras'
+}
+
+# Допустимые пределы значений
+MAX_MASS = 50000  # 50 кг максимум
+MAX_QUANTITY = 100
+
+# Коды ошибок пакетной валидации
+VALID = 0
+ERROR_NOT_A_NUMBER = 1
+ERROR_NEGATIVE = 2
+ERROR_TOO_LARGE = 3
+ERROR_NOT_INTEGER = 4
+ERROR_EMPTY_NAME = 5
+
+VALIDATION_MESSAGES = {
+    VALID: "",
+    ERROR_NOT_A_NUMBER: "Значение не является числом",
+    ERROR_NEGATIVE: "Значение не может быть отрицательным",
+    ERROR_TOO_LARGE: "Значение слишком большое",
+    ERROR_NOT_INTEGER: "Количество должно быть целым числом",
+    ERROR_EMPTY_NAME: "Не указано название"
+}
+
 
 class DroneCalculator:
     """Класс для расчета массы дрона"""
 
-    def __init__(self):
-        """Инициализация калькулятора"""
+    def __init__(self, categories: Optional[WeightCategoryRegistry] = None):
+        """
+        Инициализация калькулятора
+
+        Args:
+            categories: Реестр весовых категорий (по умолчанию - общий реестр)
+        """
         self.configuration = {}
+        self.categories = categories or get_default_registry()
 
     def validate_mass(self, mass: float) -> Tuple[bool, str]:
         """
@@ -25,7 +66,7 @@ class DroneCalculator:
         """
         if mass < 0:
             return False, "Масса не может быть отрицательной"
-        if mass > 50000:  # 50 кг максимум
+        if mass > MAX_MASS:
             return False, "Масса слишком большая (максимум 50 кг)"
         return True, ""
 
@@ -41,10 +82,47 @@ class DroneCalculator:
         """
         if quantity < 0:
             return False, "Количество не может быть отрицательным"
-        if quantity > 100:
+        if quantity > MAX_QUANTITY:
             return False, "Количество слишком большое (максимум 100)"
         return True, ""
 
+    def validate_mass_array(self, masses) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Проверяет массив значений массы за один векторный проход
+
+        Args:
+            masses: Массив масс (NaN - нечисловое значение)
+
+        Returns:
+            Кортеж (маска валидных строк, коды ошибок по строкам)
+        """
+        masses = np.asarray(masses, dtype=np.float64)
+        codes = np.select(
+            [np.isnan(masses), masses < 0, masses > MAX_MASS],
+            [ERROR_NOT_A_NUMBER, ERROR_NEGATIVE, ERROR_TOO_LARGE],
+            default=VALID
+        ).astype(np.int8)
+        return codes == VALID, codes
+
+    def validate_quantity_array(self, quantities) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Проверяет массив количеств за один векторный проход
+
+        Args:
+            quantities: Массив количеств (NaN - нечисловое значение)
+
+        Returns:
+            Кортеж (маска валидных строк, коды ошибок по строкам)
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        codes = np.select(
+            [np.isnan(quantities), quantities != np.floor(quantities),
+             quantities < 0, quantities > MAX_QUANTITY],
+            [ERROR_NOT_A_NUMBER, ERROR_NOT_INTEGER, ERROR_NEGATIVE, ERROR_TOO_LARGE],
+            default=VALID
+        ).astype(np.int8)
+        return codes == VALID, codes
+
     def calculate_component_mass(self, component_mass: float, quantity: int = 1) -> float:
         """
         Вычисляет общую массу компонента с учетом количества
@@ -102,6 +180,27 @@ class DroneCalculator:
 
         return results
 
+    def components_from_history(self, record: Dict) -> Dict[str, Dict]:
+        """
+        Восстанавливает конфигурацию из записи истории расчетов
+
+        Args:
+            record: Запись calculations_history
+
+        Returns:
+            Словарь компонентов в формате calculate_total_mass
+        """
+        components = {}
+        for comp_type in COMPONENT_TABLES:
+            if record.get(f'{comp_type}_name') and record.get(f'{comp_type}_mass') is not None:
+                components[comp_type] = {
+                    'id': record.get(f'{comp_type}_id'),
+                    'name': record[f'{comp_type}_name'],
+                    'mass': record[f'{comp_type}_mass'],
+                    'qty': record.get(f'{comp_type}_qty') or 1
+                }
+        return components
+
     def get_mass_distribution(self, components: Dict[str, Dict]) -> Dict[str, float]:
         """
         Получает распределение массы по компонентам для диаграммы
@@ -152,13 +251,16 @@ class DroneCalculator:
         Returns:
             Название категории
         """
-        if total_mass < 250:
-            return "Микро (< 250г) - не требует регистрации"
-        elif total_mass < 500:
-            return "Мини (250-500г)"
-        elif total_mass < 2000:
-            return "Средний (0.5-2 кг)"
-        elif total_mass < 25000:
-            return "Большой (2-25 кг)"
-        else:
-            return "Тяжелый (> 25 кг) - требуется специальное разрешение"
+        return self.categories.classify(total_mass)
+
+    def get_weight_categories(self, masses) -> np.ndarray:
+        """
+        Определяет категории для массива масс за один векторный проход
+
+        Args:
+            masses: Массив общих масс в граммах
+
+        Returns:
+            Массив названий категорий
+        """
+        return self.categories.label_array(masses)
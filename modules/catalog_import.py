@@ -0,0 +1,123 @@
+"""
+Модуль импорта каталога.
+Массовая загрузка компонентов из CSV с векторной валидацией.
+"""
+
+import csv
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from modules.calculator import (DroneCalculator, ERROR_EMPTY_NAME, VALID,
+                                VALIDATION_MESSAGES)
+
+
+def _to_float_array(values: List[str]) -> np.ndarray:
+    """
+    Преобразует столбец строк в массив чисел (NaN для некорректных значений)
+
+    Чистые данные преобразуются одним вызовом NumPy; поэлементный разбор
+    выполняется только если в столбце есть нечисловые значения.
+    """
+    try:
+        return np.array(values, dtype=str).astype(np.float64)
+    except ValueError:
+        def parse(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return np.nan
+        return np.fromiter((parse(v) for v in values), dtype=np.float64, count=len(values))
+
+
+class CatalogImporter:
+    """Класс для массового импорта компонентов в базу данных"""
+
+    def __init__(self, db, calculator: Optional[DroneCalculator] = None):
+        """
+        Инициализация импортера
+
+        Args:
+            db: Экземпляр DatabaseManager
+            calculator: Калькулятор с правилами валидации (создается по умолчанию)
+        """
+        self.db = db
+        self.calculator = calculator or DroneCalculator()
+
+    def validate_rows(self, names: List[str], masses: List[str]) -> Dict:
+        """
+        Проверяет строки импорта одним векторным проходом
+
+        Args:
+            names: Столбец названий
+            masses: Столбец масс (строки или числа)
+
+        Returns:
+            Словарь {'valid': маска, 'codes': коды ошибок, 'masses': массив масс}
+        """
+        mass_array = _to_float_array(masses)
+        valid, codes = self.calculator.validate_mass_array(mass_array)
+
+        name_lengths = np.char.str_len(np.char.strip(np.array(names, dtype=str)))
+        codes = np.where((codes == VALID) & (name_lengths == 0), ERROR_EMPTY_NAME, codes)
+
+        return {'valid': codes == VALID, 'codes': codes, 'masses': mass_array}
+
+    def import_rows(self, table_name: str, rows: List[Dict]) -> Dict:
+        """
+        Импортирует компоненты, отклоняя некорректные строки
+
+        Args:
+            table_name: Название таблицы
+            rows: Список словарей {столбец: значение}
+
+        Returns:
+            Словарь с результатами:
+            {
+                'imported': int,
+                'rejected': [{'row': int, 'code': int, 'message': str}, ...]
+            }
+        """
+        if not rows:
+            return {'imported': 0, 'rejected': []}
+
+        # Принимаются только существующие столбцы таблицы (кроме id)
+        table_columns = set(self.db.get_table_columns(table_name)) - {'id'}
+        columns = [c for c in rows[0] if c in table_columns]
+        if 'name' not in columns or 'mass' not in columns:
+            raise ValueError("Для импорта необходимы столбцы 'name' и 'mass'")
+
+        names = [row.get('name') or '' for row in rows]
+        checked = self.validate_rows(names, [row.get('mass') for row in rows])
+        valid, codes, masses = checked['valid'], checked['codes'], checked['masses']
+
+        valid_index = np.flatnonzero(valid)
+        records = []
+        for i, mass in zip(valid_index.tolist(), masses[valid_index].tolist()):
+            record = {c: (rows[i].get(c) or None) for c in columns}
+            record['name'] = names[i].strip()
+            record['mass'] = mass
+            records.append(record)
+
+        imported = self.db.add_components(table_name, records)
+
+        rejected = [
+            {'row': i, 'code': int(codes[i]), 'message': VALIDATION_MESSAGES[int(codes[i])]}
+            for i in np.flatnonzero(~valid).tolist()
+        ]
+        return {'imported': imported, 'rejected': rejected}
+
+    def import_csv(self, table_name: str, path: str) -> Dict:
+        """
+        Импортирует компоненты из CSV-файла с заголовком
+
+        Args:
+            table_name: Название таблицы
+            path: Путь к CSV-файлу (столбцы name, mass и др.)
+
+        Returns:
+            Результат import_rows (номера строк считаются от первой строки данных)
+        """
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        return self.import_rows(table_name, rows)
@@ -0,0 +1,128 @@
+"""
+Модуль весовых категорий.
+Табличная классификация дронов по массе для разных юрисдикций.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Пороги (г) и названия категорий по юрисдикциям.
+# Категория i соответствует массе в диапазоне [пороги[i-1], пороги[i]).
+JURISDICTIONS: Dict[str, Tuple[List[float], List[str]]] = {
+    'default': (
+        [250, 500, 2000, 25000],
+        [
+            "Микро (< 250г) - не требует регистрации",
+            "Мини (250-500г)",
+            "Средний (0.5-2 кг)",
+            "Большой (2-25 кг)",
+            "Тяжелый (> 25 кг) - требуется специальное разрешение"
+        ]
+    ),
+    'eu': (
+        [250, 900, 4000, 25000],
+        [
+            "C0 (< 250г) - открытая категория A1",
+            "C1 (250-900г) - открытая категория A1",
+            "C2 (0.9-4 кг) - открытая категория A2",
+            "C3/C4 (4-25 кг) - открытая категория A3",
+            "Специальная категория (> 25 кг) - требуется разрешение"
+        ]
+    )
+}
+
+
+class WeightCategoryRegistry:
+    """Класс реестра весовых категорий"""
+
+    def __init__(self, thresholds: Sequence[float], labels: Sequence[str]):
+        """
+        Инициализация реестра категорий
+
+        Args:
+            thresholds: Возрастающие границы категорий в граммах
+            labels: Названия категорий (на одно больше, чем границ)
+        """
+        if len(labels) != len(thresholds) + 1:
+            raise ValueError("Количество названий должно быть на единицу больше количества границ")
+        if any(a >= b for a, b in zip(thresholds, thresholds[1:])):
+            raise ValueError("Границы категорий должны строго возрастать")
+
+        self.thresholds = [float(t) for t in thresholds]
+        self.labels = list(labels)
+        self._threshold_array = np.array(self.thresholds, dtype=np.float64)
+        self._label_array = np.array(self.labels, dtype=object)
+
+    @classmethod
+    def for_jurisdiction(cls, name: str = 'default') -> 'WeightCategoryRegistry':
+        """
+        Создает реестр для юрисдикции из JURISDICTIONS
+
+        Args:
+            name: Название юрисдикции
+
+        Returns:
+            Реестр категорий
+        """
+        if name not in JURISDICTIONS:
+            raise ValueError(f"Неизвестная юрисдикция: {name}")
+        thresholds, labels = JURISDICTIONS[name]
+        return cls(thresholds, labels)
+
+    def classify_index(self, total_mass: float) -> int:
+        """Возвращает номер категории для одной массы"""
+        return bisect_right(self.thresholds, total_mass)
+
+    def classify(self, total_mass: float) -> str:
+        """
+        Определяет категорию для одной массы
+
+        Args:
+            total_mass: Общая масса в граммах
+
+        Returns:
+            Название категории
+        """
+        return self.labels[bisect_right(self.thresholds, total_mass)]
+
+    def classify_array(self, masses) -> np.ndarray:
+        """
+        Определяет номера категорий для массива масс
+
+        Args:
+            masses: Массив общих масс в граммах
+
+        Returns:
+            Массив номеров категорий (индексы в labels)
+        """
+        return np.searchsorted(self._threshold_array, np.asarray(masses, dtype=np.float64),
+                               side='right')
+
+    def label_array(self, masses) -> np.ndarray:
+        """
+        Определяет названия категорий для массива масс
+
+        Args:
+            masses: Массив общих масс в граммах
+
+        Returns:
+            Массив названий категорий (dtype=object)
+        """
+        return self._label_array[self.classify_array(masses)]
+
+    def count(self, masses) -> np.ndarray:
+        """Возвращает количество масс в каждой категории"""
+        return np.bincount(self.classify_array(masses), minlength=len(self.labels))
+
+
+_default_registry: Optional[WeightCategoryRegistry] = None
+
+
+def get_default_registry() -> WeightCategoryRegistry:
+    """Возвращает общий реестр категорий по умолчанию"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = WeightCategoryRegistry.for_jurisdiction('default')
+    return _default_registry
@@ -0,0 +1,66 @@
+"""
+Модуль кэша диаграмм.
+LRU-кэш PNG-изображений диаграмм, адресуемых содержимым, с дисковым уровнем.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from modules.report_cache import ReportCache
+
+# Версия оформления диаграмм: входит в ключ кэша, увеличивается при изменении отрисовки
+CHART_TEMPLATE_VERSION = 1
+
+
+class ChartCache(ReportCache):
+    """Класс кэша PNG-изображений диаграмм"""
+
+    extension = '.png'
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 32 * 1024 * 1024):
+        """
+        Инициализация кэша
+
+        Args:
+            max_entries: Максимум изображений в памяти
+            cache_dir: Директория дискового уровня (None - только память)
+            max_disk_bytes: Максимальный размер дискового уровня в байтах
+        """
+        super().__init__(max_entries, cache_dir, max_disk_bytes)
+
+    @staticmethod
+    def make_chart_key(kind: str, data: Dict[str, float], title: Optional[str],
+                       size: Optional[Tuple[float, float]], dpi: int, theme) -> str:
+        """
+        Вычисляет ключ изображения по содержимому диаграммы
+
+        Args:
+            kind: Тип диаграммы ('pie', 'bar', 'count', 'line')
+            data: Словарь {компонент: масса} (порядок важен)
+            title: Заголовок
+            size: Размер фигуры в дюймах (None - размер по умолчанию)
+            dpi: Разрешение
+            theme: Описание оформления (стиль и цвета)
+
+        Returns:
+            Хэш SHA-256 в шестнадцатеричном виде
+        """
+        payload = {
+            'kind': kind,
+            'data': [[name, float(mass)] for name, mass in data.items()],
+            'title': title,
+            'size': list(size) if size else None,
+            'dpi': dpi,
+            'theme': theme
+        }
+        return ReportCache.make_key(payload, CHART_TEMPLATE_VERSION)
+
+    def _read_file(self, path: str) -> bytes:
+        """Читает изображение из файла дискового уровня"""
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _write_file(self, path: str, value: bytes):
+        """Записывает изображение в файл дискового уровня"""
+        with open(path, 'wb') as f:
+            f.write(value)
@@ -0,0 +1,160 @@
+"""
+Модуль фоновой отрисовки диаграмм.
+Рисует диаграммы в пуле процессов и передает готовые изображения в GUI.
+"""
+
+import io
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from PIL import Image
+
+from modules.chart_cache import ChartCache
+
+# Визуализатор рабочего процесса создается один раз на процесс
+_worker_state = {}
+
+
+def _render_chart(kind: str, data: Dict[str, float], title: Optional[str],
+                  size: Optional[Tuple[float, float]], dpi: int) -> Dict:
+    """Рисует диаграмму в буфер RGBA в рабочем процессе"""
+    if 'visualizer' not in _worker_state:
+        from modules.visualizer import DroneVisualizer
+        _worker_state['visualizer'] = DroneVisualizer()
+    visualizer = _worker_state['visualizer']
+    if kind == 'pie':
+        return visualizer.render_pie_rgba(data, title, dpi, size)
+    return visualizer.render_chart_rgba(kind, data, title, dpi, size)
+
+
+class ChartRenderPool:
+    """Класс фоновой отрисовки диаграмм для GUI"""
+
+    def __init__(self, visualizer, max_workers: int = 2):
+        """
+        Инициализация пула отрисовки
+
+        Args:
+            visualizer: DroneVisualizer главного процесса (его кэш диаграмм
+                проверяется до отправки задачи и пополняется результатами)
+            max_workers: Количество процессов отрисовки
+        """
+        self.visualizer = visualizer
+        self.max_workers = max_workers
+        self._executor = None
+        # Последний запрос каждого слота: {слот: (поколение, future)}
+        self._requests = {}
+        self._generation = 0
+        self._completed = queue.Queue()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Создает пул процессов при первой отрисовке"""
+        if self._executor is None:
+            # spawn: рабочий процесс не наследует копию главного процесса
+            # с потоками tkinter и фоновых задач (fork при живых потоках
+            # может оставить в потомке захваченные блокировки)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def request(self, slot: str, kind: str, data: Dict[str, float],
+                callback: Callable[[Image.Image], None], title: Optional[str] = None,
+                size: Optional[Tuple[float, float]] = None, dpi: int = 100) -> bool:
+        """
+        Запрашивает диаграмму для слота (места отображения в GUI)
+
+        Новый запрос для того же слота отменяет предыдущий: ожидающая
+        задача снимается с очереди, а результат уже выполняемой
+        отбрасывается. Диаграмма из кэша передается сразу.
+
+        Args:
+            slot: Идентификатор места отображения (например, 'main' или 'history:42')
+            kind: Тип диаграммы: 'pie', 'bar', 'count' или 'line'
+            data: Словарь {компонент: масса}
+            callback: Функция, получающая готовое изображение PIL
+                (вызывается в главном потоке из poll)
+            title: Заголовок диаграммы
+            size: Размер в дюймах
+            dpi: Разрешение
+
+        Returns:
+            True, если изображение передано сразу из кэша
+        """
+        self.cancel(slot)
+
+        key = ChartCache.make_chart_key(kind, data, title, size, dpi,
+                                        [self.visualizer.theme, self.visualizer.colors])
+        png = self.visualizer.chart_cache.get(key)
+        if png is not None:
+            callback(Image.open(io.BytesIO(png)))
+            return True
+
+        self._generation += 1
+        generation = self._generation
+        future = self._get_executor().submit(_render_chart, kind, dict(data), title, size, dpi)
+        self._requests[slot] = (generation, future)
+        future.add_done_callback(
+            lambda done: self._completed.put((slot, generation, key, callback, done))
+        )
+        return False
+
+    def cancel(self, slot: str):
+        """
+        Отменяет запрос слота
+
+        Args:
+            slot: Идентификатор места отображения
+        """
+        previous = self._requests.pop(slot, None)
+        if previous is not None:
+            previous[1].cancel()
+
+    def cancel_prefix(self, prefix: str):
+        """
+        Отменяет запросы всех слотов с заданным префиксом
+
+        Args:
+            prefix: Префикс слотов (например, 'history:')
+        """
+        for slot in [s for s in self._requests if s.startswith(prefix)]:
+            self.cancel(slot)
+
+    def pending(self) -> int:
+        """Возвращает количество незавершенных запросов"""
+        return len(self._requests)
+
+    def poll(self) -> int:
+        """
+        Передает готовые изображения получателям (вызывается в главном потоке)
+
+        Результаты отмененных и замененных запросов отбрасываются.
+
+        Returns:
+            Количество переданных изображений
+        """
+        delivered = 0
+        while True:
+            try:
+                slot, generation, key, callback, future = self._completed.get_nowait()
+            except queue.Empty:
+                return delivered
+
+            current = self._requests.get(slot)
+            if current is None or current[0] != generation or future.cancelled():
+                continue
+            del self._requests[slot]
+
+            result = future.result()
+            self.visualizer.chart_cache.put(key, result['png'])
+            callback(Image.frombuffer('RGBA', result['size'], result['rgba'], 'raw', 'RGBA', 0, 1))
+            delivered += 1
+
+    def shutdown(self):
+        """Отменяет все запросы и останавливает пул процессов"""
+        self._requests.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
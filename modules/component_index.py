@@ -0,0 +1,195 @@
+"""
+Модуль поискового индекса компонентов.
+Префиксный поиск по названию и словам названия для больших каталогов.
+"""
+
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional
+
+# Граница диапазона ключей с заданным префиксом
+_PREFIX_END = chr(0x10FFFF)
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _normalize(text: str) -> str:
+    """Приводит строку к виду для сравнения"""
+    return " ".join(text.lower().split())
+
+
+def _tokenize(text: str) -> List[str]:
+    """Разбивает строку на слова в нижнем регистре"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class ComponentIndex:
+    """Класс префиксного индекса компонентов одного типа"""
+
+    def __init__(self, components: Iterable[Dict] = ()):
+        """
+        Инициализация индекса
+
+        Args:
+            components: Записи компонентов (словари с ключами 'id', 'name', 'mass')
+        """
+        self._components = {}
+        self._tokens = {}
+        # Отсортированные списки (ключ, ID): полные названия и отдельные слова
+        self._names = []
+        self._token_index = []
+
+        for component in components:
+            self._components[component['id']] = component
+            self._tokens[component['id']] = tuple(_tokenize(component['name']))
+        self._names = sorted((_normalize(c['name']), cid) for cid, c in self._components.items())
+        self._token_index = sorted(
+            (token, cid) for cid, tokens in self._tokens.items() for token in set(tokens)
+        )
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def __contains__(self, component_id: int) -> bool:
+        return component_id in self._components
+
+    def get(self, component_id: int) -> Optional[Dict]:
+        """
+        Получает компонент по ID
+
+        Args:
+            component_id: ID компонента
+
+        Returns:
+            Запись компонента или None
+        """
+        return self._components.get(component_id)
+
+    def add(self, component: Dict):
+        """
+        Добавляет компонент (или заменяет компонент с тем же ID)
+
+        Args:
+            component: Запись компонента
+        """
+        cid = component['id']
+        if cid in self._components:
+            self.remove(cid)
+        tokens = tuple(_tokenize(component['name']))
+        self._components[cid] = component
+        self._tokens[cid] = tokens
+        insort(self._names, (_normalize(component['name']), cid))
+        for token in set(tokens):
+            insort(self._token_index, (token, cid))
+
+    def add_many(self, components: Iterable[Dict]):
+        """
+        Добавляет несколько компонентов
+
+        Небольшие изменения вставляются на место, крупные дописываются и
+        сливаются с индексом одной сортировкой.
+
+        Args:
+            components: Записи компонентов
+        """
+        components = list(components)
+        if len(components) <= 16:
+            for component in components:
+                self.add(component)
+            return
+
+        for component in components:
+            self.remove(component['id'])
+        names = []
+        tokens = []
+        for component in components:
+            cid = component['id']
+            words = tuple(_tokenize(component['name']))
+            self._components[cid] = component
+            self._tokens[cid] = words
+            names.append((_normalize(component['name']), cid))
+            tokens.extend((word, cid) for word in set(words))
+        self._names.extend(names)
+        self._names.sort()
+        self._token_index.extend(tokens)
+        self._token_index.sort()
+
+    def remove(self, component_id: int) -> bool:
+        """
+        Удаляет компонент из индекса
+
+        Args:
+            component_id: ID компонента
+
+        Returns:
+            True, если компонент был в индексе
+        """
+        component = self._components.pop(component_id, None)
+        if component is None:
+            return False
+        self._delete(self._names, (_normalize(component['name']), component_id))
+        for token in set(self._tokens.pop(component_id)):
+            self._delete(self._token_index, (token, component_id))
+        return True
+
+    @staticmethod
+    def _delete(keys: list, key: tuple):
+        """Удаляет ключ из отсортированного списка"""
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Ищет компоненты по началу названия или началам слов названия
+
+        Сначала выдаются компоненты, название которых начинается с запроса
+        (по алфавиту), затем компоненты, у которых каждое слово запроса
+        является началом одного из слов названия. Просматривается только
+        диапазон ключей запроса, поэтому время поиска зависит от лимита,
+        а не от размера каталога.
+
+        Args:
+            query: Строка поиска (пустая - первые компоненты по алфавиту)
+            limit: Максимальное количество результатов
+
+        Returns:
+            Список записей компонентов
+        """
+        query = _normalize(query)
+        results = []
+        seen = set()
+
+        # Совпадение начала полного названия: непрерывный диапазон ключей
+        position = bisect_left(self._names, (query,))
+        while position < len(self._names) and len(results) < limit:
+            name, cid = self._names[position]
+            if not name.startswith(query):
+                break
+            results.append(self._components[cid])
+            seen.add(cid)
+            position += 1
+
+        words = _tokenize(query)
+        if len(results) >= limit or not words:
+            return results
+
+        # Перебирается самый узкий диапазон слов, остальные слова проверяются по названию
+        ranges = [
+            (bisect_left(self._token_index, (word,)),
+             bisect_left(self._token_index, (word + _PREFIX_END,)), word)
+            for word in words
+        ]
+        start, end, driver = min(ranges, key=lambda r: r[1] - r[0])
+        others = [word for _, _, word in ranges if word is not driver]
+
+        for position in range(start, end):
+            cid = self._token_index[position][1]
+            if cid in seen:
+                continue
+            tokens = self._tokens[cid]
+            if all(any(token.startswith(word) for token in tokens) for word in others):
+                results.append(self._components[cid])
+                seen.add(cid)
+                if len(results) >= limit:
+                    break
+        return results
@@ -0,0 +1,240 @@
+"""
+Модуль селектора компонентов.
+Поле поиска с выпадающим списком лучших совпадений из ComponentIndex.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional
+
+import customtkinter as ctk
+
+from modules.component_index import ComponentIndex
+
+# Задержка поиска после последнего нажатия клавиши (мс)
+SEARCH_DELAY_MS = 80
+
+
+def component_label(component: Dict) -> str:
+    """Формирует отображаемую строку компонента"""
+    return f"{component['name']} ({component['mass']}г)"
+
+
+class ComponentSelector(ctk.CTkFrame):
+    """Класс поля выбора компонента с поиском по мере ввода"""
+
+    def __init__(self, master, index: ComponentIndex,
+                 on_change: Optional[Callable[[], None]] = None,
+                 max_results: int = 8, width: int = 400, font=None):
+        """
+        Инициализация селектора
+
+        Args:
+            master: Родительский виджет
+            index: Индекс компонентов типа
+            on_change: Функция, вызываемая при изменении выбора
+            max_results: Количество показываемых совпадений
+            width: Ширина поля ввода
+            font: Шрифт поля и списка
+        """
+        super().__init__(master, fg_color="transparent")
+        self.index = index
+        self.on_change = on_change
+        self.max_results = max_results
+        self._selected_id = None
+        self._matches = []
+        self._highlight = 0
+        self._search_job = None
+        self._hide_job = None
+
+        entry_frame = ctk.CTkFrame(self, fg_color="transparent")
+        entry_frame.pack(fill="x")
+
+        self.entry = ctk.CTkEntry(
+            entry_frame,
+            width=width,
+            font=font,
+            placeholder_text="Не выбран - введите название или слово"
+        )
+        self.entry.pack(side="left")
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<FocusIn>", lambda event: self._search())
+        self.entry.bind("<FocusOut>", self._on_focus_out)
+
+        ctk.CTkButton(
+            entry_frame,
+            text="✕",
+            width=28,
+            command=self.clear,
+            fg_color="gray"
+        ).pack(side="left", padx=(5, 0))
+
+        # Список совпадений: фиксированный набор кнопок, заполняемый при вводе
+        self.results_frame = ctk.CTkFrame(self)
+        self._buttons = []
+        for position in range(max_results):
+            button = ctk.CTkButton(
+                self.results_frame,
+                text="",
+                anchor="w",
+                height=26,
+                font=font,
+                fg_color="transparent",
+                text_color=("gray10", "gray90"),
+                command=lambda position=position: self._choose(position)
+            )
+            self._buttons.append(button)
+
+    @property
+    def selected_id(self) -> Optional[int]:
+        """ID выбранного компонента"""
+        return self._selected_id
+
+    def selected(self) -> Optional[Dict]:
+        """
+        Получает выбранный компонент
+
+        Returns:
+            Запись компонента или None
+        """
+        return None if self._selected_id is None else self.index.get(self._selected_id)
+
+    def select(self, component_id: Optional[int], notify: bool = True):
+        """
+        Выбирает компонент по ID
+
+        Args:
+            component_id: ID компонента (None - снять выбор)
+            notify: Вызывать ли on_change
+        """
+        if component_id is not None and component_id not in self.index:
+            component_id = None
+        self._selected_id = component_id
+        self._set_text(component_label(self.index.get(component_id)) if component_id is not None else "")
+        self._hide_results()
+        if notify and self.on_change:
+            self.on_change()
+
+    def clear(self):
+        """Снимает выбор"""
+        self.select(None)
+
+    def set_index(self, index: ComponentIndex):
+        """
+        Заменяет индекс компонентов, сохраняя выбор, если компонент остался
+
+        Args:
+            index: Новый индекс
+        """
+        previous = self.selected()
+        self.index = index
+        current = self.selected()
+        if current is None:
+            self._selected_id = None
+        self._set_text(component_label(current) if current is not None else "")
+        if current != previous and self.on_change:
+            self.on_change()
+
+    def index_changed(self, component_ids: Iterable[int]):
+        """
+        Обновляет выбор после изменения компонентов в индексе
+
+        Args:
+            component_ids: ID измененных или удаленных компонентов
+        """
+        if self._selected_id is None or self._selected_id not in set(component_ids):
+            return
+        current = self.selected()
+        if current is None:
+            self._selected_id = None
+        self._set_text(component_label(current) if current is not None else "")
+        if self.on_change:
+            self.on_change()
+
+    def _set_text(self, text: str):
+        """Заменяет текст поля ввода"""
+        self.entry.delete(0, "end")
+        if text:
+            self.entry.insert(0, text)
+
+    def _on_key(self, event):
+        """Обрабатывает навигацию по списку и откладывает поиск при вводе"""
+        if event.keysym in ("Down", "Up"):
+            if self._matches:
+                step = 1 if event.keysym == "Down" else -1
+                self._highlight = (self._highlight + step) % len(self._matches)
+                self._show_results()
+            return
+        if event.keysym == "Return":
+            if self._matches:
+                self._choose(self._highlight)
+            return
+        if event.keysym == "Escape":
+            self._restore()
+            return
+
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._search)
+
+    def _search(self):
+        """Ищет совпадения текста поля и показывает список"""
+        self._search_job = None
+        if self._hide_job is not None:
+            self.after_cancel(self._hide_job)
+            self._hide_job = None
+
+        text = self.entry.get()
+        current = self.selected()
+        # Текст выбранного компонента не считается запросом
+        if current is not None and text == component_label(current):
+            text = ""
+        self._matches = self.index.search(text, self.max_results)
+        self._highlight = 0
+        self._show_results()
+
+    def _show_results(self):
+        """Заполняет кнопки списка совпадениями"""
+        if not self._matches:
+            self._hide_results()
+            return
+
+        labels = [component_label(component) for component in self._matches]
+        # Одинаковые строки различаются ID компонента
+        repeated = {label for label, count in Counter(labels).items() if count > 1}
+        for position, button in enumerate(self._buttons):
+            if position >= len(self._matches):
+                button.pack_forget()
+                continue
+            label = labels[position]
+            if label in repeated:
+                label += f" [ID {self._matches[position]['id']}]"
+            button.configure(
+                text=label,
+                fg_color=("gray75", "gray30") if position == self._highlight else "transparent"
+            )
+            button.pack(fill="x", padx=2, pady=1)
+        self.results_frame.pack(fill="x", pady=(2, 0))
+
+    def _hide_results(self):
+        """Скрывает список совпадений"""
+        self._matches = []
+        self.results_frame.pack_forget()
+
+    def _choose(self, position: int):
+        """Выбирает совпадение из списка"""
+        if position < len(self._matches):
+            component_id = self._matches[position]['id']
+            changed = component_id != self._selected_id
+            self.select(component_id, notify=changed)
+
+    def _restore(self):
+        """Скрывает список и возвращает в поле текст выбранного компонента"""
+        self._hide_job = None
+        current = self.selected()
+        self._set_text(component_label(current) if current is not None else "")
+        self._hide_results()
+
+    def _on_focus_out(self, event):
+        """Скрывает список после потери фокуса (с задержкой для щелчка по списку)"""
+        if self._hide_job is None:
+            self._hide_job = self.after(200, self._restore)
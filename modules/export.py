@@ -0,0 +1,164 @@
+"""
+Модуль экспорта отчетов.
+Параллельное формирование отчетов и упаковка в zip-архив.
+"""
+
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.report import REPORT_FORMATS, ReportGenerator
+
+# Объекты рабочего процесса создаются один раз на процесс
+_worker_state = {}
+
+
+def _get_report_generator() -> ReportGenerator:
+    """Возвращает генератор отчетов рабочего процесса"""
+    if 'report_gen' not in _worker_state:
+        from modules.visualizer import DroneVisualizer
+        _worker_state['report_gen'] = ReportGenerator(visualizer=DroneVisualizer())
+    return _worker_state['report_gen']
+
+
+def _render_batch(items: List[Tuple[int, Dict]], report_format: str,
+                  include_charts: bool) -> List[Tuple[str, bytes]]:
+    """
+    Формирует отчеты для порции записей в рабочем процессе
+
+    Диаграммы рисуются один раз на запись и используются и для
+    встраивания в HTML, и для отдельного PNG-файла.
+
+    Args:
+        items: Список (порядковый номер, запись)
+        report_format: Формат отчета
+        include_charts: Добавлять ли PNG-диаграммы
+
+    Returns:
+        Список (имя файла в архиве, содержимое)
+    """
+    report_gen = _get_report_generator()
+    extension = REPORT_FORMATS[report_format]
+    needs_charts = include_charts or report_format == 'html'
+    files = []
+
+    for position, record in items:
+        results, calc_id = report_gen.prepare_record(record)
+        stem = f"{calc_id:08d}" if calc_id else f"n{position:08d}"
+
+        charts = {}
+        if needs_charts and results['components']:
+            charts = report_gen.visualizer.render_report_charts(
+                report_gen.mass_distribution(results))
+
+        if report_format == 'html':
+            text = report_gen.generate_html_report(results, calc_id, charts)
+        else:
+            text = report_gen.render_report(results, calc_id, report_format)
+        files.append((f"report_{stem}{extension}", text.encode('utf-8')))
+
+        if include_charts and charts:
+            files.append((f"chart_{stem}.png", charts['pie']))
+
+    return files
+
+
+def _batched(records: Iterable[Dict], size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    """Делит поток записей на порции с порядковыми номерами"""
+    batch = []
+    for position, record in enumerate(records, 1):
+        batch.append((position, record))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ReportExporter:
+    """Класс для параллельного экспорта отчетов в zip-архив"""
+
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = 50):
+        """
+        Инициализация экспортера
+
+        Args:
+            max_workers: Количество процессов (по умолчанию - число ядер)
+            batch_size: Количество отчетов в одной задаче
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def export_zip(self, records: Iterable[Dict], path: str, report_format: str = 'text',
+                   include_charts: bool = False,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> Dict:
+        """
+        Экспортирует отчеты в zip-архив
+
+        Отчеты формируются в пуле процессов, а главный процесс в это время
+        сжимает и записывает в архив уже готовые порции. Порции записываются
+        в порядке поступления записей, имена файлов определяются ID расчета
+        (report_00000042.txt, chart_00000042.png).
+
+        Пул запускается методом spawn: экспорт вызывается из фонового потока
+        GUI, и fork скопировал бы процесс с потоками tkinter и записи в базу.
+
+        Args:
+            records: Итератор записей истории или результатов расчета
+            path: Путь к zip-архиву
+            report_format: Формат отчетов из REPORT_FORMATS
+            include_charts: Добавлять ли PNG-диаграммы распределения массы
+            progress_callback: Функция, вызываемая с количеством готовых отчетов
+
+        Returns:
+            Словарь {'path', 'count', 'files', 'elapsed', 'reports_per_second'}
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат отчета: {report_format}")
+
+        started = time.perf_counter()
+        count = 0
+        files = 0
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                pending = deque()
+
+                def write_completed(future, batch_length):
+                    nonlocal count, files
+                    for name, content in future.result():
+                        archive.writestr(name, content)
+                        files += 1
+                    count += batch_length
+                    if progress_callback:
+                        progress_callback(count)
+
+                for batch in _batched(records, self.batch_size):
+                    # Окно задач ограничено, чтобы не держать весь поток в памяти
+                    if len(pending) >= self.max_workers * 2:
+                        write_completed(*pending.popleft())
+                    future = executor.submit(_render_batch, batch, report_format, include_charts)
+                    pending.append((future, len(batch)))
+
+                while pending:
+                    write_completed(*pending.popleft())
+        except BaseException:
+            # Отмена (исключение из progress_callback) не ждет порций в очереди
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'path': path,
+            'count': count,
+            'files': files,
+            'elapsed': elapsed,
+            'reports_per_second': count / elapsed if elapsed > 0 else 0.0
+        }
@@ -4,21 +4,41 @@
 """
 
 import customtkinter as ctk
-from tkinter import messagebox, scrolledtext, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from typing import Dict, Optional
+from tkinter import messagebox, scrolledtext, filedialog, ttk
+from typing import Callable, Dict, Optional
+from PIL import Image
 import os
+import queue
+import time
+from bisect import bisect_left, insort
 
 from database.db_manager import DatabaseManager
-from modules.calculator import DroneCalculator
+from modules.calculator import DroneCalculator, COMPONENT_TABLES
 from modules.visualizer import DroneVisualizer
-from modules.report import ReportGenerator
+from modules.report import ReportGenerator, REPORT_FORMATS, COMPONENT_NAMES_RU
+from modules.report_cache import ReportCache
+from modules.chart_cache import ChartCache
+from modules.chart_renderer import ChartRenderPool
+from modules.analysis import ConfigurationAnalyzer
+from modules.analytics import HistoryAnalytics, PERIODS
+from modules.history_pager import HistoryPager
+from modules.history_view import VirtualHistoryList
+from modules.catalog_import import CatalogImporter
+from modules.export import ReportExporter
+from modules.task_runner import TaskCancelled, TaskRunner
+from modules.live_calculation import LiveCalculation
+from modules.component_index import ComponentIndex
+from modules.component_selector import ComponentSelector
 
 # Настройка темы
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Задержка пересчета после последнего изменения выбора (мс)
+LIVE_RECALC_DELAY_MS = 150
+# Минимальный интервал между перерисовками диаграммы калькулятора (мс)
+LIVE_CHART_INTERVAL_MS = 300
+
 
 class DroneCalculatorGUI:
     """Главный класс GUI приложения"""
@@ -32,8 +52,29 @@ class DroneCalculatorGUI:
         # Инициализация компонентов
         self.db = DatabaseManager()
         self.calculator = DroneCalculator()
-        self.visualizer = DroneVisualizer()
-        self.report_gen = ReportGenerator()
+        self.visualizer = DroneVisualizer(ChartCache(cache_dir=os.path.join("database", "chart_cache")))
+        self.report_gen = ReportGenerator(cache=ReportCache(), visualizer=self.visualizer)
+        self.analyzer = ConfigurationAnalyzer(self.db)
+        self.importer = CatalogImporter(self.db, self.calculator)
+        self.exporter = ReportExporter()
+        self.chart_renderer = ChartRenderPool(self.visualizer)
+        self.tasks = TaskRunner()
+        self.live = LiveCalculation(self.calculator)
+
+        # Изменения базы данных передаются в главный поток через очередь
+        self._db_events = queue.Queue()
+        self.db.subscribe(self._db_events.put)
+        self._listed_table = None
+        self._listed_ids = []
+
+        # Состояние живого пересчета: измененные слоты и отложенные вызовы
+        self._dirty_slots = set()
+        self._live_errors = {}
+        self._recalc_job = None
+        self._chart_job = None
+        self._last_chart_time = 0.0
+        self.analytics = HistoryAnalytics(self.db)
+        self.history_pager = HistoryPager(self.db, self.calculator)
 
         # Хранилище выбранных компонентов
         self.selected_components = {
@@ -49,14 +90,20 @@ class DroneCalculatorGUI:
         self.component_widgets = {}
         self.quantity_widgets = {}
 
+        # Вкладки создаются при первом открытии, данные загружаются после
+        # запуска цикла событий (см. run)
+        self._tab_builders = {
+            "Калькулятор": self._create_calculator_tab,
+            "Управление компонентами": self._create_components_tab,
+            "История расчетов": self._create_history_tab,
+            "Аналитика": self._create_dashboard_tab
+        }
+        self._built_tabs = set()
+        self._startup_callback = None
+
         # Создание интерфейса
         self._create_main_layout()
-        self._create_calculator_tab()
-        self._create_components_tab()
-        self._create_history_tab()
-
-        # Загрузка данных
-        self._load_components_data()
+        self._ensure_tab(self.tabview.get())
 
     def _create_main_layout(self):
         """Создает основную структуру интерфейса"""
@@ -68,14 +115,44 @@ class DroneCalculatorGUI:
         )
         header.pack(pady=20)
 
+        # Строка состояния фоновых задач
+        status_frame = ctk.CTkFrame(self.root, height=36)
+        status_frame.pack(side="bottom", fill="x", padx=20, pady=(0, 10))
+
+        self.status_label = ctk.CTkLabel(status_frame, text="Готово", anchor="w")
+        self.status_label.pack(side="left", fill="x", expand=True, padx=10)
+
+        self.status_cancel = ctk.CTkButton(
+            status_frame,
+            text="Отмена",
+            command=self.tasks.cancel_all,
+            width=90,
+            height=28
+        )
+        self.status_progress = ctk.CTkProgressBar(status_frame, width=250)
+        self._status_message = "Готово"
+        self._status_state = None
+
         # Табы
-        self.tabview = ctk.CTkTabview(self.root, width=1350, height=750)
+        self.tabview = ctk.CTkTabview(self.root, width=1350, height=750,
+                                      command=self._on_tab_changed)
         self.tabview.pack(pady=10, padx=20, fill="both", expand=True)
 
         # Создание вкладок
         self.tab_calculator = self.tabview.add("Калькулятор")
         self.tab_components = self.tabview.add("Управление компонентами")
         self.tab_history = self.tabview.add("История расчетов")
+        self.tab_dashboard = self.tabview.add("Аналитика")
+
+    def _on_tab_changed(self):
+        """Создает открытую вкладку при первом переключении на нее"""
+        self._ensure_tab(self.tabview.get())
+
+    def _ensure_tab(self, name: str):
+        """Создает вкладку, если она еще не создана"""
+        if name not in self._built_tabs:
+            self._built_tabs.add(name)
+            self._tab_builders[name]()
 
     def _create_calculator_tab(self):
         """Создает вкладку калькулятора"""
@@ -112,8 +189,8 @@ class DroneCalculatorGUI:
 
         ctk.CTkButton(
             button_frame,
-            text="Рассчитать массу",
-            command=self._calculate_mass,
+            text="Сохранить расчет",
+            command=self._commit_calculation,
             font=ctk.CTkFont(size=16, weight="bold"),
             height=40
         ).pack(side="left", expand=True, padx=5)
@@ -127,6 +204,14 @@ class DroneCalculatorGUI:
             fg_color="gray"
         ).pack(side="left", expand=True, padx=5)
 
+        ctk.CTkButton(
+            button_frame,
+            text="Фронт Парето",
+            command=self._show_pareto_frontier,
+            font=ctk.CTkFont(size=16),
+            height=40
+        ).pack(side="left", expand=True, padx=5)
+
         # Правая колонка - результаты
         right_frame = ctk.CTkFrame(main_container)
         right_frame.pack(side="right", fill="both", expand=True, padx=(5, 0))
@@ -156,6 +241,15 @@ class DroneCalculatorGUI:
         )
         self.category_label.pack(pady=5)
 
+        # Ошибки ввода живого расчета (без всплывающих окон)
+        self.live_error_label = ctk.CTkLabel(
+            right_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color="#FF6B6B"
+        )
+        self.live_error_label.pack(pady=2)
+
         # Фрейм для диаграммы
         self.chart_frame = ctk.CTkFrame(right_frame)
         self.chart_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -180,6 +274,14 @@ class DroneCalculatorGUI:
             height=35
         ).pack(side="left", expand=True, padx=5)
 
+        ctk.CTkButton(
+            report_button_frame,
+            text="Что если",
+            command=self._show_substitution_matrix,
+            font=ctk.CTkFont(size=14),
+            height=35
+        ).pack(side="left", expand=True, padx=5)
+
     def _create_component_selector(self, parent, comp_type: str, label: str,
                                   show_quantity: bool = False, default_qty: int = 1):
         """Создает селектор для выбора компонента"""
@@ -193,23 +295,19 @@ class DroneCalculatorGUI:
             font=ctk.CTkFont(size=16, weight="bold")
         ).pack(anchor="w", padx=10, pady=5)
 
-        # Выпадающий список
-        table_name = self._get_table_name(comp_type)
-        components = self.db.get_components(table_name)
-        component_names = ["Не выбран"] + [f"{c['name']} ({c['mass']}г)" for c in components]
-
-        combobox = ctk.CTkComboBox(
+        # Поле поиска с выпадающим списком совпадений
+        # Каталог загружается в фоне после запуска (_load_components_data)
+        selector = ComponentSelector(
             frame,
-            values=component_names,
+            ComponentIndex(),
+            on_change=lambda: self._on_selection_changed(comp_type),
             width=400,
             font=ctk.CTkFont(size=14)
         )
-        combobox.set("Не выбран")
-        combobox.pack(padx=10, pady=5)
+        selector.pack(padx=10, pady=5, anchor="w")
 
         self.component_widgets[comp_type] = {
-            'combobox': combobox,
-            'components': components
+            'selector': selector
         }
 
         # Поле количества
@@ -230,129 +328,311 @@ class DroneCalculatorGUI:
             )
             qty_entry.insert(0, str(default_qty))
             qty_entry.pack(side="left", padx=5)
+            qty_entry.bind("<KeyRelease>", lambda event: self._on_selection_changed(comp_type))
 
             self.quantity_widgets[comp_type] = qty_entry
 
     def _get_table_name(self, comp_type: str) -> str:
         """Возвращает название таблицы для типа компонента"""
-        table_map = {
-            'frame': 'frames',
-            'motor': 'motors',
-            'battery': 'batteries',
-            'flight_controller': 'flight_controllers',
-            'propeller': 'propellers',
-            'camera': 'cameras'
-        }
-        return table_map.get(comp_type, comp_type)
-
-    def _calculate_mass(self):
-        """Выполняет расчет массы"""
-        try:
-            # Собираем данные о выбранных компонентах
-            components_data = {}
-
-            for comp_type, widgets in self.component_widgets.items():
-                combobox = widgets['combobox']
-                selected = combobox.get()
-
-                if selected != "Не выбран":
-                    # Извлекаем ID компонента из списка
-                    selected_index = combobox.cget("values").index(selected) - 1
-                    if selected_index >= 0:
-                        component = widgets['components'][selected_index]
-
-                        # Получаем количество
-                        qty = 1
-                        if comp_type in self.quantity_widgets:
-                            try:
-                                qty = int(self.quantity_widgets[comp_type].get())
-                                valid, msg = self.calculator.validate_quantity(qty)
-                                if not valid:
-                                    messagebox.showerror("Ошибка", f"{comp_type}: {msg}")
-                                    return
-                            except ValueError:
-                                messagebox.showerror("Ошибка", f"Некорректное количество для {comp_type}")
-                                return
-
-                        components_data[comp_type] = {
-                            'id': component['id'],
-                            'name': component['name'],
-                            'mass': component['mass'],
-                            'qty': qty
-                        }
-
-            if not components_data:
-                messagebox.showwarning("Предупреждение", "Выберите хотя бы один компонент")
-                return
-
-            # Выполняем расчет
-            results = self.calculator.calculate_total_mass(components_data)
+        return COMPONENT_TABLES.get(comp_type, comp_type)
+
+    def _read_selector(self, comp_type: str):
+        """
+        Читает выбранный компонент и количество слота
+
+        Returns:
+            Кортеж (компонент или None, количество, сообщение об ошибке или None)
+        """
+        component = self.component_widgets[comp_type]['selector'].selected()
+        if component is None:
+            return None, 1, None
+
+        # Получаем количество
+        qty = 1
+        if comp_type in self.quantity_widgets:
+            try:
+                qty = int(self.quantity_widgets[comp_type].get())
+            except ValueError:
+                return None, 1, f"Некорректное количество для {comp_type}"
+            valid, msg = self.calculator.validate_quantity(qty)
+            if not valid:
+                return None, 1, f"{comp_type}: {msg}"
+
+        return component, qty, None
+
+    def _on_selection_changed(self, comp_type: str):
+        """Откладывает пересчет до окончания серии изменений"""
+        self._dirty_slots.add(comp_type)
+        if self._recalc_job is not None:
+            self.root.after_cancel(self._recalc_job)
+        self._recalc_job = self.root.after(LIVE_RECALC_DELAY_MS, self._recalculate)
+
+    def _recalculate(self):
+        """Пересчитывает измененные слоты и обновляет результаты"""
+        self._recalc_job = None
+        changed = False
+        for comp_type in self._dirty_slots:
+            component, qty, error = self._read_selector(comp_type)
+            if error:
+                # Слот с ошибкой сохраняет прежнее значение
+                self._live_errors[comp_type] = error
+                continue
+            self._live_errors.pop(comp_type, None)
+            changed |= self.live.set_component(comp_type, component, qty)
+        self._dirty_slots.clear()
+
+        self.live_error_label.configure(text="\n".join(self._live_errors.values()))
+        if not changed:
+            return
 
-            # Обновляем отображение
-            total_mass = results['total_mass']
+        if self.live:
             self.total_mass_label.configure(
-                text=f"Общая масса: {self.calculator.format_mass(total_mass)}"
+                text=f"Общая масса: {self.calculator.format_mass(self.live.total_mass)}"
             )
-
-            category = self.calculator.get_weight_category(total_mass)
-            self.category_label.configure(text=f"Категория: {category}")
-
-            # Создаем диаграмму
-            distribution = self.calculator.get_mass_distribution(components_data)
-            self._update_chart(distribution)
-
-            # Сохраняем результаты для отчета
+            self.category_label.configure(text=f"Категория: {self.live.category}")
+            # Результаты доступны для отчетов без сохранения в историю
             self.last_calculation = {
-                'results': results,
-                'components_data': components_data
+                'results': self.live.results(),
+                'components_data': self.live.components_data
             }
+        else:
+            self.total_mass_label.configure(text="Общая масса: 0.0 г")
+            self.category_label.configure(text="")
+            if hasattr(self, 'last_calculation'):
+                del self.last_calculation
 
-            # Сохраняем в историю
-            self._save_to_history(components_data, total_mass)
+        self._schedule_chart()
+
+    def _schedule_chart(self):
+        """Перерисовывает диаграмму не чаще LIVE_CHART_INTERVAL_MS"""
+        if self._chart_job is not None:
+            return
+        wait = self._last_chart_time + LIVE_CHART_INTERVAL_MS / 1000 - time.monotonic()
+        if wait <= 0:
+            self._draw_live_chart()
+        else:
+            self._chart_job = self.root.after(int(wait * 1000) + 1, self._draw_live_chart)
+
+    def _draw_live_chart(self):
+        """Рисует диаграмму текущей конфигурации"""
+        self._chart_job = None
+        self._last_chart_time = time.monotonic()
+        self._update_chart(self.live.distribution())
+
+    def _commit_calculation(self):
+        """Сохраняет текущий расчет в историю"""
+        # Отложенные изменения применяются до сохранения
+        if self._recalc_job is not None:
+            self.root.after_cancel(self._recalc_job)
+            self._recalculate()
+
+        if self._live_errors:
+            messagebox.showerror("Ошибка", "\n".join(self._live_errors.values()))
+            return
+        if not self.live:
+            messagebox.showwarning("Предупреждение", "Выберите хотя бы один компонент")
+            return
 
-            messagebox.showinfo("Успех", "Расчет выполнен успешно!")
+        try:
+            calc_id = self._save_to_history(self.live.components_data, self.live.total_mass)
+            self._set_status(f"Расчет сохранен в историю (ID: {calc_id})")
+            self._load_history()
 
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка при расчете: {str(e)}")
+            messagebox.showerror("Ошибка", f"Не удалось сохранить расчет: {str(e)}")
 
     def _update_chart(self, distribution: Dict[str, float]):
         """Обновляет диаграмму"""
-        # Очищаем предыдущую диаграмму
+        if not distribution:
+            self._hide_chart()
+            return
+
+        # Диаграмма рисуется в фоне: до первой готовой диаграммы показывается
+        # заглушка, затем предыдущее изображение до готовности нового
+        if not hasattr(self, 'chart_label'):
+            self.chart_label = ctk.CTkLabel(self.chart_frame, text="Построение диаграммы...")
+        self.chart_label.pack(fill="both", expand=True)
+
+        self.chart_renderer.request(
+            'main', 'pie', distribution,
+            lambda image: self._show_chart_image(self.chart_label, image),
+            size=(6, 4)
+        )
+
+    def _hide_chart(self):
+        """Скрывает диаграмму и отменяет ее отрисовку"""
+        self.chart_renderer.cancel('main')
         for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+            widget.pack_forget()
+
+    def _show_chart_image(self, label: ctk.CTkLabel, image: Image.Image):
+        """Показывает готовое изображение диаграммы, если виджет еще существует"""
+        if label.winfo_exists():
+            label.configure(
+                image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size),
+                text=""
+            )
 
-        if not distribution:
+    def _poll_background(self):
+        """Передает в интерфейс готовые диаграммы и результаты фоновых задач"""
+        self.chart_renderer.poll()
+        self.tasks.poll()
+        self._apply_db_changes()
+        self._update_status()
+        self.root.after(30, self._poll_background)
+
+    def _apply_db_changes(self):
+        """Применяет накопленные изменения компонентов к списку и селекторам"""
+        changes = {}
+        while True:
+            try:
+                event = self._db_events.get_nowait()
+            except queue.Empty:
+                break
+
+            # Изменения одной таблицы объединяются с учетом порядка событий
+            changed, deleted = changes.setdefault(event['table'], (set(), set()))
+            for component_id in event['deleted']:
+                changed.discard(component_id)
+                deleted.add(component_id)
+            for component_id in event['inserted'] + event['updated']:
+                deleted.discard(component_id)
+                changed.add(component_id)
+
+        slots = {table: slot for slot, table in COMPONENT_TABLES.items()}
+        for table_name, (changed, deleted) in changes.items():
+            if table_name in slots:
+                self._patch_components(slots[table_name], table_name, changed, deleted)
+
+    def _patch_components(self, comp_type: str, table_name: str, changed: set, deleted: set):
+        """Обновляет только измененные строки списка компонентов и записи селектора"""
+        rows = self.db.get_components_by_ids(table_name, sorted(changed))
+        deleted = deleted | (changed - {row['id'] for row in rows})
+
+        widgets = self.component_widgets.get(comp_type)
+        if widgets is not None:
+            selector = widgets['selector']
+            for component_id in deleted:
+                selector.index.remove(component_id)
+            selector.index.add_many(rows)
+            selector.index_changed(changed | deleted)
+
+        if table_name != self._listed_table:
             return
 
-        # Создаем новую диаграмму
-        fig = self.visualizer.create_pie_chart(distribution)
+        # Строка компонента: две строки заголовка, затем компоненты по ID
+        self.components_listbox.configure(state="normal")
+        for component_id in sorted(deleted):
+            position = bisect_left(self._listed_ids, component_id)
+            if position < len(self._listed_ids) and self._listed_ids[position] == component_id:
+                self.components_listbox.delete(f"{position + 3}.0", f"{position + 4}.0")
+                del self._listed_ids[position]
+        appended = []
+        for row in rows:
+            position = bisect_left(self._listed_ids, row['id'])
+            if position == len(self._listed_ids):
+                # Новые ID больше отображаемых: такие строки дописываются одной вставкой
+                appended.append(row)
+                continue
+            if self._listed_ids[position] == row['id']:
+                self.components_listbox.delete(f"{position + 3}.0", f"{position + 4}.0")
+            else:
+                insort(self._listed_ids, row['id'])
+            self.components_listbox.insert(f"{position + 3}.0", self._component_line(row))
+        if appended:
+            self.components_listbox.insert(f"{len(self._listed_ids) + 3}.0",
+                                           "".join(self._component_line(row) for row in appended))
+            self._listed_ids.extend(row['id'] for row in appended)
+        self.components_listbox.configure(state="disabled")
+
+    def _set_status(self, message: str):
+        """Задает сообщение строки состояния, показываемое без активных задач"""
+        self._status_message = message
+
+    def _update_status(self):
+        """Показывает индикатор занятости и прогресс первой активной задачи"""
+        active = self.tasks.active()
+        if active:
+            task = active[0]
+            text = task['description']
+            if task['total']:
+                text += f": {task['done']} из {task['total']}"
+            elif task['done']:
+                text += f": {task['done']}"
+            if len(active) > 1:
+                text += f" (задач: {len(active)})"
+            state = (text, task['done'], task['total'])
+        else:
+            text = self._status_message
+            state = (text, None, None)
+
+        if state == self._status_state:
+            return
+        previous = self._status_state
+        self._status_state = state
+        self.status_label.configure(text=text)
+
+        if not active:
+            self.status_progress.stop()
+            self.status_progress.configure(mode="determinate")
+            self.status_progress.pack_forget()
+            self.status_cancel.pack_forget()
+            return
 
-        # Встраиваем в tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        if previous is None or previous[1] is None:
+            self.status_cancel.pack(side="right", padx=10, pady=4)
+            self.status_progress.pack(side="right", padx=10)
+
+        # Без известного объема работы показывается бегущий индикатор
+        if task['total']:
+            if self.status_progress.cget("mode") != "determinate":
+                self.status_progress.stop()
+                self.status_progress.configure(mode="determinate")
+            self.status_progress.set(min(1.0, task['done'] / task['total']))
+        elif self.status_progress.cget("mode") != "indeterminate":
+            self.status_progress.configure(mode="indeterminate")
+            self.status_progress.start()
+
+    def _show_task_error(self, message: str):
+        """Возвращает обработчик ошибки фоновой задачи"""
+        def show(error: Exception):
+            self._set_status(message)
+            messagebox.showerror("Ошибка", f"{message}:\n{str(error)}")
+        return show
 
     def _clear_selection(self):
         """Очищает выбор компонентов"""
         for widgets in self.component_widgets.values():
-            widgets['combobox'].set("Не выбран")
+            widgets['selector'].select(None, notify=False)
 
         for entry in self.quantity_widgets.values():
             entry.delete(0, 'end')
             entry.insert(0, "1")
 
+        # Отменяем отложенный пересчет и перерисовку
+        for job in (self._recalc_job, self._chart_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._recalc_job = None
+        self._chart_job = None
+        self._dirty_slots.clear()
+        self._live_errors.clear()
+        self.live.clear()
+        if hasattr(self, 'last_calculation'):
+            del self.last_calculation
+
         self.total_mass_label.configure(text="Общая масса: 0.0 г")
         self.category_label.configure(text="")
+        self.live_error_label.configure(text="")
 
-        # Очищаем диаграмму
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+        # Скрываем диаграмму
+        self._hide_chart()
 
     # gui.py
     def _show_report(self):
         """Показывает текстовый отчет"""
         if not hasattr(self, 'last_calculation'):
-            messagebox.showwarning("Предупреждение", "Сначала выполните расчет")
+            messagebox.showwarning("Предупреждение", "Сначала выберите компоненты")
             return
 
         try:
@@ -391,22 +671,17 @@ class DroneCalculatorGUI:
     def _save_report(self):
         """Сохраняет отчет в файл"""
         if not hasattr(self, 'last_calculation'):
-            messagebox.showwarning("Предупреждение", "Сначала выполните расчет")
+            messagebox.showwarning("Предупреждение", "Сначала выберите компоненты")
             return
 
         try:
-            # Генерируем отчет
-            report_text = self.report_gen.generate_text_report(
-                self.last_calculation['results']
-            )
-
             # Открываем диалог выбора места сохранения
             from datetime import datetime
             default_filename = f"drone_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+                filetypes=self._report_filetypes(documents=True),
                 initialfile=default_filename,
                 title="Сохранить отчет"
             )
@@ -415,8 +690,22 @@ class DroneCalculatorGUI:
             if not filename:
                 return
 
-            # Сохраняем файл
-            with open(filename, 'w', encoding='utf-8') as f:
+            # PDF формируется через бэкенд matplotlib и пишется сразу в файл
+            if os.path.splitext(filename)[1].lower() == '.pdf':
+                self.report_gen.save_pdf_report(self.last_calculation['results'], filename)
+                messagebox.showinfo("Успех", f"Отчет успешно сохранен:\n{filename}")
+                return
+
+            # Генерируем отчет в формате, соответствующем расширению файла
+            report_format = self._report_format_for(filename)
+            report_text = self.report_gen.render_report(
+                self.last_calculation['results'],
+                report_format=report_format
+            )
+
+            # Сохраняем файл (CSV уже содержит собственные окончания строк)
+            newline = '' if report_format == 'csv' else None
+            with open(filename, 'w', encoding='utf-8', newline=newline) as f:
                 f.write(report_text)
 
             messagebox.showinfo("Успех", f"Отчет успешно сохранен:\n{filename}")
@@ -424,8 +713,159 @@ class DroneCalculatorGUI:
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить отчет:\n{str(e)}")
 
-    def _save_to_history(self, components_data: Dict, total_mass: float):
-        """Сохраняет расчет в историю"""
+    def _report_filetypes(self, documents: bool = False) -> list:
+        """
+        Возвращает типы файлов для диалогов сохранения отчетов
+
+        Args:
+            documents: Добавить форматы отдельного документа (HTML, PDF)
+        """
+        filetypes = [
+            ("Text files", "*.txt"),
+            ("JSON", "*.json"),
+            ("JSON Lines", "*.jsonl"),
+            ("CSV", "*.csv")
+        ]
+        if documents:
+            filetypes += [("HTML", "*.html"), ("PDF", "*.pdf")]
+        return filetypes + [("All files", "*.*")]
+
+    def _report_format_for(self, filename: str) -> str:
+        """Определяет формат отчета по расширению файла"""
+        extension = os.path.splitext(filename)[1].lower()
+        for report_format, format_extension in REPORT_FORMATS.items():
+            if extension == format_extension:
+                return report_format
+        return 'text'
+
+    def _show_pareto_frontier(self):
+        """Показывает фронт Парето "масса - емкость" для текущего выбора"""
+        try:
+            # Выбранные компоненты фиксируются, остальные слоты перебираются
+            fixed = {}
+            quantities = {}
+            for comp_type, widgets in self.component_widgets.items():
+                component_id = widgets['selector'].selected_id
+                if component_id is not None:
+                    fixed[comp_type] = component_id
+
+                if comp_type in self.quantity_widgets:
+                    try:
+                        qty = int(self.quantity_widgets[comp_type].get())
+                    except ValueError:
+                        messagebox.showerror("Ошибка", f"Некорректное количество для {comp_type}")
+                        return
+                    valid, msg = self.calculator.validate_quantity(qty)
+                    if not valid:
+                        messagebox.showerror("Ошибка", f"{comp_type}: {msg}")
+                        return
+                    quantities[comp_type] = qty
+
+            result = self.analyzer.mass_capacity_frontier(fixed=fixed, quantities=quantities)
+            frontier = result['frontier']
+
+            window = ctk.CTkToplevel(self.root)
+            window.title("Фронт Парето: масса - емкость")
+            window.geometry("900x800")
+
+            fig = self.visualizer.create_pareto_chart(
+                result['masses'],
+                result['capacities'],
+                [item['total_mass'] for item in frontier],
+                [item['capacity'] for item in frontier]
+            )
+            canvas = self.visualizer.embed_figure_in_tkinter(fig, window)
+            canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+            window.bind("<Destroy>", lambda event: event.widget is window
+                        and self.visualizer.close_figure(fig))
+
+            # Список оптимальных конфигураций
+            text_widget = ctk.CTkTextbox(
+                window,
+                height=200,
+                font=ctk.CTkFont(family="Courier", size=12)
+            )
+            text_widget.pack(fill="x", padx=10, pady=10)
+            text_widget.insert("end", f"Рассмотрено конфигураций: {result['evaluated']}\n")
+            text_widget.insert("end", f"Оптимальных конфигураций: {len(frontier)}\n\n")
+            for item in frontier:
+                names = ", ".join(c['name'] for c in item['components'].values())
+                text_widget.insert(
+                    "end",
+                    f"{item['total_mass']:>9.1f} г  {item['capacity']:>7.0f} мАч  {names}\n"
+                )
+            text_widget.configure(state="disabled")
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось построить фронт Парето:\n{str(e)}")
+
+    def _show_substitution_matrix(self):
+        """Показывает таблицу замен компонентов для последнего расчета"""
+        if not hasattr(self, 'last_calculation'):
+            messagebox.showwarning("Предупреждение", "Сначала выберите компоненты")
+            return
+
+        try:
+            matrix = self.analyzer.substitution_matrix(self.last_calculation['components_data'])
+
+            window = ctk.CTkToplevel(self.root)
+            window.title("Что если: замена компонентов")
+            window.geometry("1000x600")
+
+            ctk.CTkLabel(
+                window,
+                text=(f"Базовая масса: {self.calculator.format_mass(matrix['base_total'])} | "
+                      f"Категория: {matrix['base_category']}"),
+                font=ctk.CTkFont(size=14, weight="bold")
+            ).pack(pady=10)
+
+            columns = {
+                'slot': ("Слот", 140),
+                'name': ("Компонент", 220),
+                'unit_mass': ("Масса ед. (г)", 110),
+                'delta': ("Изменение (г)", 110),
+                'total_mass': ("Общая масса (г)", 120),
+                'category': ("Категория", 260)
+            }
+            tree = ttk.Treeview(window, columns=list(columns), show="headings")
+            for column, (title, width) in columns.items():
+                tree.heading(column, text=title,
+                             command=lambda c=column: self._sort_treeview(tree, c, False))
+                tree.column(column, width=width, anchor="w")
+
+            # Замены, меняющие категорию, выделяются цветом
+            tree.tag_configure("category_changed", foreground="#FF6B6B")
+            for row in matrix['rows']:
+                tree.insert("", "end", tags=("category_changed",) if row['category_changed'] else (),
+                            values=(row['slot'], row['name'], f"{row['unit_mass']:.1f}",
+                                    f"{row['delta']:+.1f}", f"{row['total_mass']:.1f}",
+                                    row['category']))
+
+            scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side="right", fill="y", pady=10)
+            tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось построить таблицу замен:\n{str(e)}")
+
+    def _sort_treeview(self, tree, column: str, reverse: bool):
+        """Сортирует строки таблицы по столбцу (повторный клик меняет порядок)"""
+        def sort_key(value):
+            try:
+                return 0, float(value)
+            except ValueError:
+                return 1, value
+
+        rows = [(sort_key(tree.set(item, column)), item) for item in tree.get_children("")]
+        rows.sort(reverse=reverse)
+        for position, (_, item) in enumerate(rows):
+            tree.move(item, "", position)
+
+        tree.heading(column, command=lambda: self._sort_treeview(tree, column, not reverse))
+
+    def _save_to_history(self, components_data: Dict, total_mass: float) -> int:
+        """Сохраняет расчет в историю и возвращает его ID"""
         history_data = {'total_mass': total_mass}
 
         # Добавляем данные компонентов
@@ -437,7 +877,9 @@ class DroneCalculatorGUI:
             if 'qty' in comp_data:
                 history_data[f'{prefix}_qty'] = comp_data['qty']
 
-        self.db.save_calculation(history_data)
+        calc_id = self.db.save_calculation(history_data)
+        self._refresh_dashboard()
+        return calc_id
 
     def _create_components_tab(self):
         """Создает вкладку управления компонентами"""
@@ -506,6 +948,13 @@ class DroneCalculatorGUI:
             height=35
         ).pack(side="left", expand=True, padx=5)
 
+        ctk.CTkButton(
+            button_frame,
+            text="Импорт из CSV",
+            command=self._import_components_csv,
+            height=35
+        ).pack(side="left", expand=True, padx=5)
+
         # Загружаем начальный список
         self._load_components_list()
 
@@ -521,12 +970,19 @@ class DroneCalculatorGUI:
         self.components_listbox.insert("end", header)
         self.components_listbox.insert("end", "-" * 80 + "\n")
 
-        for comp in components:
-            line = f"{comp['id']:<5} {comp['name']:<30} {comp['mass']:<12.1f} {comp.get('description', '')}\n"
-            self.components_listbox.insert("end", line)
-
+        components.sort(key=lambda comp: comp['id'])
+        self.components_listbox.insert("end", "".join(self._component_line(comp) for comp in components))
         self.components_listbox.configure(state="disabled")
 
+        # Отображаемые ID нужны для точечного обновления строк
+        self._listed_table = table_name
+        self._listed_ids = [comp['id'] for comp in components]
+
+    @staticmethod
+    def _component_line(comp: Dict) -> str:
+        """Формирует строку компонента в списке"""
+        return f"{comp['id']:<5} {comp['name']:<30} {comp['mass']:<12.1f} {comp.get('description', '')}\n"
+
     def _add_component_dialog(self):
         """Открывает диалог добавления компонента"""
         dialog = ctk.CTkToplevel(self.root)
@@ -568,10 +1024,9 @@ class DroneCalculatorGUI:
                     'description': description
                 })
 
-                messagebox.showinfo("Успех", "Компонент добавлен")
+                # Список и селекторы обновляются по событию базы данных
+                self._set_status(f"Компонент добавлен: {name}")
                 dialog.destroy()
-                self._load_components_list()
-                self._load_components_data()
 
             except ValueError:
                 messagebox.showerror("Ошибка", "Некорректное значение массы")
@@ -583,6 +1038,39 @@ class DroneCalculatorGUI:
             height=35
         ).pack(pady=20)
 
+    def _import_components_csv(self):
+        """Импортирует компоненты выбранного типа из CSV-файла"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Импорт компонентов"
+        )
+        if not filename:
+            return
+
+        table_name = self.component_type_var.get()
+
+        def import_done(result: Dict):
+            message = f"Импортировано компонентов: {result['imported']}"
+            rejected = result['rejected']
+            self._set_status(message + (f", отклонено строк: {len(rejected)}" if rejected else ""))
+
+            # Окно показывается только при отклоненных строках
+            if rejected:
+                message += f"\nОтклонено строк: {len(rejected)}"
+                for item in rejected[:10]:
+                    message += f"\n  строка {item['row'] + 2}: {item['message']}"
+                if len(rejected) > 10:
+                    message += "\n  ..."
+                messagebox.showwarning("Импорт завершен", message)
+
+        self.tasks.submit(
+            f"import:{table_name}",
+            lambda context: self.importer.import_csv(table_name, filename),
+            on_done=import_done,
+            on_error=self._show_task_error("Не удалось импортировать компоненты"),
+            description=f"Импорт компонентов ({os.path.basename(filename)})"
+        )
+
     def _create_history_tab(self):
         """Создает вкладку истории расчетов"""
         # Заголовок
@@ -592,13 +1080,15 @@ class DroneCalculatorGUI:
             font=ctk.CTkFont(size=20, weight="bold")
         ).pack(pady=10)
 
-        # Скроллируемый фрейм для истории
-        self.history_scroll_frame = ctk.CTkScrollableFrame(
+        # Виртуализированный список: виджеты создаются только для видимых строк
+        self.history_view = VirtualHistoryList(
             self.tab_history,
+            self.history_pager,
+            self.chart_renderer,
             width=1300,
             height=600
         )
-        self.history_scroll_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        self.history_view.pack(pady=10, padx=20, fill="both", expand=True)
 
         # Кнопки
         button_frame = ctk.CTkFrame(self.tab_history)
@@ -611,6 +1101,27 @@ class DroneCalculatorGUI:
             height=35
         ).pack(side="left", expand=True, padx=5)
 
+        ctk.CTkButton(
+            button_frame,
+            text="Сравнить выбранные",
+            command=self._show_comparison_report,
+            height=35
+        ).pack(side="left", expand=True, padx=5)
+
+        ctk.CTkButton(
+            button_frame,
+            text="Экспорт отчетов",
+            command=self._export_history_reports,
+            height=35
+        ).pack(side="left", expand=True, padx=5)
+
+        ctk.CTkButton(
+            button_frame,
+            text="Экспорт в ZIP",
+            command=self._export_history_zip,
+            height=35
+        ).pack(side="left", expand=True, padx=5)
+
         ctk.CTkButton(
             button_frame,
             text="Очистить историю",
@@ -623,151 +1134,301 @@ class DroneCalculatorGUI:
         self._load_history()
 
     def _load_history(self):
-        """Загружает историю расчетов с диаграммами"""
-        # Очищаем предыдущее содержимое
-        for widget in self.history_scroll_frame.winfo_children():
-            widget.destroy()
+        """Загружает историю расчетов (записи читаются постранично при прокрутке)"""
+        if not hasattr(self, 'history_view'):
+            # Вкладка еще не открывалась: история загрузится при ее создании
+            return
+        self.tasks.submit(
+            'history:load',
+            lambda context: self.history_pager.fetch_head(),
+            on_done=self.history_view.reload,
+            on_error=self._show_task_error("Не удалось загрузить историю"),
+            description="Загрузка истории"
+        )
 
-        history = self.db.get_calculation_history()
+    def _create_dashboard_tab(self):
+        """Создает вкладку аналитики истории расчетов"""
+        ctk.CTkLabel(
+            self.tab_dashboard,
+            text="Аналитика истории расчетов",
+            font=ctk.CTkFont(size=20, weight="bold")
+        ).pack(pady=10)
 
-        if not history:
-            ctk.CTkLabel(
-                self.history_scroll_frame,
-                text="История расчетов пуста",
-                font=ctk.CTkFont(size=16)
-            ).pack(pady=20)
+        control_frame = ctk.CTkFrame(self.tab_dashboard)
+        control_frame.pack(fill="x", padx=20, pady=5)
+
+        ctk.CTkButton(
+            control_frame,
+            text="Обновить",
+            command=self._refresh_dashboard,
+            height=35
+        ).pack(side="left", padx=5, pady=5)
+
+        ctk.CTkLabel(control_frame, text="Период:").pack(side="left", padx=(15, 5))
+        self.dashboard_period = ctk.CTkOptionMenu(
+            control_frame,
+            values=list(PERIODS.values()),
+            command=lambda _: self._refresh_dashboard()
+        )
+        self.dashboard_period.pack(side="left", padx=5)
+
+        self.dashboard_summary = ctk.CTkLabel(
+            control_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color="#4ECDC4"
+        )
+        self.dashboard_summary.pack(side="left", padx=15)
+
+        # Сетка 2x2 диаграмм
+        charts_frame = ctk.CTkFrame(self.tab_dashboard)
+        charts_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        charts_frame.grid_columnconfigure((0, 1), weight=1)
+        charts_frame.grid_rowconfigure((0, 1), weight=1)
+
+        self.dashboard_charts = {}
+        for position, name in enumerate(('histogram', 'trend', 'usage', 'share')):
+            label = ctk.CTkLabel(charts_frame, text="Построение диаграммы...")
+            label.grid(row=position // 2, column=position % 2, padx=5, pady=5, sticky="nsew")
+            self.dashboard_charts[name] = label
+
+        self._refresh_dashboard()
+
+    def _refresh_dashboard(self):
+        """Дочитывает новые записи истории и перерисовывает панель аналитики"""
+        if not hasattr(self, 'dashboard_charts'):
             return
 
-        # Создаем запись для каждого расчета
-        for calc in history:
-            # Основной контейнер для одного расчета
-            calc_frame = ctk.CTkFrame(self.history_scroll_frame)
-            calc_frame.pack(fill="x", padx=10, pady=10)
+        period_label = self.dashboard_period.get()
+        period = {label: code for code, label in PERIODS.items()}[period_label]
+
+        def load(context):
+            # Аналитика изменяется только в этой задаче (ключ 'dashboard')
+            self.analytics.refresh()
+            return (self.analytics.summary(),
+                    self.analytics.dashboard_data(period=period, slot_names=COMPONENT_NAMES_RU))
+
+        self.tasks.submit(
+            'dashboard',
+            load,
+            on_done=lambda result: self._show_dashboard(*result, period_label),
+            on_error=self._show_task_error("Не удалось загрузить аналитику"),
+            description="Обновление аналитики"
+        )
+
+    def _show_dashboard(self, summary: Dict, data: Dict, period_label: str):
+        """Показывает сводку и запрашивает диаграммы панели аналитики"""
+        self.dashboard_summary.configure(
+            text=f"Расчетов: {summary['count']} | Средняя масса: {summary['mean']:.1f} г | "
+                 f"Мин: {summary['min']:.1f} г | Макс: {summary['max']:.1f} г"
+        )
 
-            # Контейнер с двумя колонками: текст слева, диаграмма справа
-            content_frame = ctk.CTkFrame(calc_frame)
-            content_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        charts = {
+            'histogram': ('count', "Распределение общей массы (г)"),
+            'trend': ('line', f"Средняя масса: {period_label.lower()}"),
+            'usage': ('count', "Самые используемые компоненты"),
+            'share': ('pie', "Средняя масса по типам компонентов")
+        }
+        for name, (kind, title) in charts.items():
+            label = self.dashboard_charts[name]
+            self.chart_renderer.request(
+                f"dashboard:{name}",
+                kind,
+                data[name],
+                lambda image, label=label: self._show_chart_image(label, image),
+                title=title,
+                size=(6.5, 3.5)
+            )
 
-            # Левая колонка - текстовая информация
-            text_frame = ctk.CTkFrame(content_frame)
-            text_frame.pack(side="left", fill="both", expand=True, padx=(0, 10))
+    def _show_comparison_report(self):
+        """Показывает отчет сравнения отмеченных конфигураций"""
+        selected = sorted(self.history_view.selected_ids)
+        if len(selected) < 2:
+            messagebox.showwarning("Предупреждение", "Отметьте для сравнения хотя бы два расчета")
+            return
 
-            # Заголовок расчета
-            header_text = f"ID: {calc['id']} | Дата: {calc['timestamp']}"
-            ctk.CTkLabel(
-                text_frame,
-                text=header_text,
-                font=ctk.CTkFont(size=14, weight="bold"),
-                anchor="w"
-            ).pack(fill="x", padx=10, pady=5)
-
-            # Общая масса
-            total_mass_text = f"Общая масса: {calc['total_mass']:.1f} г"
-            ctk.CTkLabel(
-                text_frame,
-                text=total_mass_text,
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color="#4ECDC4",
-                anchor="w"
-            ).pack(fill="x", padx=10, pady=5)
-
-            # Категория
-            category = self.calculator.get_weight_category(calc['total_mass'])
-            ctk.CTkLabel(
-                text_frame,
-                text=f"Категория: {category}",
-                font=ctk.CTkFont(size=12),
-                text_color="#FFA07A",
-                anchor="w"
-            ).pack(fill="x", padx=10, pady=2)
-
-            # Разделитель
-            ctk.CTkLabel(
-                text_frame,
-                text="─" * 50,
-                font=ctk.CTkFont(size=10),
-                anchor="w"
-            ).pack(fill="x", padx=10, pady=5)
-
-            # Список компонентов
-            components_text = ctk.CTkTextbox(
-                text_frame,
-                height=150,
-                font=ctk.CTkFont(family="Courier", size=11)
+        try:
+            report_text = self.report_gen.generate_comparison_report(selected, self.db)
+
+            report_window = ctk.CTkToplevel(self.root)
+            report_window.title("Сравнение конфигураций")
+            report_window.geometry("800x600")
+
+            text_widget = ctk.CTkTextbox(
+                report_window,
+                font=ctk.CTkFont(family="Courier", size=12),
+                wrap="none"
             )
-            components_text.pack(fill="both", expand=True, padx=10, pady=5)
-
-            # Добавляем информацию о компонентах
-            if calc.get('frame_name'):
-                components_text.insert("end", f"Корпус: {calc['frame_name']} ({calc['frame_mass']}г)\n")
-            if calc.get('motor_name'):
-                qty = calc.get('motor_qty', 1)
-                components_text.insert("end", f"Двигатели: {calc['motor_name']} x{qty} ({calc['motor_mass']}г каждый)\n")
-            if calc.get('battery_name'):
-                components_text.insert("end", f"Аккумулятор: {calc['battery_name']} ({calc['battery_mass']}г)\n")
-            if calc.get('flight_controller_name'):
-                components_text.insert("end", f"Контроллер: {calc['flight_controller_name']} ({calc['flight_controller_mass']}г)\n")
-            if calc.get('propeller_name'):
-                qty = calc.get('propeller_qty', 1)
-                components_text.insert("end", f"Пропеллеры: {calc['propeller_name']} x{qty} ({calc['propeller_mass']}г каждый)\n")
-            if calc.get('camera_name'):
-                components_text.insert("end", f"Камера: {calc['camera_name']} ({calc['camera_mass']}г)\n")
-
-            components_text.configure(state="disabled")
-
-            # Правая колонка - круговая диаграмма
-            chart_frame = ctk.CTkFrame(content_frame, width=400, height=300)
-            chart_frame.pack(side="right", fill="both", padx=(10, 0))
-            chart_frame.pack_propagate(False)
-
-            # Создаем данные для диаграммы
-            distribution = {}
-            if calc.get('frame_name'):
-                distribution[f"Корпус"] = calc['frame_mass']
-            if calc.get('motor_name'):
-                qty = calc.get('motor_qty', 1)
-                distribution[f"Двигатели (x{qty})"] = calc['motor_mass'] * qty
-            if calc.get('battery_name'):
-                distribution[f"Аккумулятор"] = calc['battery_mass']
-            if calc.get('flight_controller_name'):
-                distribution[f"Контроллер"] = calc['flight_controller_mass']
-            if calc.get('propeller_name'):
-                qty = calc.get('propeller_qty', 1)
-                distribution[f"Пропеллеры (x{qty})"] = calc['propeller_mass'] * qty
-            if calc.get('camera_name'):
-                distribution[f"Камера"] = calc['camera_mass']
-
-            # Создаем и встраиваем диаграмму
-            if distribution:
-                fig = self.visualizer.create_pie_chart(
-                    distribution,
-                    title=f"Распределение массы"
+            text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+            text_widget.insert("1.0", report_text)
+            text_widget.configure(state="disabled")
+
+            ctk.CTkButton(
+                report_window,
+                text="Закрыть",
+                command=report_window.destroy,
+                height=35
+            ).pack(pady=10)
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сравнить конфигурации:\n{str(e)}")
+
+    def _export_history_reports(self):
+        """Экспортирует отчеты по всей истории расчетов в один файл"""
+        from datetime import datetime
+        default_filename = f"drone_history_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=self._report_filetypes(),
+            initialfile=default_filename,
+            title="Экспорт отчетов по истории"
+        )
+        if not filename:
+            return
+
+        report_format = self._report_format_for(filename)
+
+        def export(context):
+            total = self.db.get_calculation_history_bounds()[0]
+            try:
+                return self.report_gen.write_reports(
+                    self.db.iter_calculation_history(),
+                    filename,
+                    progress_callback=lambda count: context.progress(count, total),
+                    report_format=report_format
                 )
-                canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill="both", expand=True)
+            except TaskCancelled:
+                # Незавершенный файл не оставляется
+                if os.path.exists(filename):
+                    os.remove(filename)
+                raise
+
+        self.tasks.submit(
+            'export:reports',
+            export,
+            on_done=lambda count: self._set_status(f"Экспортировано отчетов: {count} ({filename})"),
+            on_error=self._show_task_error("Не удалось экспортировать отчеты"),
+            description="Экспорт отчетов"
+        )
+
+    def _export_history_zip(self):
+        """Экспортирует отчеты и диаграммы по всей истории в zip-архив"""
+        from datetime import datetime
+        default_filename = f"drone_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".zip",
+            filetypes=[("ZIP archive", "*.zip"), ("All files", "*.*")],
+            initialfile=default_filename,
+            title="Экспорт истории в архив"
+        )
+        if not filename:
+            return
+
+        include_charts = messagebox.askyesno("Экспорт", "Добавить в архив диаграммы распределения массы?")
+
+        def export(context):
+            total = self.db.get_calculation_history_bounds()[0]
+            try:
+                return self.exporter.export_zip(
+                    self.db.iter_calculation_history(),
+                    filename,
+                    include_charts=include_charts,
+                    progress_callback=lambda count: context.progress(count, total)
+                )
+            except TaskCancelled:
+                if os.path.exists(filename):
+                    os.remove(filename)
+                raise
+
+        self.tasks.submit(
+            'export:zip',
+            export,
+            on_done=lambda result: self._set_status(
+                f"Экспортировано отчетов: {result['count']} "
+                f"({result['reports_per_second']:.1f} отчетов/с) - {filename}"
+            ),
+            on_error=self._show_task_error("Не удалось экспортировать архив"),
+            description="Экспорт в ZIP"
+        )
 
     def _clear_history(self):
         """Очищает историю расчетов"""
-        if messagebox.askyesno("Подтверждение", "Вы уверены, что хотите очистить всю историю?"):
+        if not messagebox.askyesno("Подтверждение", "Вы уверены, что хотите очистить всю историю?"):
+            return
+
+        def clear(context):
             # Получаем все записи и удаляем их
             history = self.db.get_calculation_history(limit=1000)
-            for calc in history:
+            for position, calc in enumerate(history, 1):
                 self.db.delete_calculation(calc['id'])
+                if position % 50 == 0:
+                    context.progress(position, len(history))
 
+        def clear_done(result):
+            self._set_status("История очищена")
             self._load_history()
-            messagebox.showinfo("Успех", "История очищена")
+            self._refresh_dashboard()
+
+        self.tasks.submit(
+            'history:clear',
+            clear,
+            on_done=clear_done,
+            on_error=self._show_task_error("Не удалось очистить историю"),
+            description="Очистка истории"
+        )
 
     def _load_components_data(self):
-        """Перезагружает данные компонентов в выпадающих списках"""
-        for comp_type, widgets in self.component_widgets.items():
-            table_name = self._get_table_name(comp_type)
-            components = self.db.get_components(table_name)
-            component_names = ["Не выбран"] + [f"{c['name']} ({c['mass']}г)" for c in components]
+        """Загружает каталоги компонентов в селекторы (чтение и индексация в фоне)"""
+        slots = list(self.component_widgets)
+
+        def load(context):
+            return {
+                comp_type: ComponentIndex(self.db.get_components(self._get_table_name(comp_type)))
+                for comp_type in slots
+            }
 
-            widgets['combobox'].configure(values=component_names)
-            widgets['components'] = components
+        def loaded(indexes: Dict[str, ComponentIndex]):
+            for comp_type, index in indexes.items():
+                self.component_widgets[comp_type]['selector'].set_index(index)
+            self._report_startup("Каталог компонентов загружен")
+            self._startup_callback = None
+
+        self.tasks.submit(
+            'components:load',
+            load,
+            on_done=loaded,
+            on_error=self._show_task_error("Не удалось загрузить компоненты"),
+            description="Загрузка компонентов"
+        )
+
+    def _on_started(self):
+        """Выполняет отложенные загрузки после показа окна"""
+        self._report_startup("Окно показано")
+        self._load_components_data()
 
-    def run(self):
-        """Запускает приложение"""
+    def _report_startup(self, stage: str):
+        """Сообщает об этапе запуска обработчику из run"""
+        if self._startup_callback:
+            self._startup_callback(stage)
+
+    def _on_close(self):
+        """Останавливает фоновые задачи и пул отрисовки и закрывает приложение"""
+        self.tasks.shutdown()
+        self.chart_renderer.shutdown()
+        self.root.destroy()
+
+    def run(self, startup_callback: Optional[Callable[[str], None]] = None):
+        """
+        Запускает приложение
+
+        Args:
+            startup_callback: Функция, получающая названия этапов запуска
+                ("Окно показано", "Каталог компонентов загружен")
+        """
+        self._startup_callback = startup_callback
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after_idle(self._on_started)
+        self._poll_background()
         self.root.mainloop()
@@ -0,0 +1,174 @@
+"""
+Модуль постраничного доступа к истории расчетов.
+Загружает только запрошенные страницы истории и хранит последние из них.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from modules.calculator import DroneCalculator
+
+# Подписи компонентов в списке истории: (слот, подпись, показывать количество)
+HISTORY_SLOTS = [
+    ('frame', 'Корпус', False),
+    ('motor', 'Двигатели', True),
+    ('battery', 'Аккумулятор', False),
+    ('flight_controller', 'Контроллер', False),
+    ('propeller', 'Пропеллеры', True),
+    ('camera', 'Камера', False)
+]
+
+
+class HistoryPager:
+    """Класс постраничного доступа к истории расчетов"""
+
+    def __init__(self, db, calculator: Optional[DroneCalculator] = None,
+                 page_size: int = 50, max_pages: int = 20):
+        """
+        Инициализация постраничного доступа
+
+        Args:
+            db: Экземпляр DatabaseManager
+            calculator: Калькулятор для определения категорий
+            page_size: Количество записей на странице
+            max_pages: Максимум страниц в памяти
+        """
+        self.db = db
+        self.calculator = calculator or DroneCalculator()
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.total = 0
+        self._pages = OrderedDict()
+        # Граница страницы: ID последней записи предыдущей страницы
+        self._boundaries = {0: None}
+        self.pages_loaded = 0
+
+    def fetch_head(self) -> Tuple[int, List[Dict]]:
+        """
+        Читает количество записей и первую страницу, не изменяя состояние
+
+        Может вызываться из рабочего потока; результат передается в reload.
+
+        Returns:
+            Кортеж (количество записей, строки первой страницы)
+        """
+        total = self.db.get_calculation_history_bounds()[0]
+        return total, self.db.get_calculation_page(None, self.page_size)
+
+    def reload(self, head: Optional[Tuple[int, List[Dict]]] = None) -> int:
+        """
+        Перечитывает количество записей и сбрасывает загруженные страницы
+
+        Args:
+            head: Результат fetch_head (None - прочитать сейчас)
+
+        Returns:
+            Количество записей истории
+        """
+        total, rows = head if head is not None else self.fetch_head()
+        self.total = total
+        self._pages.clear()
+        self._boundaries = {0: None}
+        if rows:
+            self._store(0, rows)
+        return self.total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def get(self, index: int) -> Optional[Dict]:
+        """
+        Получает запись по позиции в списке (0 - самый новый расчет)
+
+        Args:
+            index: Позиция записи
+
+        Returns:
+            Словарь расчета с ключом 'category' или None
+        """
+        if not 0 <= index < self.total:
+            return None
+        rows = self._page(index // self.page_size)
+        offset = index % self.page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def _page(self, page: int) -> List[Dict]:
+        """Возвращает страницу из памяти или загружает ее из базы данных"""
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        before_id = self._boundary(page)
+        if page > 0 and before_id is None:
+            return []
+        return self._store(page, self.db.get_calculation_page(before_id, self.page_size))
+
+    def _boundary(self, page: int) -> Optional[int]:
+        """Возвращает границу страницы, отсчитывая ее от ближайшей известной"""
+        if page not in self._boundaries:
+            known = max(number for number in self._boundaries if number < page)
+            start = self._boundaries[known]
+            if known > 0 and start is None:
+                return None
+            self._boundaries[page] = self.db.get_calculation_boundary(
+                start, (page - known) * self.page_size)
+        return self._boundaries[page]
+
+    def _store(self, page: int, rows: List[Dict]) -> List[Dict]:
+        """Добавляет категории к строкам страницы и запоминает ее"""
+        # Категории страницы определяются одним векторным проходом
+        categories = self.calculator.get_weight_categories([row['total_mass'] for row in rows])
+        for row, category in zip(rows, categories):
+            row['category'] = category
+
+        if len(rows) == self.page_size:
+            self._boundaries[page + 1] = rows[-1]['id']
+        self.pages_loaded += 1
+        self._pages[page] = rows
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    @staticmethod
+    def components_text(record: Dict) -> str:
+        """
+        Формирует описание состава расчета
+
+        Args:
+            record: Запись истории
+
+        Returns:
+            Строки "Компонент: модель (масса)"
+        """
+        lines = []
+        for slot, label, with_quantity in HISTORY_SLOTS:
+            if not record.get(f'{slot}_name'):
+                continue
+            if with_quantity:
+                qty = record.get(f'{slot}_qty') or 1
+                lines.append(f"{label}: {record[f'{slot}_name']} x{qty} ({record[f'{slot}_mass']}г каждый)")
+            else:
+                lines.append(f"{label}: {record[f'{slot}_name']} ({record[f'{slot}_mass']}г)")
+        return "\n".join(lines)
+
+    @staticmethod
+    def distribution(record: Dict) -> Dict[str, float]:
+        """
+        Получает распределение массы расчета для диаграммы
+
+        Args:
+            record: Запись истории
+
+        Returns:
+            Словарь {компонент: масса}
+        """
+        distribution = {}
+        for slot, label, with_quantity in HISTORY_SLOTS:
+            if not record.get(f'{slot}_name'):
+                continue
+            qty = record.get(f'{slot}_qty') or 1
+            if with_quantity:
+                distribution[f"{label} (x{qty})"] = record[f'{slot}_mass'] * qty
+            else:
+                distribution[label] = record[f'{slot}_mass']
+        return distribution
@@ -0,0 +1,291 @@
+"""
+Модуль виртуализированного списка истории расчетов.
+Создает виджеты только для видимых строк и переиспользует их при прокрутке.
+"""
+
+import math
+from typing import Dict, Optional, Set
+
+import customtkinter as ctk
+from PIL import Image
+
+from modules.history_pager import HistoryPager
+
+
+class _HistoryRow(ctk.CTkFrame):
+    """Строка списка истории, показывающая произвольную запись"""
+
+    def __init__(self, master, owner: 'VirtualHistoryList', slot: str):
+        super().__init__(master, height=owner.ROW_HEIGHT - owner.ROW_PADDING)
+        self.owner = owner
+        self.slot = slot
+        self.record = None
+        self.thumbnail_requested = False
+        self.pack_propagate(False)
+
+        # Правая колонка - миниатюра диаграммы
+        self.chart_label = ctk.CTkLabel(
+            self,
+            text="Построение диаграммы...",
+            image=owner.blank_thumbnail,
+            compound="center",
+            width=owner.thumbnail_pixels[0]
+        )
+        self.chart_label.pack(side="right", padx=10, pady=5)
+
+        # Левая колонка - текстовая информация
+        text_frame = ctk.CTkFrame(self, fg_color="transparent")
+        text_frame.pack(side="left", fill="both", expand=True, padx=10, pady=5)
+
+        header_frame = ctk.CTkFrame(text_frame, fg_color="transparent")
+        header_frame.pack(fill="x")
+
+        self.header_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            anchor="w"
+        )
+        self.header_label.pack(side="left", padx=(0, 10))
+
+        # Отметка для сравнения конфигураций
+        self.compare_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            header_frame,
+            text="Сравнить",
+            variable=self.compare_var,
+            command=self._on_compare_toggled
+        ).pack(side="left")
+
+        self.mass_label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color="#4ECDC4",
+            anchor="w"
+        )
+        self.mass_label.pack(fill="x")
+
+        self.category_label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#FFA07A",
+            anchor="w"
+        )
+        self.category_label.pack(fill="x")
+
+        self.components_label = ctk.CTkLabel(
+            text_frame,
+            text="",
+            font=ctk.CTkFont(family="Courier", size=11),
+            anchor="nw",
+            justify="left"
+        )
+        self.components_label.pack(fill="both", expand=True, pady=(5, 0))
+
+    def show(self, record: Dict):
+        """
+        Показывает запись в строке
+
+        Args:
+            record: Запись истории с ключом 'category'
+        """
+        if self.record is not None and self.record['id'] == record['id']:
+            return
+
+        self.record = record
+        self.header_label.configure(text=f"ID: {record['id']} | Дата: {record['timestamp']}")
+        self.compare_var.set(record['id'] in self.owner.selected_ids)
+        self.mass_label.configure(text=f"Общая масса: {record['total_mass']:.1f} г")
+        self.category_label.configure(text=f"Категория: {record['category']}")
+        self.components_label.configure(text=HistoryPager.components_text(record))
+
+        # Миниатюра запрашивается после остановки прокрутки
+        self.owner.renderer.cancel(self.slot)
+        self.thumbnail_requested = False
+        self.chart_label.configure(image=self.owner.blank_thumbnail, text="Построение диаграммы...")
+
+    def request_thumbnail(self):
+        """Запрашивает миниатюру диаграммы текущей записи"""
+        if self.record is None or self.thumbnail_requested:
+            return
+
+        self.thumbnail_requested = True
+        distribution = HistoryPager.distribution(self.record)
+        if not distribution:
+            self.chart_label.configure(text="Нет данных")
+            return
+
+        # Новый запрос для слота строки отменяет запрос прежней записи
+        self.owner.renderer.request(
+            self.slot,
+            'pie',
+            distribution,
+            self._show_thumbnail,
+            title="Распределение массы",
+            size=self.owner.thumbnail_size
+        )
+
+    def _show_thumbnail(self, image: Image.Image):
+        """Показывает готовую миниатюру, если строка еще существует"""
+        if self.chart_label.winfo_exists():
+            self.chart_label.configure(
+                image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size),
+                text=""
+            )
+
+    def _on_compare_toggled(self):
+        """Запоминает отметку сравнения независимо от строки"""
+        if self.record is None:
+            return
+        if self.compare_var.get():
+            self.owner.selected_ids.add(self.record['id'])
+        else:
+            self.owner.selected_ids.discard(self.record['id'])
+
+
+class VirtualHistoryList(ctk.CTkFrame):
+    """Класс виртуализированного списка истории расчетов"""
+
+    # Высота строки с отступом в пикселях
+    ROW_HEIGHT = 230
+    ROW_PADDING = 10
+    # Задержка запроса миниатюр после прокрутки в миллисекундах
+    THUMBNAIL_DELAY = 120
+
+    def __init__(self, master, pager: HistoryPager, renderer,
+                 thumbnail_size=(2.8, 2.0), **kwargs):
+        """
+        Инициализация списка
+
+        Args:
+            master: Родительский виджет
+            pager: Постраничный доступ к истории
+            renderer: Пул отрисовки диаграмм (ChartRenderPool)
+            thumbnail_size: Размер миниатюры диаграммы в дюймах (при 100 dpi)
+        """
+        super().__init__(master, **kwargs)
+        self.pager = pager
+        self.renderer = renderer
+        self.thumbnail_size = thumbnail_size
+        self.thumbnail_pixels = (int(thumbnail_size[0] * 100), int(thumbnail_size[1] * 100))
+        self.selected_ids: Set[int] = set()
+
+        # Прозрачная заглушка сохраняет размер строки до готовности миниатюры
+        blank = Image.new("RGBA", self.thumbnail_pixels, (0, 0, 0, 0))
+        self.blank_thumbnail = ctk.CTkImage(light_image=blank, dark_image=blank,
+                                            size=self.thumbnail_pixels)
+
+        self._offset = 0
+        self._rows = []
+        self._thumbnail_job: Optional[str] = None
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.viewport)
+
+        self.empty_label = ctk.CTkLabel(
+            self.viewport,
+            text="История расчетов пуста",
+            font=ctk.CTkFont(size=16)
+        )
+
+    def reload(self, head=None):
+        """
+        Перечитывает историю и показывает ее с начала
+
+        Args:
+            head: Результат HistoryPager.fetch_head, прочитанный в фоне
+        """
+        self.pager.reload(head)
+        self.selected_ids.clear()
+        self.renderer.cancel_prefix('history:')
+        for row in self._rows:
+            row.record = None
+        self._offset = 0
+        self._render()
+
+    def _bind_wheel(self, widget):
+        """Подключает прокрутку колесом мыши к виджету и его потомкам"""
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _content_height(self) -> int:
+        return len(self.pager) * self.ROW_HEIGHT
+
+    def _on_resize(self, event):
+        """Создает недостающие строки при изменении высоты области"""
+        needed = math.ceil(event.height / self.ROW_HEIGHT) + 1
+        while len(self._rows) < needed:
+            row = _HistoryRow(self.viewport, self, f"history:{len(self._rows)}")
+            self._bind_wheel(row)
+            self._rows.append(row)
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Обрабатывает команды полосы прокрутки ('moveto' и 'scroll')"""
+        if action == "moveto":
+            self._offset = int(float(value) * self._content_height())
+        elif action == "scroll":
+            step = self.viewport.winfo_height() if unit == "pages" else self.ROW_HEIGHT
+            self._offset += int(value) * step
+        self._render()
+
+    def _on_wheel(self, event):
+        """Прокручивает список колесом мыши"""
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -1 if event.delta > 0 else 1
+        self._offset += steps * self.ROW_HEIGHT // 3
+        self._render()
+
+    def _render(self):
+        """Размещает строки пула по видимым позициям списка"""
+        height = self.viewport.winfo_height()
+        total = len(self.pager)
+        self._offset = max(0, min(self._offset, self._content_height() - height))
+
+        if total == 0:
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+        else:
+            self.empty_label.place_forget()
+
+        first = self._offset // self.ROW_HEIGHT
+        shift = self._offset % self.ROW_HEIGHT
+        for position, row in enumerate(self._rows):
+            record = self.pager.get(first + position)
+            if record is None:
+                row.place_forget()
+                self.renderer.cancel(row.slot)
+                row.record = None
+                continue
+            row.show(record)
+            row.place(x=0, y=position * self.ROW_HEIGHT - shift, relwidth=1.0,
+                      height=self.ROW_HEIGHT - self.ROW_PADDING)
+
+        content = self._content_height()
+        if content > 0:
+            self.scrollbar.set(self._offset / content, min(1.0, (self._offset + height) / content))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        if self._thumbnail_job is not None:
+            self.after_cancel(self._thumbnail_job)
+        self._thumbnail_job = self.after(self.THUMBNAIL_DELAY, self._request_thumbnails)
+
+    def _request_thumbnails(self):
+        """Запрашивает миниатюры видимых строк после остановки прокрутки"""
+        self._thumbnail_job = None
+        for row in self._rows:
+            row.request_thumbnail()
@@ -0,0 +1,107 @@
+"""
+Модуль живого расчета.
+Пересчитывает массу конфигурации по мере изменения отдельных слотов.
+"""
+
+import math
+from typing import Dict, Optional
+
+from modules.calculator import COMPONENT_TABLES, DroneCalculator
+
+
+class LiveCalculation:
+    """Класс инкрементального расчета текущей конфигурации"""
+
+    def __init__(self, calculator: Optional[DroneCalculator] = None):
+        """
+        Инициализация живого расчета
+
+        Args:
+            calculator: Калькулятор (создается по умолчанию)
+        """
+        self.calculator = calculator or DroneCalculator()
+        self.clear()
+
+    def clear(self):
+        """Сбрасывает конфигурацию"""
+        # Компонент и его суммарная масса по слотам
+        self._components = {}
+        self._masses = {}
+        self.total_mass = 0.0
+        # Номер версии конфигурации увеличивается при каждом изменении
+        self.version = 0
+        self._results = None
+        self._distribution = None
+        self._category = None
+        self._category_mass = None
+
+    def __bool__(self) -> bool:
+        return bool(self._components)
+
+    def set_component(self, slot: str, component: Optional[Dict], qty: int = 1) -> bool:
+        """
+        Задает компонент слота и пересчитывает только его вклад
+
+        Args:
+            slot: Тип компонента ('frame', 'motor', ...)
+            component: Запись компонента {'id', 'name', 'mass'} или None
+            qty: Количество
+
+        Returns:
+            True, если конфигурация изменилась
+        """
+        entry = None
+        if component is not None:
+            entry = {'id': component['id'], 'name': component['name'],
+                     'mass': component['mass'], 'qty': qty}
+        if entry == self._components.get(slot):
+            return False
+
+        if entry is None:
+            self._components.pop(slot, None)
+            self._masses.pop(slot, None)
+        else:
+            self._components[slot] = entry
+            self._masses[slot] = self.calculator.calculate_component_mass(entry['mass'], qty)
+
+        self.total_mass = math.fsum(self._masses.values())
+        self.version += 1
+        self._results = None
+        self._distribution = None
+        return True
+
+    @property
+    def components_data(self) -> Dict[str, Dict]:
+        """Выбранные компоненты в порядке слотов (формат calculate_total_mass)"""
+        return {slot: dict(self._components[slot]) for slot in COMPONENT_TABLES
+                if slot in self._components}
+
+    def results(self) -> Dict:
+        """
+        Получает результаты расчета текущей конфигурации
+
+        Returns:
+            Результат calculate_total_mass (кэшируется до следующего изменения)
+        """
+        if self._results is None:
+            self._results = self.calculator.calculate_total_mass(self.components_data)
+        return self._results
+
+    def distribution(self) -> Dict[str, float]:
+        """
+        Получает распределение массы для диаграммы
+
+        Returns:
+            Словарь {компонент: масса} (кэшируется до следующего изменения)
+        """
+        if self._distribution is None:
+            self._distribution = self.calculator.get_mass_distribution(self.components_data)
+        return self._distribution
+
+    @property
+    def category(self) -> str:
+        """Весовая категория (определяется заново только при изменении массы)"""
+        if self._category_mass != self.total_mass:
+            self._category = self.calculator.get_weight_category(self.total_mass)
+            self._category_mass = self.total_mass
+        return self._category
@@ -3,16 +3,67 @@
 Создает текстовые отчеты о конфигурации и массе дрона.
 """
 
+import base64
+import csv
+import html
+import io
+import json
+import os
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from modules.calculator import COMPONENT_TABLES, DroneCalculator
+from modules.categories import WeightCategoryRegistry, get_default_registry
+from modules.report_cache import ReportCache
+
+# Версия шаблона отчета: входит в ключ кэша, увеличивается при изменении формата
+REPORT_TEMPLATE_VERSION = 1
+
+# Названия компонентов на русском
+COMPONENT_NAMES_RU = {
+    'frame': 'Корпус',
+    'motor': 'Двигатели',
+    'battery': 'Аккумулятор',
+    'flight_controller': 'Контроллер полета',
+    'propeller': 'Пропеллеры',
+    'camera': 'Камера/Полезная нагрузка'
+}
+
+# Поддерживаемые форматы отчетов и расширения файлов
+REPORT_FORMATS = {
+    'text': '.txt',
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'csv': '.csv',
+    'html': '.html'
+}
+
+# Столбцы CSV-отчета: одна строка на компонент расчета
+CSV_COLUMNS = [
+    'calc_id', 'total_mass', 'category', 'component_type', 'component_type_ru',
+    'name', 'unit_mass', 'quantity', 'component_mass', 'percentage'
+]
 
 
 class ReportGenerator:
     """Класс для генерации отчетов о дроне"""
 
-    def __init__(self):
-        """Инициализация генератора отчетов"""
-        pass
+    def __init__(self, categories: Optional[WeightCategoryRegistry] = None,
+                 cache: Optional[ReportCache] = None, visualizer=None):
+        """
+        Инициализация генератора отчетов
+
+        Args:
+            categories: Реестр весовых категорий (по умолчанию - общий реестр)
+            cache: Кэш сформированных отчетов (None - без кэширования)
+            visualizer: DroneVisualizer для диаграмм в HTML/PDF отчетах
+        """
+        self.categories = categories or get_default_registry()
+        self.calculator = DroneCalculator(self.categories)
+        self.cache = cache
+        self.visualizer = visualizer
 
     def generate_text_report(self, calculation_results: Dict, calc_id: int = None) -> str:
         """
@@ -25,14 +76,35 @@ class ReportGenerator:
         Returns:
             Текстовый отчет
         """
-        report_lines = []
-        report_lines.append("=" * 70)
-        report_lines.append("ОТЧЕТ О МАССЕ БЕСПИЛОТНОГО ЛЕТАТЕЛЬНОГО АППАРАТА (БПЛА)")
-        report_lines.append("=" * 70)
-        report_lines.append("")
+        header_lines = []
+        header_lines.append("=" * 70)
+        header_lines.append("ОТЧЕТ О МАССЕ БЕСПИЛОТНОГО ЛЕТАТЕЛЬНОГО АППАРАТА (БПЛА)")
+        header_lines.append("=" * 70)
+        header_lines.append("")
 
         # Информация о расчете
-        report_lines.append(f"Дата и время: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
+        header_lines.append(f"Дата и время: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
+
+        # Тело отчета не зависит от времени и берется из кэша
+        if self.cache is None:
+            body = self._render_text_body(calculation_results, calc_id)
+        else:
+            # Категория в теле зависит от реестра, поэтому он входит в ключ
+            key = ReportCache.make_key(
+                {'format': 'text', 'calc_id': calc_id, 'results': calculation_results,
+                 'categories': [self.categories.thresholds, self.categories.labels]},
+                REPORT_TEMPLATE_VERSION
+            )
+            body = self.cache.get(key)
+            if body is None:
+                body = self._render_text_body(calculation_results, calc_id)
+                self.cache.put(key, body)
+
+        return "\n".join(header_lines) + "\n" + body
+
+    def _render_text_body(self, calculation_results: Dict, calc_id: int = None) -> str:
+        """Формирует тело текстового отчета (все, кроме заголовка с датой)"""
+        report_lines = []
         if calc_id:
             report_lines.append(f"ID конфигурации: {calc_id}")
         report_lines.append("")
@@ -44,16 +116,7 @@ class ReportGenerator:
         report_lines.append("")
 
         components = calculation_results.get('components', {})
-
-        # Названия компонентов на русском
-        component_names_ru = {
-            'frame': 'Корпус',
-            'motor': 'Двигатели',
-            'battery': 'Аккумулятор',
-            'flight_controller': 'Контроллер полета',
-            'propeller': 'Пропеллеры',
-            'camera': 'Камера/Полезная нагрузка'
-        }
+        component_names_ru = COMPONENT_NAMES_RU
 
         for comp_type, comp_data in components.items():
             comp_name_ru = component_names_ru.get(comp_type, comp_type)
@@ -112,18 +175,385 @@ class ReportGenerator:
 
         return "\n".join(report_lines)
 
+    def build_report_data(self, calculation_results: Dict, calc_id: int = None) -> Dict:
+        """
+        Формирует структурированные данные отчета для машинной обработки
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+            calc_id: ID расчета в базе данных
+
+        Returns:
+            Словарь с разбивкой по компонентам, процентами, категорией
+            и рекомендациями
+        """
+        components = calculation_results.get('components', {})
+        total_mass = calculation_results.get('total_mass', 0)
+
+        return {
+            'calc_id': calc_id,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'total_mass': total_mass,
+            'total_mass_kg': total_mass / 1000,
+            'component_count': calculation_results.get('component_count', 0),
+            'category': self._get_weight_category(total_mass),
+            'components': [
+                {
+                    'type': comp_type,
+                    'type_ru': COMPONENT_NAMES_RU.get(comp_type, comp_type),
+                    'name': comp_data['name'],
+                    'unit_mass': comp_data['unit_mass'],
+                    'quantity': comp_data['quantity'],
+                    'total_mass': comp_data['total_mass'],
+                    'percentage': (comp_data['total_mass'] / total_mass * 100) if total_mass > 0 else 0
+                }
+                for comp_type, comp_data in components.items()
+            ],
+            'recommendations': self._generate_recommendations(total_mass, components)
+        }
+
+    def generate_json_report(self, calculation_results: Dict, calc_id: int = None) -> str:
+        """
+        Генерирует отчет в формате JSON
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+            calc_id: ID расчета в базе данных
+
+        Returns:
+            JSON-строка отчета
+        """
+        return json.dumps(self.build_report_data(calculation_results, calc_id),
+                          ensure_ascii=False, indent=2)
+
+    def _csv_rows(self, report_data: Dict) -> List[List]:
+        """Разворачивает данные отчета в строки CSV (по строке на компонент)"""
+        return [
+            [report_data['calc_id'], report_data['total_mass'], report_data['category'],
+             comp['type'], comp['type_ru'], comp['name'], comp['unit_mass'],
+             comp['quantity'], comp['total_mass'], round(comp['percentage'], 2)]
+            for comp in report_data['components']
+        ]
+
+    def render_report(self, calculation_results: Dict, calc_id: int = None,
+                      report_format: str = 'text') -> str:
+        """
+        Формирует один отчет в указанном формате
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+            calc_id: ID расчета в базе данных
+            report_format: Формат из REPORT_FORMATS
+
+        Returns:
+            Текст отчета
+        """
+        if report_format == 'text':
+            return self.generate_text_report(calculation_results, calc_id)
+        if report_format == 'json':
+            return self.generate_json_report(calculation_results, calc_id)
+        if report_format == 'html':
+            return self.generate_html_report(calculation_results, calc_id)
+
+        report_data = self.build_report_data(calculation_results, calc_id)
+        if report_format == 'jsonl':
+            return json.dumps(report_data, ensure_ascii=False) + "\n"
+        if report_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(self._csv_rows(report_data))
+            return buffer.getvalue()
+
+        raise ValueError(f"Неизвестный формат отчета: {report_format}")
+
+    def mass_distribution(self, calculation_results: Dict) -> Dict[str, float]:
+        """
+        Получает распределение массы для диаграмм отчета
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+
+        Returns:
+            Словарь {название_компонента: масса}
+        """
+        distribution = {}
+        for comp_data in calculation_results.get('components', {}).values():
+            name = comp_data['name']
+            if comp_data['quantity'] > 1:
+                name = f"{name} (x{comp_data['quantity']})"
+            distribution[name] = comp_data['total_mass']
+        return distribution
+
+    def _report_charts(self, calculation_results: Dict,
+                       charts: Optional[Dict[str, bytes]]) -> Dict[str, bytes]:
+        """Возвращает готовые диаграммы или рисует их через визуализатор"""
+        if charts is not None:
+            return charts
+        distribution = self.mass_distribution(calculation_results)
+        if self.visualizer is None or not distribution:
+            return {}
+        return self.visualizer.render_report_charts(distribution)
+
+    def generate_html_report(self, calculation_results: Dict, calc_id: int = None,
+                             charts: Optional[Dict[str, bytes]] = None) -> str:
+        """
+        Генерирует отчет в формате HTML со встроенными диаграммами
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+            calc_id: ID расчета в базе данных
+            charts: Готовые PNG-диаграммы {'pie': bytes, 'bar': bytes}
+                (по умолчанию рисуются визуализатором, если он задан)
+
+        Returns:
+            HTML-документ
+        """
+        data = self.build_report_data(calculation_results, calc_id)
+        charts = self._report_charts(calculation_results, charts)
+        escape = html.escape
+
+        rows = "\n".join(
+            f"<tr><td>{escape(c['type_ru'])}</td><td>{escape(str(c['name']))}</td>"
+            f"<td>{c['unit_mass']:.1f}</td><td>{c['quantity']}</td>"
+            f"<td>{c['total_mass']:.1f}</td><td>{c['percentage']:.1f}%</td></tr>"
+            for c in data['components']
+        )
+        recommendations = "\n".join(f"<li>{escape(r)}</li>" for r in data['recommendations'])
+        images = "\n".join(
+            f'<img src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}" '
+            f'alt="{kind}">'
+            for kind, png in charts.items()
+        )
+        calc_line = f"<p>ID конфигурации: {calc_id}</p>" if calc_id else ""
+
+        return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Отчет о массе БПЛА</title>
+<style>
+body {{ font-family: sans-serif; background: #2b2b2b; color: #eee; margin: 2em; }}
+table {{ border-collapse: collapse; margin: 1em 0; }}
+th, td {{ border: 1px solid #555; padding: 4px 10px; text-align: left; }}
+th {{ background: #3a3a3a; }}
+.total {{ color: #4ECDC4; font-size: 1.4em; font-weight: bold; }}
+.category {{ color: #FFA07A; }}
+img {{ max-width: 48%; margin: 0.5em; }}
+</style>
+</head>
+<body>
+<h1>Отчет о массе беспилотного летательного аппарата (БПЛА)</h1>
+<p>Дата и время: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}</p>
+{calc_line}
+<p class="total">Общая масса: {data['total_mass']:.1f} г ({data['total_mass_kg']:.3f} кг)</p>
+<p class="category">Категория БПЛА: {escape(data['category'])}</p>
+<h2>Состав конфигурации</h2>
+<table>
+<tr><th>Компонент</th><th>Модель</th><th>Масса ед. (г)</th><th>Кол-во</th><th>Масса (г)</th><th>Доля</th></tr>
+{rows}
+</table>
+<h2>Распределение массы</h2>
+{images}
+<h2>Рекомендации</h2>
+<ul>
+{recommendations}
+</ul>
+</body>
+</html>
+"""
+
+    def save_pdf_report(self, calculation_results: Dict, filename: str, calc_id: int = None,
+                        charts: Optional[Dict[str, bytes]] = None) -> str:
+        """
+        Сохраняет отчет в PDF (бэкенд PDF matplotlib)
+
+        Первая страница содержит текст отчета, следующие - готовые
+        изображения диаграмм, поэтому диаграммы не перерисовываются.
+
+        Args:
+            calculation_results: Результаты расчета из DroneCalculator
+            filename: Путь к PDF-файлу
+            calc_id: ID расчета в базе данных
+            charts: Готовые PNG-диаграммы (по умолчанию рисуются визуализатором)
+
+        Returns:
+            Имя файла
+        """
+        from matplotlib.backends.backend_pdf import PdfPages
+        from matplotlib.figure import Figure
+        import matplotlib.image as mpimg
+
+        report_text = self.generate_text_report(calculation_results, calc_id)
+        charts = self._report_charts(calculation_results, charts)
+
+        with PdfPages(filename) as pdf:
+            page = Figure(figsize=(8.27, 11.69))
+            page.text(0.05, 0.97, report_text, family='monospace', fontsize=7, va='top')
+            pdf.savefig(page)
+
+            for png in charts.values():
+                page = Figure(figsize=(8.27, 11.69))
+                ax = page.add_axes([0.05, 0.05, 0.9, 0.9])
+                ax.imshow(mpimg.imread(io.BytesIO(png), format='png'))
+                ax.axis('off')
+                pdf.savefig(page)
+
+        return filename
+
+    def build_comparison_data(self, configs: List, db=None) -> Dict:
+        """
+        Выравнивает несколько конфигураций по слотам и сравнивает их
+
+        Массы всех конфигураций собираются в матрицы (конфигурации x слоты),
+        после чего итоги, категории и разницы считаются одним векторным
+        проходом. Первая конфигурация является базовой для разниц.
+
+        Args:
+            configs: Список ID расчетов из истории, записей истории
+                или результатов DroneCalculator.calculate_total_mass
+            db: DatabaseManager (нужен, если переданы ID расчетов);
+                все ID загружаются одним запросом
+
+        Returns:
+            Словарь с результатами:
+            {
+                'labels': [str], 'slots': [str],
+                'names': [[str или None]] (конфигурации x слоты),
+                'unit_masses', 'quantities', 'slot_masses': матрицы (конфигурации x слоты),
+                'totals', 'total_deltas': массивы по конфигурациям,
+                'slot_deltas': матрица разниц масс слотов с базовой конфигурацией,
+                'categories': [str]
+            }
+        """
+        if not configs:
+            raise ValueError("Нет конфигураций для сравнения")
+
+        ids = [c for c in configs if isinstance(c, int)]
+        if ids:
+            if db is None:
+                raise ValueError("Для сравнения по ID расчетов необходима база данных")
+            records = {r['id']: r for r in db.get_calculations_by_ids(ids)}
+            missing = [calc_id for calc_id in ids if calc_id not in records]
+            if missing:
+                raise ValueError(f"Расчеты не найдены: {missing}")
+
+        # Каждая конфигурация приводится к {слот: (название, масса, количество)}
+        labels = []
+        entries = []
+        for position, config in enumerate(configs, 1):
+            if isinstance(config, int):
+                config = records[config]
+            if 'components' in config:
+                entries.append({
+                    slot: (data['name'], data['unit_mass'], data['quantity'])
+                    for slot, data in config['components'].items()
+                })
+                labels.append(f"К{position}")
+            else:
+                entries.append({
+                    slot: (data['name'], data['mass'], data['qty'])
+                    for slot, data in self.calculator.components_from_history(config).items()
+                })
+                labels.append(f"#{config['id']}" if config.get('id') else f"К{position}")
+
+        used = set().union(*entries)
+        slots = [slot for slot in COMPONENT_TABLES if slot in used]
+        slots += sorted(used - set(slots))
+
+        names = [[entry.get(slot, (None,))[0] for slot in slots] for entry in entries]
+        unit_masses = np.array(
+            [[entry.get(slot, (None, 0.0, 0))[1] for slot in slots] for entry in entries],
+            dtype=np.float64
+        ).reshape(len(entries), len(slots))
+        quantities = np.array(
+            [[entry.get(slot, (None, 0.0, 0))[2] for slot in slots] for entry in entries],
+            dtype=np.float64
+        ).reshape(len(entries), len(slots))
+
+        slot_masses = unit_masses * quantities
+        totals = slot_masses.sum(axis=1)
+
+        return {
+            'labels': labels,
+            'slots': slots,
+            'names': names,
+            'unit_masses': unit_masses,
+            'quantities': quantities,
+            'slot_masses': slot_masses,
+            'totals': totals,
+            'total_deltas': totals - totals[0],
+            'slot_deltas': slot_masses - slot_masses[0],
+            'categories': self.categories.label_array(totals).tolist()
+        }
+
+    def generate_comparison_report(self, configs: List, db=None) -> str:
+        """
+        Генерирует текстовый отчет сравнения нескольких конфигураций
+
+        Args:
+            configs: Список ID расчетов, записей истории или результатов расчета
+            db: DatabaseManager (нужен, если переданы ID расчетов)
+
+        Returns:
+            Текстовый отчет: сводка (масса, разница, категория) и
+            разбивка по слотам с разницей относительно первой конфигурации
+        """
+        data = self.build_comparison_data(configs, db)
+        labels = data['labels']
+        label_width = max(6, max(len(label) for label in labels))
+
+        report_lines = []
+        report_lines.append("=" * 70)
+        report_lines.append("СРАВНЕНИЕ КОНФИГУРАЦИЙ БПЛА")
+        report_lines.append("=" * 70)
+        report_lines.append("")
+        report_lines.append(f"Дата и время: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')}")
+        report_lines.append(f"Количество конфигураций: {len(labels)}")
+        report_lines.append(f"Базовая конфигурация: {labels[0]}")
+        report_lines.append("")
+
+        report_lines.append("-" * 70)
+        report_lines.append("СВОДКА:")
+        report_lines.append("-" * 70)
+        report_lines.append("")
+        report_lines.append(f"{'Конф.':<{label_width}}  {'Масса (г)':>10}  {'Разница':>10}  Категория")
+        for label, total, delta, category in zip(labels, data['totals'].tolist(),
+                                                 data['total_deltas'].tolist(),
+                                                 data['categories']):
+            report_lines.append(f"{label:<{label_width}}  {total:>10.1f}  {delta:>+10.1f}  {category}")
+        report_lines.append("")
+
+        report_lines.append("-" * 70)
+        report_lines.append("РАЗБИВКА ПО СЛОТАМ (разница относительно базовой):")
+        report_lines.append("-" * 70)
+
+        for column, slot in enumerate(data['slots']):
+            report_lines.append("")
+            report_lines.append(f"{COMPONENT_NAMES_RU.get(slot, slot)}:")
+            slot_masses = data['slot_masses'][:, column].tolist()
+            slot_deltas = data['slot_deltas'][:, column].tolist()
+            quantities = data['quantities'][:, column].tolist()
+            for row, label in enumerate(labels):
+                name = data['names'][row][column]
+                if name is None:
+                    model = "Не выбран"
+                elif quantities[row] > 1:
+                    model = f"{name} (x{int(quantities[row])})"
+                else:
+                    model = name
+                report_lines.append(
+                    f"  {label:<{label_width}}  {model:<32.32}  "
+                    f"{slot_masses[row]:>8.1f} г  {slot_deltas[row]:>+8.1f} г"
+                )
+
+        report_lines.append("")
+        report_lines.append("=" * 70)
+        return "\n".join(report_lines)
+
     def _get_weight_category(self, total_mass: float) -> str:
         """Определяет категорию дрона по массе"""
-        if total_mass < 250:
-            return "Микро (< 250г) - не требует регистрации"
-        elif total_mass < 500:
-            return "Мини (250-500г)"
-        elif total_mass < 2000:
-            return "Средний (0.5-2 кг)"
-        elif total_mass < 25000:
-            return "Большой (2-25 кг)"
-        else:
-            return "Тяжелый (> 25 кг) - требуется специальное разрешение"
+        return self.categories.classify(total_mass)
 
     def _generate_recommendations(self, total_mass: float, components: Dict) -> list:
         """Генерирует рекомендации на основе конфигурации"""
@@ -163,18 +593,120 @@ class ReportGenerator:
 
         return recommendations
 
-    def save_report_to_file(self, report_text: str, filename: str = None):
+    def save_report_to_file(self, report_text: str, filename: str = None, calc_id: int = None):
         """
         Сохраняет отчет в текстовый файл
 
         Args:
             report_text: Текст отчета
             filename: Имя файла (если None, генерируется автоматически)
+            calc_id: ID расчета для имени файла по умолчанию
         """
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"drone_report_{timestamp}.txt"
+            if calc_id:
+                filename = f"drone_report_{calc_id}.txt"
+            else:
+                # Микросекунды исключают совпадение имен в пределах секунды
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                filename = f"drone_report_{timestamp}.txt"
 
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(report_text)
         return filename
+
+    def prepare_record(self, record: Dict) -> Tuple[Dict, Optional[int]]:
+        """
+        Приводит запись к результатам расчета
+
+        Args:
+            record: Результаты DroneCalculator.calculate_total_mass
+                или запись истории calculations_history
+
+        Returns:
+            Кортеж (результаты расчета, ID расчета или None)
+        """
+        if 'components' in record:
+            return record, None
+        components = self.calculator.components_from_history(record)
+        return self.calculator.calculate_total_mass(components), record.get('id')
+
+    def write_reports(self, records: Iterable[Dict], output: str,
+                      progress_callback: Optional[Callable[[int], None]] = None,
+                      progress_every: int = 100, buffer_size: int = 1 << 20,
+                      report_format: str = 'text') -> int:
+        """
+        Потоково записывает отчеты для набора расчетов
+
+        Отчеты формируются по одному и сразу записываются в буферизованный
+        файл, поэтому память не зависит от количества записей.
+
+        Args:
+            records: Итератор записей истории или результатов расчета
+            output: Путь к файлу (все отчеты подряд) или к директории
+                (отдельный файл на отчет; путь должен существовать
+                или оканчиваться разделителем)
+            progress_callback: Функция, вызываемая с количеством готовых отчетов
+            progress_every: Частота вызова progress_callback
+            buffer_size: Размер буфера записи в байтах
+            report_format: Формат из REPORT_FORMATS. В одном файле 'json'
+                записывается массивом, 'jsonl' - строкой на отчет,
+                'csv' - общим заголовком и строкой на компонент
+
+        Returns:
+            Количество записанных отчетов
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат отчета: {report_format}")
+
+        to_directory = os.path.isdir(output) or output.endswith(('/', os.sep))
+        if report_format == 'html' and not to_directory:
+            raise ValueError("HTML-отчеты записываются только в директорию")
+        extension = REPORT_FORMATS[report_format]
+        newline = '' if report_format == 'csv' else None
+        count = 0
+
+        if to_directory:
+            os.makedirs(output, exist_ok=True)
+            for record in records:
+                results, calc_id = self.prepare_record(record)
+                suffix = calc_id if calc_id else f"{count + 1:06d}"
+                with open(os.path.join(output, f"drone_report_{suffix}{extension}"), 'w',
+                          encoding='utf-8', newline=newline, buffering=buffer_size) as f:
+                    f.write(self.render_report(results, calc_id, report_format))
+                count += 1
+                if progress_callback and count % progress_every == 0:
+                    progress_callback(count)
+        else:
+            with open(output, 'w', encoding='utf-8', newline=newline, buffering=buffer_size) as f:
+                writer = csv.writer(f) if report_format == 'csv' else None
+                if writer:
+                    writer.writerow(CSV_COLUMNS)
+                elif report_format == 'json':
+                    f.write("[\n")
+
+                for record in records:
+                    results, calc_id = self.prepare_record(record)
+                    if report_format == 'text':
+                        if count:
+                            f.write("\n\n")
+                        f.write(self.generate_text_report(results, calc_id))
+                    else:
+                        report_data = self.build_report_data(results, calc_id)
+                        if writer:
+                            writer.writerows(self._csv_rows(report_data))
+                        elif report_format == 'jsonl':
+                            f.write(json.dumps(report_data, ensure_ascii=False) + "\n")
+                        else:
+                            if count:
+                                f.write(",\n")
+                            f.write(json.dumps(report_data, ensure_ascii=False))
+                    count += 1
+                    if progress_callback and count % progress_every == 0:
+                        progress_callback(count)
+
+                if report_format == 'json':
+                    f.write("\n]\n")
+
+        if progress_callback and count % progress_every:
+            progress_callback(count)
+        return count
@@ -0,0 +1,156 @@
+"""
+Модуль кэша отчетов.
+LRU-кэш сформированных отчетов в памяти с необязательным уровнем на диске.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ReportCache:
+    """Класс кэша отчетов, адресуемого содержимым конфигурации"""
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        """
+        Инициализация кэша
+
+        Args:
+            max_entries: Максимум отчетов в памяти
+            cache_dir: Директория дискового уровня (None - только память)
+            max_disk_bytes: Максимальный размер дискового уровня в байтах
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        # Кэш используется одновременно главным потоком GUI и фоновыми задачами
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file()
+            )
+
+    @staticmethod
+    def make_key(payload: Dict, template_version: int) -> str:
+        """
+        Вычисляет ключ кэша по содержимому
+
+        Args:
+            payload: Данные, определяющие отчет (результаты расчета, ID, формат)
+            template_version: Версия шаблона отчета
+
+        Returns:
+            Хэш SHA-256 в шестнадцатеричном виде
+        """
+        canonical = json.dumps([template_version, payload], sort_keys=True,
+                               ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    # Расширение файлов дискового уровня
+    extension = '.txt'
+
+    def _disk_path(self, key: str) -> str:
+        """Возвращает путь файла ключа на диске"""
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+    def _read_file(self, path: str):
+        """Читает значение из файла дискового уровня"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def _write_file(self, path: str, value):
+        """Записывает значение в файл дискового уровня"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(value)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Получает отчет из кэша
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Текст отчета или None
+        """
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self.cache_dir:
+                try:
+                    text = self._read_file(self._disk_path(key))
+                except OSError:
+                    pass
+                else:
+                    self.hits += 1
+                    self._remember(key, text)
+                    return text
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str):
+        """
+        Сохраняет отчет в кэш
+
+        Args:
+            key: Ключ кэша
+            text: Текст отчета
+        """
+        with self._lock:
+            self._remember(key, text)
+
+            if self.cache_dir:
+                path = self._disk_path(key)
+                if not os.path.exists(path):
+                    self._write_file(path, text)
+                    self._disk_bytes += os.path.getsize(path)
+                    if self._disk_bytes > self.max_disk_bytes:
+                        self._trim_disk()
+
+    def _remember(self, key: str, text: str):
+        """Помещает запись в память с вытеснением давно неиспользуемых (под блокировкой)"""
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _trim_disk(self):
+        """Удаляет самые старые файлы, пока размер не станет меньше лимита (под блокировкой)"""
+        files = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in files:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+
+    def clear(self):
+        """Очищает кэш в памяти и на диске"""
+        with self._lock:
+            self._entries.clear()
+            if self.cache_dir:
+                for entry in os.scandir(self.cache_dir):
+                    if entry.is_file():
+                        os.remove(entry.path)
+                self._disk_bytes = 0
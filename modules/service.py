@@ -0,0 +1,715 @@
+"""
+Модуль HTTP-сервиса расчетов.
+Асинхронный HTTP/JSON-сервер: поиск по каталогу, расчеты, история и отчеты.
+"""
+
+import asyncio
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from modules.batch import BatchCalculator, CatalogLookup
+from modules.calculator import COMPONENT_TABLES, DroneCalculator
+from modules.component_index import ComponentIndex
+from modules.report import REPORT_FORMATS, ReportGenerator
+from modules.report_cache import ReportCache
+
+# Типы содержимого отчетов по форматам
+REPORT_CONTENT_TYPES = {
+    'text': 'text/plain; charset=utf-8',
+    'json': 'application/json; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'html': 'text/html; charset=utf-8'
+}
+
+HTTP_STATUS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+# Слот компонента по названию таблицы
+_TABLE_SLOTS = {table: slot for slot, table in COMPONENT_TABLES.items()}
+
+
+class HttpError(Exception):
+    """Ошибка запроса с HTTP-статусом"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CatalogCache:
+    """
+    Кэш каталога компонентов с поисковыми индексами.
+
+    Слоты перечитываются из базы данных только после изменения их таблицы
+    (по событиям DatabaseManager.subscribe).
+    """
+
+    def __init__(self, db):
+        """
+        Инициализация кэша
+
+        Args:
+            db: Экземпляр DatabaseManager
+        """
+        self.db = db
+        self._lock = threading.Lock()
+        self._stale = set(COMPONENT_TABLES)
+        self._catalog = {}
+        self.indexes = {}
+        self.lookup = CatalogLookup({})
+        db.subscribe(self._on_change)
+
+    def _on_change(self, event: Dict):
+        """Помечает слот измененной таблицы устаревшим"""
+        slot = _TABLE_SLOTS.get(event['table'])
+        if slot:
+            with self._lock:
+                self._stale.add(slot)
+
+    @property
+    def stale(self) -> bool:
+        """Есть ли слоты, которые нужно перечитать"""
+        return bool(self._stale)
+
+    def refresh(self) -> List[str]:
+        """
+        Перечитывает устаревшие слоты (выполняется в потоке базы данных)
+
+        Returns:
+            Список перечитанных слотов
+        """
+        with self._lock:
+            slots = sorted(self._stale)
+            # Изменения во время чтения снова пометят слот устаревшим
+            self._stale.clear()
+
+        catalog = dict(self._catalog)
+        indexes = dict(self.indexes)
+        for slot in slots:
+            components = self.db.get_components(COMPONENT_TABLES[slot])
+            catalog[slot] = components
+            indexes[slot] = ComponentIndex(components)
+
+        # Ссылки заменяются целиком, чтобы читатели видели согласованный снимок
+        self._catalog = catalog
+        self.indexes = indexes
+        self.lookup = CatalogLookup(catalog)
+        return slots
+
+    def close(self):
+        """Отменяет подписку на изменения"""
+        self.db.unsubscribe(self._on_change)
+
+
+class RequestBatcher:
+    """
+    Объединение одиночных запросов в пакеты.
+
+    Запросы, пришедшие в течение окна ожидания, обрабатываются одним
+    вызовом обработчика; пакет отправляется сразу при наборе max_batch.
+    """
+
+    def __init__(self, handler: Callable[[List], List], executor, window: float = 0.002,
+                 max_batch: int = 256):
+        """
+        Инициализация объединителя
+
+        Args:
+            handler: Функция, получающая список запросов и возвращающая
+                список результатов того же размера
+            executor: Пул, в котором выполняется обработчик
+            window: Время ожидания следующих запросов в секундах
+            max_batch: Максимальный размер пакета
+        """
+        self.handler = handler
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, item):
+        """
+        Добавляет запрос в пакет и ждет его результат
+
+        Args:
+            item: Запрос
+
+        Returns:
+            Результат обработчика для запроса
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Отправляет накопленный пакет обработчику"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self.batches += 1
+            self.requests += len(batch)
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple]):
+        """Выполняет обработчик и раздает результаты"""
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.handler,
+                                                 [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class CalculationService:
+    """
+    Класс операций сервиса расчетов.
+
+    Запросы к базе данных выполняются в пуле потоков db_workers, расчеты
+    и формирование отчетов - в отдельном потоке, поэтому цикл событий
+    не блокируется. Одиночные расчеты объединяются в пакеты RequestBatcher.
+    """
+
+    def __init__(self, db, db_workers: int = 4, batch_window: float = 0.002,
+                 max_batch: int = 256, max_history_page: int = 500):
+        """
+        Инициализация сервиса
+
+        Args:
+            db: Экземпляр DatabaseManager
+            db_workers: Количество потоков для запросов к базе данных
+            batch_window: Окно объединения одиночных расчетов в секундах
+            max_batch: Максимальный размер пакета расчетов
+            max_history_page: Максимальный размер страницы истории
+        """
+        self.db = db
+        self.max_history_page = max_history_page
+        self.calculator = DroneCalculator()
+        self.batch_calculator = BatchCalculator(calculator=self.calculator)
+        self.report_gen = ReportGenerator(cache=ReportCache())
+        self.catalog = CatalogCache(db)
+        self._db_pool = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix='service-db')
+        # Один поток расчетов: генератор отчетов и кэш не разделяются между потоками
+        self._compute = ThreadPoolExecutor(max_workers=1, thread_name_prefix='service-compute')
+        self.batcher = RequestBatcher(self._calculate_rows, self._compute, batch_window, max_batch)
+        self._catalog_lock = asyncio.Lock()
+
+    async def _in_db(self, func: Callable, *args):
+        """Выполняет запрос к базе данных в пуле потоков"""
+        return await asyncio.get_running_loop().run_in_executor(self._db_pool, func, *args)
+
+    async def _in_compute(self, func: Callable, *args):
+        """Выполняет вычисление в потоке расчетов"""
+        return await asyncio.get_running_loop().run_in_executor(self._compute, func, *args)
+
+    async def _fresh_catalog(self) -> CatalogCache:
+        """Возвращает каталог, перечитав измененные слоты"""
+        # Флаг сбрасывается в начале перечитывания, поэтому запросы ждут и идущее перечитывание
+        if self.catalog.stale or self._catalog_lock.locked():
+            # Одновременные запросы ждут одно перечитывание
+            async with self._catalog_lock:
+                if self.catalog.stale:
+                    await self._in_db(self.catalog.refresh)
+        return self.catalog
+
+    def _calculate_rows(self, rows: List[Dict]) -> List[Tuple[Dict, Dict]]:
+        """Рассчитывает пакет конфигураций (в потоке расчетов)"""
+        results, configurations = self.batch_calculator.calculate_configurations(
+            rows, self.catalog.lookup)
+        return list(zip(results, configurations))
+
+    async def search_components(self, slot: str, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Ищет компоненты по названию
+
+        Args:
+            slot: Тип компонента
+            query: Начало названия или слов названия
+            limit: Максимум результатов
+
+        Returns:
+            Список компонентов
+        """
+        if slot not in COMPONENT_TABLES:
+            raise HttpError(404, f"Неизвестный тип компонента: {slot}")
+        catalog = await self._fresh_catalog()
+        return catalog.indexes[slot].search(query, limit)
+
+    async def get_component(self, slot: str, component_id: int) -> Dict:
+        """Получает компонент каталога по ID"""
+        if slot not in COMPONENT_TABLES:
+            raise HttpError(404, f"Неизвестный тип компонента: {slot}")
+        catalog = await self._fresh_catalog()
+        component = catalog.indexes[slot].get(component_id)
+        if component is None:
+            raise HttpError(404, f"Компонент не найден: {slot} {component_id}")
+        return component
+
+    async def calculate(self, configuration: Dict, save: bool = False) -> Dict:
+        """
+        Рассчитывает одну конфигурацию
+
+        Args:
+            configuration: Конфигурация {слот: ID или название, '<слот>_qty': количество}
+            save: Сохранить ли расчет в историю
+
+        Returns:
+            Словарь {'total_mass', 'category', 'components', 'calc_id'}
+        """
+        await self._fresh_catalog()
+        result, components = await self.batcher.submit(configuration)
+        if result['error']:
+            raise HttpError(400, result['error'])
+
+        # Разбивка по компонентам считается в потоке расчетов, как и пакет
+        calculation = await self._in_compute(self.calculator.calculate_total_mass, components)
+        calc_id = None
+        if save:
+            calc_id = await self._in_db(self.db.save_calculation,
+                                        self._history_record(components, result['total_mass']))
+        return {
+            'total_mass': result['total_mass'],
+            'category': result['category'],
+            'components': calculation['components'],
+            'calc_id': calc_id
+        }
+
+    @staticmethod
+    def _history_record(components: Dict, total_mass: float) -> Dict:
+        """Готовит запись calculations_history"""
+        record = {'total_mass': total_mass}
+        for slot, data in components.items():
+            record[f'{slot}_id'] = data['id']
+            record[f'{slot}_name'] = data['name']
+            record[f'{slot}_mass'] = data['mass']
+            record[f'{slot}_qty'] = data['qty']
+        return record
+
+    async def calculate_batch(self, configurations: List[Dict]) -> List[Dict]:
+        """
+        Рассчитывает список конфигураций одним векторным проходом
+
+        Returns:
+            Список {'label', 'total_mass', 'category', 'error'} в порядке запроса
+        """
+        await self._fresh_catalog()
+        rows = await self._in_compute(self._calculate_rows, configurations)
+        return [result for result, _ in rows]
+
+    async def history(self, before: Optional[int] = None, limit: int = 50) -> Dict:
+        """
+        Получает страницу истории расчетов (новые записи первыми)
+
+        Args:
+            before: ID последней записи предыдущей страницы (None - с начала)
+            limit: Размер страницы (ограничен max_history_page)
+
+        Returns:
+            Словарь {'count', 'before', 'limit', 'next', 'items'}; next -
+            значение before для следующей страницы или None
+        """
+        limit = max(0, min(limit, self.max_history_page))
+        items = await self._in_db(self.db.get_calculation_page, before, limit)
+        count, _ = await self._in_db(self.db.get_calculation_history_bounds)
+        next_before = items[-1]['id'] if items and len(items) == limit else None
+        return {'count': count, 'before': before, 'limit': limit, 'next': next_before, 'items': items}
+
+    async def get_calculation(self, calc_id: int) -> Dict:
+        """Получает запись истории по ID"""
+        records = await self._in_db(self.db.get_calculations_by_ids, [calc_id])
+        if not records:
+            raise HttpError(404, f"Расчет не найден: {calc_id}")
+        return records[0]
+
+    def _render(self, record: Dict, report_format: str) -> str:
+        """Формирует отчет (в потоке расчетов)"""
+        results, calc_id = self.report_gen.prepare_record(record)
+        return self.report_gen.render_report(results, calc_id, report_format)
+
+    async def report(self, record: Dict, report_format: str = 'text') -> str:
+        """
+        Формирует отчет по записи истории или результатам расчета
+
+        Args:
+            record: Запись calculations_history или результаты calculate_total_mass
+            report_format: Формат из REPORT_FORMATS
+
+        Returns:
+            Текст отчета
+        """
+        if report_format not in REPORT_FORMATS:
+            raise HttpError(400, f"Неизвестный формат отчета: {report_format}")
+        return await self._in_compute(self._render, record, report_format)
+
+    def close(self):
+        """Останавливает пулы потоков и отменяет подписку на изменения"""
+        self.catalog.close()
+        self._db_pool.shutdown(wait=True)
+        self._compute.shutdown(wait=True)
+
+
+class CalculationServer:
+    """
+    Класс HTTP/1.1-сервера поверх asyncio.
+
+    Поддерживает постоянные соединения (keep-alive); тела запросов и
+    ответов - JSON, кроме отчетов.
+
+    Маршруты:
+        GET  /health
+        GET  /components/{слот}?q=...&limit=20
+        GET  /components/{слот}/{id}
+        POST /calculate           {"configuration": {...}, "save": false}
+        POST /calculate/batch     {"configurations": [{...}, ...]}
+        GET  /history?before=<id>&limit=50
+        GET  /history/{id}
+        GET  /history/{id}/report?format=text
+        POST /report              {"configuration": {...}, "format": "text"}
+    """
+
+    def __init__(self, service: CalculationService, max_body: int = 8 * 1024 * 1024,
+                 keep_alive_timeout: float = 30.0):
+        """
+        Инициализация сервера
+
+        Args:
+            service: Сервис расчетов
+            max_body: Максимальный размер тела запроса в байтах
+            keep_alive_timeout: Время ожидания следующего запроса в соединении
+        """
+        self.service = service
+        self.max_body = max_body
+        self.keep_alive_timeout = keep_alive_timeout
+        self.requests = 0
+        self._server = None
+        # Открытые соединения: {задача обработки: поток записи}
+        self._connections = {}
+        self._routes = [
+            ('GET', re.compile(r'/health'), self._health),
+            ('GET', re.compile(r'/components/(\w+)'), self._search),
+            ('GET', re.compile(r'/components/(\w+)/(\d+)'), self._component),
+            ('POST', re.compile(r'/calculate'), self._calculate),
+            ('POST', re.compile(r'/calculate/batch'), self._calculate_batch),
+            ('GET', re.compile(r'/history'), self._history),
+            ('GET', re.compile(r'/history/(\d+)'), self._calculation),
+            ('GET', re.compile(r'/history/(\d+)/report'), self._history_report),
+            ('POST', re.compile(r'/report'), self._configuration_report),
+        ]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> int:
+        """
+        Запускает прием соединений
+
+        Returns:
+            Номер порта (при port=0 выбирается свободный)
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Обслуживает соединения до отмены"""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Останавливает прием соединений и закрывает открытые соединения"""
+        if self._server is None:
+            return
+        self._server.close()
+        # Ожидающие следующего запроса соединения получают конец потока
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обрабатывает запросы одного соединения"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    # Строка запроса длиннее лимита StreamReader
+                    request_line = None
+                if request_line is not None and not request_line.strip():
+                    break
+
+                keep_alive = True
+                try:
+                    if request_line is None:
+                        raise ValueError("Слишком длинная строка запроса")
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+
+                    length = int(headers.get('content-length') or 0)
+                    if length > self.max_body:
+                        keep_alive = False
+                        raise HttpError(413, "Слишком большое тело запроса")
+                    body = await reader.readexactly(length) if length else b''
+                    status, content_type, payload = await self._dispatch(method, target, body)
+                except HttpError as e:
+                    status, content_type, payload = self._json(e.status, {'error': str(e)})
+                except ValueError:
+                    keep_alive = False
+                    status, content_type, payload = self._json(400, {'error': "Некорректный HTTP-запрос"})
+
+                self.requests += 1
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    def _json(status: int, data) -> Tuple[int, str, bytes]:
+        """Формирует JSON-ответ"""
+        return status, 'application/json; charset=utf-8', json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        """Находит маршрут и выполняет обработчик"""
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        path_matched = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path.rstrip('/') or '/')
+            if not match:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+
+            data = None
+            if method == 'POST':
+                try:
+                    data = json.loads(body or b'{}')
+                except ValueError:
+                    raise HttpError(400, "Тело запроса не является корректным JSON")
+                if not isinstance(data, dict):
+                    raise HttpError(400, "Тело запроса должно быть JSON-объектом")
+            # Обработчики проверяют параметры сами (HttpError 400);
+            # любое другое исключение - ошибка сервера
+            try:
+                result = await handler(*match.groups(), query=query, data=data)
+            except HttpError:
+                raise
+            except Exception as e:
+                raise HttpError(500, f"Внутренняя ошибка: {e}")
+            if isinstance(result, tuple):
+                return result
+            return self._json(200, result)
+
+        if path_matched:
+            raise HttpError(405, f"Метод {method} не поддерживается для {url.path}")
+        raise HttpError(404, f"Неизвестный адрес: {url.path}")
+
+    @staticmethod
+    def _int(query: Dict, name: str, default: int) -> int:
+        """Читает целочисленный параметр запроса"""
+        try:
+            return int(query.get(name, default))
+        except ValueError:
+            raise HttpError(400, f"Параметр {name} должен быть целым числом")
+
+    async def _health(self, query, data):
+        return {'status': 'ok', 'requests': self.requests}
+
+    async def _search(self, slot, query, data):
+        return await self.service.search_components(slot, query.get('q', ''),
+                                                    self._int(query, 'limit', 20))
+
+    async def _component(self, slot, component_id, query, data):
+        return await self.service.get_component(slot, int(component_id))
+
+    @staticmethod
+    def _configuration(data: Dict) -> Dict:
+        """Читает конфигурацию из тела запроса"""
+        configuration = data.get('configuration')
+        if not isinstance(configuration, dict):
+            raise HttpError(400, "Ожидается объект configuration")
+        return configuration
+
+    @staticmethod
+    def _report_format(value) -> str:
+        """Проверяет формат отчета"""
+        if not isinstance(value, str) or value not in REPORT_CONTENT_TYPES:
+            raise HttpError(400, f"Неизвестный формат отчета: {value}")
+        return value
+
+    async def _calculate(self, query, data):
+        return await self.service.calculate(self._configuration(data), bool(data.get('save', False)))
+
+    async def _calculate_batch(self, query, data):
+        configurations = data.get('configurations')
+        if not isinstance(configurations, list) or not all(isinstance(c, dict) for c in configurations):
+            raise HttpError(400, "Ожидается список объектов configurations")
+        return {'results': await self.service.calculate_batch(configurations)}
+
+    async def _history(self, query, data):
+        before = self._int(query, 'before', 0) if 'before' in query else None
+        return await self.service.history(before, self._int(query, 'limit', 50))
+
+    async def _calculation(self, calc_id, query, data):
+        return await self.service.get_calculation(int(calc_id))
+
+    async def _history_report(self, calc_id, query, data):
+        report_format = self._report_format(query.get('format', 'text'))
+        record = await self.service.get_calculation(int(calc_id))
+        text = await self.service.report(record, report_format)
+        return 200, REPORT_CONTENT_TYPES[report_format], text.encode('utf-8')
+
+    async def _configuration_report(self, query, data):
+        report_format = self._report_format(data.get('format', 'text'))
+        calculation = await self.service.calculate(self._configuration(data))
+        results = {'components': calculation['components'], 'total_mass': calculation['total_mass'],
+                   'component_count': len(calculation['components'])}
+        text = await self.service.report(results, report_format)
+        return 200, REPORT_CONTENT_TYPES[report_format], text.encode('utf-8')
+
+
+class BackgroundServer:
+    """
+    Сервер в отдельном потоке со своим циклом событий.
+
+    Используется в тестах и при нагрузочном тестировании, когда
+    вызывающий код не асинхронный.
+    """
+
+    def __init__(self, db, host: str = '127.0.0.1', port: int = 0, **service_options):
+        """
+        Инициализация сервера
+
+        Args:
+            db: Экземпляр DatabaseManager
+            host: Адрес
+            port: Порт (0 - свободный)
+            **service_options: Параметры CalculationService
+        """
+        self.db = db
+        self.host = host
+        self.port = port
+        self.service_options = service_options
+        self.service = None
+        self.server = None
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    def start(self, timeout: float = 10.0) -> int:
+        """
+        Запускает сервер и ждет готовности
+
+        Returns:
+            Номер порта
+        """
+        ready = threading.Event()
+        errors = []
+
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._stop = asyncio.Event()
+            self.service = CalculationService(self.db, **self.service_options)
+            self.server = CalculationServer(self.service)
+            try:
+                self.port = await self.server.start(self.host, self.port)
+            except OSError as e:
+                errors.append(e)
+                ready.set()
+                self.service.close()
+                return
+            ready.set()
+            await self._stop.wait()
+            await self.server.stop()
+            self.service.close()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+        self._thread.start()
+        if not ready.wait(timeout):
+            raise TimeoutError("Сервер не запустился")
+        if errors:
+            raise errors[0]
+        return self.port
+
+    def stop(self):
+        """Останавливает сервер и ждет завершения потока"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self._thread = None
+
+
+async def serve(db, host: str = '127.0.0.1', port: int = 8080,
+                on_started: Optional[Callable[[int], None]] = None, **service_options):
+    """
+    Запускает сервис расчетов и обслуживает запросы до отмены
+
+    Args:
+        db: Экземпляр DatabaseManager
+        host: Адрес
+        port: Порт
+        on_started: Функция, вызываемая с номером порта после запуска
+        **service_options: Параметры CalculationService
+    """
+    service = CalculationService(db, **service_options)
+    server = CalculationServer(service)
+    try:
+        port = await server.start(host, port)
+        # Каталог загружается до первого запроса
+        await service._in_db(service.catalog.refresh)
+        if on_started:
+            on_started(port)
+        await server.serve_forever()
+    finally:
+        await server.stop()
+        service.close()
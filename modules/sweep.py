@@ -0,0 +1,228 @@
+"""
+Модуль параллельного перебора конфигураций.
+Распределяет пространство конфигураций по процессам и объединяет результаты.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.batch import BatchCalculator, ConfigurationSpace
+from modules.categories import WeightCategoryRegistry, get_default_registry
+
+# Состояние рабочего процесса: задается один раз в инициализаторе пула,
+# поэтому таблица масс не сериализуется для каждой задачи
+_worker_state = {}
+
+
+def _init_worker(shm_name: str, offsets: Sequence[int], lengths: Sequence[int],
+                 shape: Tuple[int, ...], quantities: Sequence[float], top_k: int,
+                 thresholds: Sequence[float], labels: Sequence[str]):
+    """Подключает рабочий процесс к общей памяти с таблицей масс"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = np.ndarray((sum(lengths),), dtype=np.float64, buffer=shm.buf)
+
+    _worker_state['shm'] = shm
+    _worker_state['unit_masses'] = [table[o:o + n] for o, n in zip(offsets, lengths)]
+    _worker_state['shape'] = shape
+    _worker_state['quantities'] = np.asarray(quantities, dtype=np.float64)
+    _worker_state['top_k'] = top_k
+    _worker_state['batch'] = BatchCalculator()
+    _worker_state['categories'] = WeightCategoryRegistry(thresholds, labels)
+
+
+def _sweep_range(start: int, stop: int) -> Dict:
+    """Обрабатывает диапазон плоских индексов в рабочем процессе"""
+    state = _worker_state
+    flat = np.arange(start, stop, dtype=np.int64)
+    idx = np.unravel_index(flat, state['shape'])
+    matrix = np.column_stack([m[i] for m, i in zip(state['unit_masses'], idx)])
+    totals = state['batch'].calculate_totals(matrix, state['quantities'])
+    return _summarize(flat, totals, state['top_k'], state['categories'])
+
+
+def _summarize(flat: np.ndarray, totals: np.ndarray, top_k: int,
+               categories: WeightCategoryRegistry) -> Dict:
+    """Формирует частичный результат блока: top-k легчайших и агрегаты"""
+    k = min(top_k, len(totals))
+    if 0 < k < len(totals):
+        best = np.argpartition(totals, k - 1)[:k]
+    else:
+        best = np.arange(len(totals))[:k]
+
+    return {
+        'top_index': flat[best],
+        'top_mass': totals[best],
+        'count': len(totals),
+        'sum': float(totals.sum()),
+        'min': float(totals.min()),
+        'max': float(totals.max()),
+        'category_counts': categories.count(totals)
+    }
+
+
+def _merge(partials: List[Dict], top_k: int) -> Dict:
+    """Объединяет частичные результаты блоков"""
+    top_index = np.concatenate([p['top_index'] for p in partials])
+    top_mass = np.concatenate([p['top_mass'] for p in partials])
+    order = np.lexsort((top_index, top_mass))[:top_k]
+
+    count = sum(p['count'] for p in partials)
+    return {
+        'top_index': top_index[order],
+        'top_mass': top_mass[order],
+        'count': count,
+        'mean': sum(p['sum'] for p in partials) / count,
+        'min': min(p['min'] for p in partials),
+        'max': max(p['max'] for p in partials),
+        'category_counts': sum(p['category_counts'] for p in partials)
+    }
+
+
+class SweepRunner:
+    """Класс для параллельного перебора пространства конфигураций"""
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 262144,
+                 top_k: int = 10, categories: Optional[WeightCategoryRegistry] = None):
+        """
+        Инициализация исполнителя перебора
+
+        Args:
+            max_workers: Количество процессов (по умолчанию - число ядер)
+            chunk_size: Желаемое количество конфигураций в одной задаче
+            top_k: Количество легчайших конфигураций в результате
+            categories: Реестр весовых категорий (по умолчанию - общий реестр)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.categories = categories or get_default_registry()
+
+    def partition(self, space: ConfigurationSpace) -> Iterator[Tuple[int, int]]:
+        """
+        Делит пространство на диапазоны плоских индексов
+
+        Границы задач выравниваются по первым двум слотам (например,
+        корпус x двигатель), чтобы каждая задача покрывала целое число
+        таких сочетаний; слишком большие сочетания делятся на части.
+
+        Args:
+            space: Пространство конфигураций
+
+        Yields:
+            Кортежи (start, stop)
+        """
+        unit = int(np.prod(space.shape[2:], dtype=np.int64))
+        if unit <= self.chunk_size:
+            step = unit * max(1, self.chunk_size // unit)
+        else:
+            step = self.chunk_size
+
+        for start in range(0, space.size, step):
+            yield start, min(start + step, space.size)
+
+    def run(self, space: ConfigurationSpace, workers: Optional[int] = None) -> Dict:
+        """
+        Выполняет параллельный перебор пространства
+
+        Args:
+            space: Пространство конфигураций
+            workers: Количество процессов (по умолчанию max_workers)
+
+        Returns:
+            Словарь с результатами:
+            {
+                'top': [{'total_mass', 'components'}, ...],
+                'count', 'mean', 'min', 'max': агрегаты по всем конфигурациям,
+                'category_counts': {категория: количество конфигураций},
+                'workers': int, 'elapsed': float (с)
+            }
+        """
+        workers = workers or self.max_workers
+        started = time.perf_counter()
+
+        # Таблица масс всех слотов передается процессам через общую память
+        lengths = [len(space.unit_masses[slot]) for slot in space.slots]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).tolist()
+        table = np.concatenate([space.unit_masses[slot] for slot in space.slots])
+
+        shm = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        try:
+            np.ndarray(table.shape, dtype=np.float64, buffer=shm.buf)[:] = table
+
+            init_args = (shm.name, offsets, lengths, space.shape,
+                         space.quantity_vector().tolist(), self.top_k,
+                         self.categories.thresholds, self.categories.labels)
+            partials = []
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=init_args) as executor:
+                # Ограниченное окно задач в полете вместо отправки всех сразу
+                pending = set()
+                for start, stop in self.partition(space):
+                    if len(pending) >= workers * 4:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        partials.extend(future.result() for future in done)
+                    pending.add(executor.submit(_sweep_range, start, stop))
+                partials.extend(future.result() for future in wait(pending)[0])
+        finally:
+            shm.close()
+            shm.unlink()
+
+        merged = _merge(partials, self.top_k)
+        return {
+            'top': [
+                {'total_mass': float(mass), 'components': space.decode(index)}
+                for index, mass in zip(merged['top_index'], merged['top_mass'])
+            ],
+            'count': merged['count'],
+            'mean': merged['mean'],
+            'min': merged['min'],
+            'max': merged['max'],
+            'category_counts': dict(zip(self.categories.labels,
+                                        merged['category_counts'].tolist())),
+            'workers': workers,
+            'elapsed': time.perf_counter() - started
+        }
+
+    def benchmark_scaling(self, space: ConfigurationSpace,
+                          core_counts: Optional[Sequence[int]] = None) -> List[Dict]:
+        """
+        Измеряет масштабируемость перебора по количеству ядер
+
+        Ускорение считается относительно измеренного времени перебора одним
+        процессом; если 1 нет в core_counts, этот замер выполняется отдельно.
+
+        Args:
+            space: Пространство конфигураций
+            core_counts: Проверяемые количества процессов (по умолчанию 1, 2, 4 ... max)
+
+        Returns:
+            Список словарей {'workers', 'elapsed', 'speedup', 'efficiency'}
+            в порядке core_counts
+        """
+        if core_counts is None:
+            core_counts = [1]
+            while core_counts[-1] * 2 <= self.max_workers:
+                core_counts.append(core_counts[-1] * 2)
+            if core_counts[-1] != self.max_workers:
+                core_counts.append(self.max_workers)
+
+        timings = {}
+        for workers in [1] + [count for count in core_counts if count != 1]:
+            timings[workers] = self.run(space, workers=workers)['elapsed']
+
+        baseline = timings[1]
+        report = []
+        for workers in core_counts:
+            speedup = baseline / timings[workers]
+            report.append({
+                'workers': workers,
+                'elapsed': timings[workers],
+                'speedup': speedup,
+                'efficiency': speedup / workers
+            })
+        return report
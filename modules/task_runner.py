@@ -0,0 +1,228 @@
+"""
+Модуль фоновых задач GUI.
+Выполняет долгие операции в потоках и передает результаты в главный поток.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+
+class TaskCancelled(Exception):
+    """Исключение, прерывающее отмененную задачу"""
+
+
+class TaskContext:
+    """Контекст выполняемой задачи: отмена и прогресс"""
+
+    def __init__(self, key: str, events: queue.Queue):
+        self.key = key
+        self._events = events
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Была ли задача отменена"""
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Помечает задачу как отмененную"""
+        self._cancelled.set()
+
+    def check(self):
+        """
+        Прерывает задачу, если она была отменена
+
+        Raises:
+            TaskCancelled: Задача отменена
+        """
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done: int, total: Optional[int] = None, text: Optional[str] = None):
+        """
+        Сообщает о прогрессе (вызывается в рабочем потоке)
+
+        Отмененная задача прерывается при следующем сообщении о прогрессе.
+
+        Args:
+            done: Количество выполненных шагов
+            total: Общее количество шагов (None - неизвестно)
+            text: Описание текущего шага
+        """
+        self.check()
+        self._events.put(('progress', self.key, self, (done, total, text)))
+
+
+class _Task:
+    """Состояние задачи, ожидающей результата"""
+
+    def __init__(self, context: TaskContext, description: str, callbacks: tuple):
+        self.context = context
+        self.description = description
+        self.callbacks = callbacks
+        self.future = None
+        self.progress = (0, None, None)
+        # Повторный запуск, запрошенный во время выполнения: (func, args, kwargs)
+        self.rerun = None
+
+
+class TaskRunner:
+    """Класс для выполнения задач GUI в рабочих потоках"""
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Инициализация исполнителя
+
+        Args:
+            max_workers: Количество рабочих потоков
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        # Текущая задача каждого ключа: {ключ: _Task}
+        self._tasks = {}
+        self._events = queue.Queue()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Создает пул потоков при первой задаче"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="gui-task")
+        return self._executor
+
+    def submit(self, key: str, func: Callable, *args,
+               on_done: Optional[Callable] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_progress: Optional[Callable[[int, Optional[int], Optional[str]], None]] = None,
+               description: str = "", **kwargs) -> bool:
+        """
+        Запускает задачу в рабочем потоке
+
+        Функция получает TaskContext первым аргументом. Повторные запросы
+        с тем же ключом объединяются: задача, еще не начавшая выполнение,
+        заменяется новой, а для уже выполняемой запоминается один повторный
+        запуск с последними аргументами. Обработчики вызываются в главном
+        потоке из poll и всегда берутся из последнего запроса.
+
+        Args:
+            key: Ключ задачи (например, 'export:zip' или 'dashboard')
+            func: Функция func(context, *args, **kwargs)
+            on_done: Обработчик результата
+            on_error: Обработчик исключения
+            on_progress: Обработчик прогресса (выполнено, всего, описание)
+            description: Описание задачи для индикатора занятости
+
+        Returns:
+            True, если задача запущена, False - если объединена с текущей
+        """
+        callbacks = (on_done, on_error, on_progress)
+        task = self._tasks.get(key)
+        if task is not None and not task.future.cancel():
+            # Задача уже выполняется: после нее будет один повторный запуск
+            task.callbacks = callbacks
+            task.description = description or task.description
+            task.rerun = (func, args, kwargs)
+            return False
+
+        # Еще не начавшая выполнение задача заменяется новой
+        self._start(key, func, args, kwargs, description, callbacks)
+        return task is None
+
+    def _start(self, key: str, func: Callable, args: tuple, kwargs: dict,
+               description: str, callbacks: tuple):
+        """Создает контекст задачи и отправляет ее в пул"""
+        context = TaskContext(key, self._events)
+        task = _Task(context, description, callbacks)
+        self._tasks[key] = task
+        task.future = self._get_executor().submit(func, context, *args, **kwargs)
+        task.future.add_done_callback(
+            lambda done: self._events.put(('done', key, context, done))
+        )
+
+    def cancel(self, key: str):
+        """
+        Отменяет задачу
+
+        Ожидающая задача снимается с очереди, выполняемая получает флаг
+        отмены; ее результат отбрасывается.
+
+        Args:
+            key: Ключ задачи
+        """
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.context.cancel()
+            task.future.cancel()
+
+    def cancel_all(self):
+        """Отменяет все задачи"""
+        for key in list(self._tasks):
+            self.cancel(key)
+
+    def busy(self) -> bool:
+        """Есть ли незавершенные задачи"""
+        return bool(self._tasks)
+
+    def active(self) -> List[dict]:
+        """
+        Получает незавершенные задачи для индикатора занятости
+
+        Returns:
+            Список словарей {'key', 'description', 'done', 'total', 'text'}
+        """
+        return [
+            {'key': key, 'description': task.description, 'done': task.progress[0],
+             'total': task.progress[1], 'text': task.progress[2]}
+            for key, task in self._tasks.items()
+        ]
+
+    def poll(self) -> int:
+        """
+        Передает прогресс и результаты обработчикам (вызывается в главном потоке)
+
+        События отмененных и замененных задач отбрасываются.
+
+        Returns:
+            Количество обработанных событий
+        """
+        handled = 0
+        while True:
+            try:
+                kind, key, context, payload = self._events.get_nowait()
+            except queue.Empty:
+                return handled
+
+            task = self._tasks.get(key)
+            if task is None or task.context is not context:
+                continue
+            on_done, on_error, on_progress = task.callbacks
+            handled += 1
+
+            if kind == 'progress':
+                task.progress = payload
+                if on_progress:
+                    on_progress(*payload)
+                continue
+
+            del self._tasks[key]
+            if task.rerun is not None:
+                func, args, kwargs = task.rerun
+                self._start(key, func, args, kwargs, task.description, task.callbacks)
+                continue
+
+            error = payload.exception()
+            if isinstance(error, TaskCancelled):
+                continue
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(payload.result())
+
+    def shutdown(self):
+        """Отменяет все задачи и останавливает пул потоков"""
+        self.cancel_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
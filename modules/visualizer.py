@@ -3,58 +3,88 @@
 Создает графики и диаграммы для отображения распределения массы.
 """
 
-import matplotlib
-
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import io
+import math
 import os
+import sys
+
+from modules.chart_cache import ChartCache
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# matplotlib загружается при первой отрисовке диаграммы, а не при импорте:
+# модули без диаграмм (расчеты, отчеты, база данных) и запуск GUI его не ждут
+_matplotlib = {}
+
 
-# Try to import tkinter backend, but don't fail if not available
-try:
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+def _load_matplotlib() -> Dict:
+    """Загружает matplotlib при первом обращении"""
+    if not _matplotlib:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.style
+        from matplotlib.figure import Figure
 
-    TKINTER_AVAILABLE = True
-except ImportError:
-    TKINTER_AVAILABLE = False
-    FigureCanvasTkAgg = None
+        _matplotlib['style'] = matplotlib.style
+        _matplotlib['Figure'] = Figure
+    return _matplotlib
 
 
 class DroneVisualizer:
     """Класс для визуализации данных о массе дрона"""
 
-    def __init__(self):
-        """Инициализация визуализатора"""
-        # Настройка стиля matplotlib
-        plt.style.use('dark_background')
+    def __init__(self, chart_cache: Optional[ChartCache] = None):
+        """
+        Инициализация визуализатора
+
+        Args:
+            chart_cache: Кэш PNG-изображений диаграмм (по умолчанию - только в памяти)
+        """
+        # Стиль matplotlib применяется при создании первой фигуры
+        self.theme = 'dark_background'
+        self._style_applied = False
         self.colors = [
             '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A',
             '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E2'
         ]
+        # Уже отрисованные изображения диаграмм (PNG) по содержимому
+        self.chart_cache = chart_cache or ChartCache()
+        # Постоянные фигуры круговых диаграмм: {ключ: состояние фигуры}
+        self._canvases = {}
 
-    def create_pie_chart(self, data: Dict[str, float], title: str = "Распределение массы дрона") -> plt.Figure:
+    def _new_figure(self, figsize) -> 'Figure':
         """
-        Создает круговую диаграмму распределения массы
+        Создает фигуру, не зарегистрированную в pyplot
 
-        Args:
-            data: Словарь {компонент: масса}
-            title: Заголовок диаграммы
+        Такая фигура не попадает в менеджер фигур pyplot и освобождается
+        вместе с последней ссылкой на нее.
+        """
+        mpl = _load_matplotlib()
+        if not self._style_applied:
+            mpl['style'].use(self.theme)
+            self._style_applied = True
+        return mpl['Figure'](figsize=figsize, facecolor='#2b2b2b')
+
+    def _draw_empty(self, ax):
+        """Рисует заглушку "Нет данных" на осях"""
+        ax.text(0.5, 0.5, 'Нет данных для отображения',
+                ha='center', va='center', fontsize=14, color='white')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+
+    def _draw_pie(self, ax, data: Dict[str, float], title: str):
+        """
+        Рисует круговую диаграмму на готовых осях
 
         Returns:
-            Figure объект matplotlib
+            Кортеж (wedges, texts, autotexts) или None для пустых данных
         """
         if not data:
-            # Создаем пустую диаграмму
-            fig, ax = plt.subplots(figsize=(8, 6), facecolor='#2b2b2b')
-            ax.text(0.5, 0.5, 'Нет данных для отображения',
-                    ha='center', va='center', fontsize=14, color='white')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            return fig
-
-        # Создаем диаграмму
-        fig, ax = plt.subplots(figsize=(6, 4), facecolor='#2b2b2b')
+            self._draw_empty(ax)
+            return None
 
         labels = list(data.keys())
         sizes = list(data.values())
@@ -89,11 +119,26 @@ class DroneVisualizer:
 
         # Равные пропорции для круга
         ax.axis('equal')
+        return wedges, texts, autotexts
 
-        plt.tight_layout()
+    def create_pie_chart(self, data: Dict[str, float], title: str = "Распределение массы дрона") -> 'Figure':
+        """
+        Создает круговую диаграмму распределения массы
+
+        Args:
+            data: Словарь {компонент: масса}
+            title: Заголовок диаграммы
+
+        Returns:
+            Figure объект matplotlib (освобождается через close_figure)
+        """
+        fig = self._new_figure((6, 4) if data else (8, 6))
+        self._draw_pie(fig.add_subplot(), data, title)
+        if data:
+            fig.tight_layout()
         return fig
 
-    def create_bar_chart(self, data: Dict[str, float], title: str = "Масса компонентов") -> plt.Figure:
+    def create_bar_chart(self, data: Dict[str, float], title: str = "Масса компонентов") -> 'Figure':
         """
         Создает столбчатую диаграмму массы компонентов
 
@@ -102,18 +147,15 @@ class DroneVisualizer:
             title: Заголовок диаграммы
 
         Returns:
-            Figure объект matplotlib
+            Figure объект matplotlib (освобождается через close_figure)
         """
         if not data:
-            fig, ax = plt.subplots(figsize=(8, 6), facecolor='#2b2b2b')
-            ax.text(0.5, 0.5, 'Нет данных для отображения',
-                    ha='center', va='center', fontsize=14, color='white')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
+            fig = self._new_figure((8, 6))
+            self._draw_empty(fig.add_subplot())
             return fig
 
-        fig, ax = plt.subplots(figsize=(10, 6), facecolor='#2b2b2b')
+        fig = self._new_figure((10, 6))
+        ax = fig.add_subplot()
         ax.set_facecolor('#2b2b2b')
 
         components = list(data.keys())
@@ -133,8 +175,10 @@ class DroneVisualizer:
         ax.set_title(title, color='white', fontsize=14, fontweight='bold')
 
         # Поворачиваем подписи по оси X для лучшей читаемости
-        plt.xticks(rotation=45, ha='right', color='white')
-        plt.yticks(color='white')
+        ax.tick_params(axis='x', labelrotation=45, labelcolor='white')
+        ax.tick_params(axis='y', labelcolor='white')
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment('right')
 
         # Настройка сетки
         ax.grid(True, alpha=0.3, color='gray', linestyle='--')
@@ -143,10 +187,345 @@ class DroneVisualizer:
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
 
-        plt.tight_layout()
+        fig.tight_layout()
+        return fig
+
+    def create_count_chart(self, data: Dict[str, float], title: str = "Количество расчетов") -> 'Figure':
+        """
+        Создает столбчатую диаграмму количеств (гистограммы, частота использования)
+
+        Args:
+            data: Словарь {подпись: количество}
+            title: Заголовок диаграммы
+
+        Returns:
+            Figure объект matplotlib (освобождается через close_figure)
+        """
+        if not data:
+            fig = self._new_figure((8, 6))
+            self._draw_empty(fig.add_subplot())
+            return fig
+
+        fig = self._new_figure((8, 5))
+        ax = fig.add_subplot()
+        ax.set_facecolor('#2b2b2b')
+
+        ax.bar(list(data.keys()), list(data.values()), color=self.colors[2])
+        ax.set_ylabel('Количество', color='white', fontsize=12)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold')
+
+        ax.tick_params(axis='x', labelrotation=45, labelcolor='white', labelsize=9)
+        ax.tick_params(axis='y', labelcolor='white')
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment('right')
+
+        ax.grid(True, axis='y', alpha=0.3, color='gray', linestyle='--')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+        fig.tight_layout()
         return fig
 
-    def embed_figure_in_tkinter(self, figure: plt.Figure, parent_frame):
+    def create_trend_chart(self, data: Dict[str, float], title: str = "Средняя масса по периодам") -> 'Figure':
+        """
+        Создает линейную диаграмму средней массы по периодам
+
+        Args:
+            data: Словарь {период: средняя масса}
+            title: Заголовок диаграммы
+
+        Returns:
+            Figure объект matplotlib (освобождается через close_figure)
+        """
+        if not data:
+            fig = self._new_figure((8, 6))
+            self._draw_empty(fig.add_subplot())
+            return fig
+
+        fig = self._new_figure((8, 5))
+        ax = fig.add_subplot()
+        ax.set_facecolor('#2b2b2b')
+
+        ax.plot(list(data.keys()), list(data.values()), color=self.colors[1],
+                marker='o', linewidth=2)
+        ax.set_ylabel('Масса (г)', color='white', fontsize=12)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold')
+
+        ax.tick_params(axis='x', labelrotation=45, labelcolor='white', labelsize=9)
+        ax.tick_params(axis='y', labelcolor='white')
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment('right')
+
+        ax.grid(True, alpha=0.3, color='gray', linestyle='--')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+        fig.tight_layout()
+        return fig
+
+    def _chart_factory(self, kind: str):
+        """Возвращает метод создания диаграммы по ее типу"""
+        factories = {
+            'pie': self.create_pie_chart,
+            'bar': self.create_bar_chart,
+            'count': self.create_count_chart,
+            'line': self.create_trend_chart
+        }
+        if kind not in factories:
+            raise ValueError(f"Неизвестный тип диаграммы: {kind}")
+        return factories[kind]
+
+    def update_pie_chart(self, key: str, data: Dict[str, float],
+                         title: str = "Распределение массы дрона") -> 'Figure':
+        """
+        Перерисовывает круговую диаграмму постоянной фигуры
+
+        Для каждого ключа создается одна фигура с одними осями.
+        Если набор компонентов и заголовок не изменились, у существующих
+        секторов обновляются только углы и подписи; иначе оси очищаются
+        и диаграмма рисуется заново на тех же осях.
+
+        Args:
+            key: Ключ фигуры (например, размер изображения)
+            data: Словарь {компонент: масса}
+            title: Заголовок диаграммы
+
+        Returns:
+            Постоянная Figure ключа
+        """
+        state = self._canvases.get(key)
+        if state is None:
+            fig = self._new_figure((6, 4))
+            state = {'figure': fig, 'ax': fig.add_subplot(), 'labels': None,
+                     'title': None, 'artists': None, 'data': None}
+            self._canvases[key] = state
+
+        # Повторный расчет той же сборки не требует перерисовки
+        if data == state['data'] and title == state['title']:
+            return state['figure']
+        state['data'] = dict(data)
+
+        labels = list(data.keys())
+        total = sum(data.values())
+        if state['artists'] and labels == state['labels'] and title == state['title'] and total > 0:
+            self._move_pie_wedges(state['artists'], list(data.values()), total)
+        else:
+            state['ax'].clear()
+            state['artists'] = self._draw_pie(state['ax'], data, title)
+            state['labels'] = labels if state['artists'] else None
+            state['title'] = title
+            if state['artists']:
+                state['figure'].tight_layout()
+
+        return state['figure']
+
+    def _move_pie_wedges(self, artists, sizes, total: float):
+        """Обновляет углы секторов и подписи существующей круговой диаграммы"""
+        wedges, texts, autotexts = artists
+        theta = 90.0
+        for wedge, text, autotext, size in zip(wedges, texts, autotexts, sizes):
+            share = size / total
+            theta_end = theta + 360.0 * share
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta_end)
+
+            middle = math.radians((theta + theta_end) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(f'{share * 100:.1f}%\n({size:.1f}г)')
+            theta = theta_end
+
+    def release(self, key: str):
+        """
+        Освобождает постоянную фигуру
+
+        Args:
+            key: Ключ фигуры
+        """
+        state = self._canvases.pop(key, None)
+        if state is not None:
+            self.close_figure(state['figure'])
+
+    @staticmethod
+    def close_figure(figure: 'Figure'):
+        """
+        Явно освобождает фигуру, созданную визуализатором
+
+        Args:
+            figure: Matplotlib figure
+        """
+        figure.clear()
+        # pyplot не импортируется только ради закрытия фигуры
+        pyplot = sys.modules.get('matplotlib.pyplot')
+        if pyplot is not None:
+            pyplot.close(figure)
+
+    def create_pareto_chart(self, masses, capacities, frontier_masses, frontier_capacities,
+                            title: str = "Фронт Парето: масса - емкость") -> 'Figure':
+        """
+        Создает диаграмму рассеяния конфигураций с выделенным фронтом Парето
+
+        Args:
+            masses: Массы рассмотренных конфигураций (г)
+            capacities: Емкости аккумуляторов этих конфигураций (мАч)
+            frontier_masses: Массы конфигураций фронта
+            frontier_capacities: Емкости конфигураций фронта
+            title: Заголовок диаграммы
+
+        Returns:
+            Figure объект matplotlib
+        """
+        fig = self._new_figure((8, 6))
+        ax = fig.add_subplot()
+        ax.set_facecolor('#2b2b2b')
+
+        ax.scatter(masses, capacities, s=8, alpha=0.35, color=self.colors[2],
+                   label='Конфигурации')
+        ax.step(frontier_masses, frontier_capacities, where='post',
+                color=self.colors[0], linewidth=2)
+        ax.scatter(frontier_masses, frontier_capacities, s=30, color=self.colors[0],
+                   zorder=3, label='Фронт Парето')
+
+        ax.set_xlabel('Общая масса (г)', color='white', fontsize=12)
+        ax.set_ylabel('Емкость аккумулятора (мАч)', color='white', fontsize=12)
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold')
+        ax.legend(facecolor='#2b2b2b', labelcolor='white')
+
+        ax.grid(True, alpha=0.3, color='gray', linestyle='--')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+        fig.tight_layout()
+        return fig
+
+    def render_chart_png(self, kind: str, data: Dict[str, float], title: str = None,
+                         dpi: int = 100, size: Optional[Tuple[float, float]] = None) -> bytes:
+        """
+        Рисует диаграмму в PNG с повторным использованием готовых изображений
+
+        Ключ изображения - хэш распределения, заголовка, размера и
+        оформления, поэтому одинаковые диаграммы (строки истории,
+        повторные расчеты той же сборки, HTML и PDF одного отчета)
+        рисуются один раз.
+
+        Args:
+            kind: Тип диаграммы: 'pie', 'bar', 'count' или 'line'
+            data: Словарь {компонент: масса}
+            title: Заголовок (по умолчанию - заголовок диаграммы)
+            dpi: Разрешение изображения
+            size: Размер в дюймах (по умолчанию - размер диаграммы)
+
+        Returns:
+            Содержимое PNG-файла
+        """
+        key = ChartCache.make_chart_key(kind, data, title, size, dpi,
+                                        [self.theme, self.colors])
+        png = self.chart_cache.get(key)
+        if png is not None:
+            return png
+
+        create = self._chart_factory(kind)
+        fig = create(data) if title is None else create(data, title)
+        try:
+            if size:
+                fig.set_size_inches(size)
+                fig.tight_layout()
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi, facecolor=fig.get_facecolor())
+        finally:
+            self.close_figure(fig)
+
+        png = buffer.getvalue()
+        self.chart_cache.put(key, png)
+        return png
+
+    def render_chart_rgba(self, kind: str, data: Dict[str, float], title: str = None,
+                          dpi: int = 100, size: Optional[Tuple[float, float]] = None) -> Dict:
+        """
+        Рисует диаграмму через Agg в буфер RGBA (без кэша и без tkinter)
+
+        Может выполняться вне главного потока: используется только
+        собственная фигура и холст Agg. PNG кодируется из того же буфера,
+        чтобы результат можно было сохранить в кэш без повторной отрисовки.
+
+        Args:
+            kind: Тип диаграммы: 'pie', 'bar', 'count' или 'line'
+            data: Словарь {компонент: масса}
+            title: Заголовок (по умолчанию - заголовок диаграммы)
+            dpi: Разрешение изображения
+            size: Размер в дюймах (по умолчанию - размер диаграммы)
+
+        Returns:
+            Словарь {'size': (ширина, высота), 'rgba': bytes, 'png': bytes}
+        """
+        create = self._chart_factory(kind)
+        fig = create(data) if title is None else create(data, title)
+        try:
+            return self._figure_rgba(fig, dpi, size)
+        finally:
+            self.close_figure(fig)
+
+    def render_pie_rgba(self, data: Dict[str, float], title: str = None,
+                        dpi: int = 100, size: Optional[Tuple[float, float]] = None) -> Dict:
+        """
+        Рисует круговую диаграмму в буфер RGBA на постоянной фигуре
+
+        Фигура создается один раз на размер изображения (update_pie_chart),
+        поэтому рабочий процесс, рисующий подряд миниатюры истории, не
+        создает новую фигуру и оси для каждой из них.
+
+        Args:
+            data: Словарь {компонент: масса}
+            title: Заголовок (по умолчанию - заголовок диаграммы)
+            dpi: Разрешение изображения
+            size: Размер в дюймах (по умолчанию - размер диаграммы)
+
+        Returns:
+            Словарь {'size': (ширина, высота), 'rgba': bytes, 'png': bytes}
+        """
+        if not data:
+            return self.render_chart_rgba('pie', data, title, dpi, size)
+        key = f"pie:{size}"
+        fig = self.update_pie_chart(key, data) if title is None else self.update_pie_chart(key, data, title)
+        return self._figure_rgba(fig, dpi, size)
+
+    @staticmethod
+    def _figure_rgba(fig: 'Figure', dpi: int, size: Optional[Tuple[float, float]]) -> Dict:
+        """Рисует готовую фигуру через Agg в буфер RGBA и PNG"""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from PIL import Image
+
+        canvas = FigureCanvasAgg(fig)
+        fig.set_dpi(dpi)
+        if size:
+            fig.set_size_inches(size)
+            fig.tight_layout()
+        canvas.draw()
+        width, height = canvas.get_width_height()
+        rgba = bytes(canvas.buffer_rgba())
+
+        buffer = io.BytesIO()
+        Image.frombuffer('RGBA', (width, height), rgba, 'raw', 'RGBA', 0, 1).save(buffer, 'PNG')
+        return {'size': (width, height), 'rgba': rgba, 'png': buffer.getvalue()}
+
+    def render_report_charts(self, data: Dict[str, float]) -> Dict[str, bytes]:
+        """
+        Рисует набор диаграмм для отчета
+
+        Args:
+            data: Словарь {компонент: масса}
+
+        Returns:
+            Словарь {'pie': PNG, 'bar': PNG}
+        """
+        return {
+            'pie': self.render_chart_png('pie', data),
+            'bar': self.render_chart_png('bar', data)
+        }
+
+    def embed_figure_in_tkinter(self, figure: 'Figure', parent_frame):
         """
         Встраивает matplotlib figure в tkinter frame
 
@@ -157,7 +536,10 @@ class DroneVisualizer:
         Returns:
             Canvas объект или None если tkinter недоступен
         """
-        if not TKINTER_AVAILABLE or FigureCanvasTkAgg is None:
+        # Try to import tkinter backend, but don't fail if not available
+        try:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        except ImportError:
             return None
 
         canvas = FigureCanvasTkAgg(figure, master=parent_frame)
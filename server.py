@@ -0,0 +1,55 @@
+"""
+HTTP-сервис расчетов массы
+Запускает асинхронный HTTP/JSON-сервер с поиском по каталогу, расчетами,
+историей и отчетами (см. modules/service.py).
+
+Использование:
+    python server.py [--host АДРЕС] [--port ПОРТ] [--db ПУТЬ]
+                     [--db-workers N] [--batch-window-ms МС] [--max-batch N] [--wal]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import List
+
+from database.db_manager import DatabaseManager
+from modules.service import serve
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(ROOT, "database", "drone_components.db")
+
+
+def main(argv: List[str] = None) -> int:
+    """Главная функция сервера"""
+    parser = argparse.ArgumentParser(description="HTTP-сервис расчета массы дрона")
+    parser.add_argument('--host', default='127.0.0.1', help="Адрес для приема соединений")
+    parser.add_argument('--port', type=int, default=8080, help="Порт")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Путь к базе данных компонентов")
+    parser.add_argument('--db-workers', type=int, default=4,
+                        help="Количество потоков для запросов к базе данных")
+    parser.add_argument('--batch-window-ms', type=float, default=2.0,
+                        help="Окно объединения одиночных расчетов в пакет")
+    parser.add_argument('--max-batch', type=int, default=256, help="Максимальный размер пакета расчетов")
+    parser.add_argument('--wal', action='store_true',
+                        help="Перевести базу данных в режим WAL (чтение не ждет записи)")
+    args = parser.parse_args(argv)
+
+    def on_started(port: int):
+        print(f"Сервис расчетов запущен: http://{args.host}:{port} (Ctrl+C - остановка)")
+
+    try:
+        asyncio.run(serve(DatabaseManager(args.db, wal=args.wal), args.host, args.port, on_started,
+                          db_workers=args.db_workers, batch_window=args.batch_window_ms / 1000,
+                          max_batch=args.max_batch))
+    except OSError as e:
+        print(f"✗ Ошибка запуска сервера: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nСервис остановлен")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
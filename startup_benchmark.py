@@ -0,0 +1,124 @@
+"""
+Замер времени запуска приложения
+Импортирует модули с -X importtime в отдельных процессах и показывает
+общее время импорта, самые тяжелые зависимости и загруженные
+тяжелые пакеты (matplotlib, customtkinter и др.).
+
+Использование:
+    python startup_benchmark.py [модуль ...] [--repeat N] [--top N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Модули, время импорта которых отслеживается по умолчанию
+DEFAULT_TARGETS = ['modules.gui', 'modules.report', 'modules.calculator', 'database.db_manager']
+
+# Пакеты, которые не должны загружаться без необходимости
+HEAVY_PACKAGES = ['matplotlib', 'customtkinter', 'tkinter', 'numpy', 'PIL']
+
+
+def parse_importtime(output: str) -> Dict:
+    """
+    Разбирает вывод -X importtime
+
+    Args:
+        output: stderr процесса, запущенного с -X importtime
+
+    Returns:
+        Словарь {'total_us': int, 'imports': [(имя, собственное, накопленное)], 'loaded': set}
+    """
+    imports = []
+    total_us = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Импорты верхнего уровня имеют отступ в один пробел
+        if len(name) - len(name.lstrip()) == 1:
+            total_us += int(cumulative_us)
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return {
+        'total_us': total_us,
+        'imports': imports,
+        'loaded': {name for name, _, _ in imports}
+    }
+
+
+def _run_importtime(statement: str) -> Dict:
+    """Выполняет оператор в чистом процессе с -X importtime"""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Не удалось выполнить '{statement}':\n{process.stderr.strip()}")
+    return parse_importtime(process.stderr)
+
+
+def measure_import(module: str, repeat: int = 3) -> Dict:
+    """
+    Измеряет время импорта модуля в чистом процессе
+
+    Импорты самого интерпретатора (site, encodings) вычитаются по
+    замеру пустого процесса.
+
+    Args:
+        module: Имя модуля
+        repeat: Количество запусков (берется самый быстрый)
+
+    Returns:
+        Результат parse_importtime самого быстрого запуска
+    """
+    baseline = min((_run_importtime('pass') for _ in range(repeat)),
+                   key=lambda run: run['total_us'])
+    result = min((_run_importtime(f'import {module}') for _ in range(repeat)),
+                 key=lambda run: run['total_us'])
+
+    result['total_us'] = max(0, result['total_us'] - baseline['total_us'])
+    result['imports'] = [item for item in result['imports'] if item[0] not in baseline['loaded']]
+    result['loaded'] -= baseline['loaded']
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    """Главная функция замера"""
+    parser = argparse.ArgumentParser(description="Замер времени импорта модулей приложения")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_TARGETS, help="Модули для замера")
+    parser.add_argument('--repeat', type=int, default=3, help="Количество запусков на модуль")
+    parser.add_argument('--top', type=int, default=5, help="Количество самых тяжелых импортов")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="Допустимое время импорта; при превышении код возврата 1")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("ВРЕМЯ ИМПОРТА МОДУЛЕЙ")
+    print("=" * 60)
+
+    over_budget = False
+    for module in args.modules:
+        result = measure_import(module, args.repeat)
+        total_ms = result['total_us'] / 1000
+        heavy = [package for package in HEAVY_PACKAGES if package in result['loaded']]
+
+        print(f"\n{module}: {total_ms:.1f} мс")
+        print(f"  Тяжелые пакеты: {', '.join(heavy) if heavy else 'нет'}")
+        heaviest = sorted(result['imports'], key=lambda item: item[2], reverse=True)
+        for name, _, cumulative_us in heaviest[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} мс  {name}")
+
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            print(f"  ✗ Превышен бюджет {args.budget_ms:.0f} мс")
+            over_budget = True
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -209,6 +209,1572 @@ def test_report_generator():
         return False
 
 
+def test_analysis():
+    """Тестирование пакетного калькулятора и анализа конфигураций"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 5: Пакетные расчеты и фронт Парето")
+    print("=" * 60)
+
+    import numpy as np
+    from itertools import product
+    from modules.batch import BatchCalculator, ConfigurationSpace
+    from modules.analysis import pareto_frontier
+
+    try:
+        catalog = {
+            'frame': [{'id': 1, 'name': 'F1', 'mass': 100.0}, {'id': 2, 'name': 'F2', 'mass': 150.0}],
+            'motor': [{'id': 1, 'name': 'M1', 'mass': 30.0}, {'id': 2, 'name': 'M2', 'mass': 50.0}],
+            'battery': [
+                {'id': 1, 'name': 'B1', 'mass': 120.0, 'capacity': 1500},
+                {'id': 2, 'name': 'B2', 'mass': 200.0, 'capacity': 3000},
+                {'id': 3, 'name': 'B3', 'mass': 260.0, 'capacity': 2500}
+            ]
+        }
+        space = ConfigurationSpace(catalog, quantities={'motor': 4})
+        batch = BatchCalculator(chunk_size=5)
+
+        # Сравнение с прямым перебором
+        expected = [f['mass'] + 4 * m['mass'] + b['mass']
+                    for f, m, b in product(catalog['frame'], catalog['motor'], catalog['battery'])]
+        totals = np.concatenate([chunk for _, chunk in batch.iter_chunks(space)])
+        assert np.allclose(totals, expected), "Пакетный расчет не совпадает с перебором"
+        print(f"✓ Пакетный расчет: {space.size} конфигураций")
+
+        decoded = space.decode(space.size - 1)
+        assert decoded['battery']['id'] == 3 and decoded['motor']['qty'] == 4
+        print("✓ Восстановление конфигурации по индексу работает")
+
+        fixed_space = ConfigurationSpace(catalog, fixed={'frame': 2, 'motor': None})
+        assert fixed_space.shape == (1, 3), "Фиксация слотов не работает"
+        print("✓ Фиксация и исключение слотов работают")
+
+        def brute_force_front(costs, values):
+            """Недоминируемые точки попарной проверкой"""
+            return {
+                (cost, value) for cost, value in zip(costs.tolist(), values.tolist())
+                if not np.any((costs <= cost) & (values >= value) & ((costs < cost) | (values > value)))
+            }
+
+        # Фронт Парето сравнивается с фронтом прямого перебора
+        rng = np.random.default_rng(0)
+        for trial in range(20):
+            costs = rng.integers(0, 50, 300).astype(float)
+            values = rng.integers(0, 50, 300).astype(float)
+            if trial % 2:
+                # Ценность растет с затратами - длинный фронт
+                values = costs + rng.integers(0, 10, 300)
+            front = pareto_frontier(costs, values)
+            front_points = [(costs[i], values[i]) for i in front]
+            assert set(front_points) == brute_force_front(costs, values), "Фронт не совпадает с перебором"
+            assert len(set(front_points)) == len(front), "Дубликаты во фронте Парето"
+            assert np.all(np.diff(costs[front]) > 0), "Фронт не упорядочен по затратам"
+        print(f"✓ Фронт Парето совпадает с прямым перебором ({len(front)} точек)")
+
+        # Матрица замен сравнивается с полным пересчетом конфигурации
+        from database.db_manager import DatabaseManager
+        from modules.analysis import ConfigurationAnalyzer
+        from modules.calculator import DroneCalculator
+
+        db = DatabaseManager("database/test_analysis.db")
+        calc = DroneCalculator()
+        base = {
+            'frame': {'id': 1, 'name': 'DJI F450', 'mass': 282.0, 'qty': 1},
+            'motor': {'id': 1, 'name': 'DJI E305', 'mass': 56.0, 'qty': 4}
+        }
+        matrix = ConfigurationAnalyzer(db).substitution_matrix(base)
+        for row in matrix['rows']:
+            changed = dict(base)
+            changed[row['slot']] = {'name': row['name'], 'mass': row['unit_mass'],
+                                    'qty': base.get(row['slot'], {}).get('qty', 1)}
+            expected_total = calc.calculate_total_mass(changed)['total_mass']
+            assert np.isclose(row['total_mass'], expected_total), f"Неверная замена {row['name']}"
+        print(f"✓ Матрица замен корректна: {len(matrix['rows'])} вариантов")
+
+        # Фронт "масса - емкость" по каталогу базы (блоками) против перебора
+        from modules.batch import load_catalog
+        fixed = {'flight_controller': 1, 'camera': None}
+        quantities = {'motor': 4, 'propeller': 4}
+        analyzer = ConfigurationAnalyzer(db, batch_calculator=BatchCalculator(chunk_size=37))
+        result = analyzer.mass_capacity_frontier(fixed=fixed, quantities=quantities, max_plot_points=100)
+        db_space = ConfigurationSpace(load_catalog(db), quantities, fixed)
+        all_masses = BatchCalculator().evaluate(db_space)
+        all_capacities = db_space.column_values('battery', 'capacity', 0, db_space.size)
+        frontier_points = {(p['total_mass'], p['capacity']) for p in result['frontier']}
+        assert result['evaluated'] == db_space.size == 625
+        assert frontier_points == brute_force_front(all_masses, all_capacities), "Фронт не совпадает с перебором"
+        for point in result['frontier']:
+            components = point['components']
+            assert np.isclose(point['total_mass'], sum(c['mass'] * c['qty'] for c in components.values()))
+            assert 'camera' not in components and components['flight_controller']['id'] == 1
+        assert len(result['masses']) == len(result['capacities']) <= 100
+        os.remove("database/test_analysis.db")
+        print(f"✓ Фронт масса - емкость по каталогу совпадает с перебором ({len(frontier_points)} точек)")
+
+        print("\n Пакетные расчеты работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в пакетных расчетах: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_sweep():
+    """Тестирование параллельного перебора конфигураций"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 6: Параллельный перебор конфигураций")
+    print("=" * 60)
+
+    import numpy as np
+    from modules.batch import BatchCalculator, ConfigurationSpace
+    from modules.sweep import SweepRunner
+
+    try:
+        rng = np.random.default_rng(1)
+        catalog = {
+            slot: [{'id': i + 1, 'name': f'{slot}{i}', 'mass': float(m)}
+                   for i, m in enumerate(rng.integers(1, 500, size))]
+            for slot, size in [('frame', 7), ('motor', 6), ('battery', 5), ('camera', 4)]
+        }
+        space = ConfigurationSpace(catalog, quantities={'motor': 4})
+        totals = BatchCalculator().evaluate(space)
+
+        runner = SweepRunner(max_workers=2, chunk_size=50, top_k=5)
+        ranges = list(runner.partition(space))
+        assert ranges[0] == (0, 40) and ranges[-1][1] == space.size, "Неверное разбиение"
+        print(f"✓ Пространство разбито на {len(ranges)} задач")
+
+        result = runner.run(space)
+        assert result['count'] == space.size, "Обработаны не все конфигурации"
+        assert np.isclose(result['mean'], totals.mean()), "Неверное среднее"
+        expected_top = np.sort(totals)[:5]
+        assert np.allclose([t['total_mass'] for t in result['top']], expected_top), "Неверный top-k"
+        print(f"✓ Параллельный перебор совпадает с последовательным ({result['elapsed']:.3f} с)")
+        assert sum(result['category_counts'].values()) == space.size, "Неверный подсчет категорий"
+        print("✓ Подсчет весовых категорий в переборе работает")
+
+        class TimedRunner(SweepRunner):
+            """Перебор с заданным временем выполнения (нелинейное ускорение)"""
+            times = {1: 8.0, 2: 5.0, 4: 4.0}
+
+            def run(self, space, workers=None):
+                self.calls.append(workers)
+                return {'elapsed': self.times[workers]}
+
+        timed = TimedRunner(max_workers=4)
+        timed.calls = []
+        scaling = timed.benchmark_scaling(space, core_counts=[2, 4])
+        assert timed.calls == [1, 2, 4], "Перебор одним процессом не измерен"
+        assert [row['workers'] for row in scaling] == [2, 4]
+        assert scaling[0]['speedup'] == 1.6 and scaling[1]['speedup'] == 2.0
+        assert scaling[1]['efficiency'] == 0.5
+        scaling = runner.benchmark_scaling(space)
+        assert [row['workers'] for row in scaling] == [1, 2] and scaling[0]['speedup'] == 1.0
+        print("✓ Ускорение считается от измеренного перебора одним процессом")
+
+        print("\n Параллельный перебор работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в параллельном переборе: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_categories():
+    """Тестирование реестра весовых категорий"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 7: Весовые категории")
+    print("=" * 60)
+
+    import numpy as np
+    from modules.categories import WeightCategoryRegistry
+    from modules.calculator import DroneCalculator
+    from modules.report import ReportGenerator
+
+    try:
+        registry = WeightCategoryRegistry.for_jurisdiction('default')
+        calc = DroneCalculator()
+        report_gen = ReportGenerator()
+
+        # Границы категорий: масса, равная порогу, относится к следующей категории
+        checks = [(0, 0), (249.9, 0), (250, 1), (499, 1), (500, 2), (1999, 2),
+                  (2000, 3), (24999, 3), (25000, 4), (60000, 4)]
+        for mass, expected in checks:
+            assert registry.classify_index(mass) == expected, f"Неверная категория для {mass}"
+            assert calc.get_weight_category(mass) == report_gen._get_weight_category(mass)
+        print("✓ Скалярная классификация корректна")
+
+        masses = np.random.default_rng(2).uniform(0, 40000, 100000)
+        vectorized = calc.get_weight_categories(masses)
+        sample = range(0, len(masses), 997)
+        assert all(vectorized[i] == calc.get_weight_category(masses[i]) for i in sample)
+        assert registry.count(masses).sum() == len(masses)
+        print(f"✓ Векторная классификация {len(masses)} масс совпадает со скалярной")
+
+        eu = DroneCalculator(WeightCategoryRegistry.for_jurisdiction('eu'))
+        assert eu.get_weight_category(800).startswith("C1"), "Неверная категория EU"
+        print(f"✓ Юрисдикция EU: {eu.get_weight_category(800)}")
+
+        print("\n Весовые категории работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в весовых категориях: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_bulk_validation():
+    """Тестирование пакетной валидации и импорта каталога"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 8: Пакетная валидация и импорт")
+    print("=" * 60)
+
+    import numpy as np
+    from database.db_manager import DatabaseManager
+    from modules.batch import BatchCalculator
+    from modules.calculator import DroneCalculator, VALID
+    from modules.catalog_import import CatalogImporter
+
+    try:
+        calc = DroneCalculator()
+
+        masses = np.array([0.0, 10.5, -1.0, 50000.0, 50001.0, np.nan])
+        valid, codes = calc.validate_mass_array(masses)
+        expected = [calc.validate_mass(m)[0] if not np.isnan(m) else False for m in masses]
+        assert valid.tolist() == expected, "Векторная валидация массы не совпадает со скалярной"
+        print(f"✓ Валидация массы: коды {codes.tolist()}")
+
+        valid, codes = calc.validate_quantity_array([4, 0, -2, 101, 2.5])
+        assert valid.tolist() == [True, True, False, False, False], "Неверная валидация количества"
+        print(f"✓ Валидация количества: коды {codes.tolist()}")
+
+        result = BatchCalculator().calculate_validated(
+            [[100.0, 50.0], [100.0, -5.0], [200.0, 25.0]], [1, 4])
+        assert result['valid'].tolist() == [True, False, True]
+        assert result['totals'][0] == 300.0 and np.isnan(result['totals'][1])
+        assert result['codes'][1] != VALID
+        print("✓ Пакетный расчет отклоняет некорректные строки")
+
+        db = DatabaseManager("database/test_import.db")
+        csv_path = "test_import.csv"
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("name,mass,capacity,description\n")
+            f.write("Battery A,150,1800,ok\n")
+            f.write("Battery B,abc,2000,bad mass\n")
+            f.write(",100,1000,no name\n")
+            f.write("Battery C,-5,1000,negative\n")
+            f.write("Battery D,210.5,2600,\n")
+
+        before = len(db.get_components('batteries'))
+        report = CatalogImporter(db).import_csv('batteries', csv_path)
+        assert report['imported'] == 2, f"Ожидалось 2 строки, импортировано {report['imported']}"
+        assert [r['row'] for r in report['rejected']] == [1, 2, 3]
+        assert len(db.get_components('batteries')) == before + 2
+        print(f"✓ Импорт CSV: принято {report['imported']}, отклонено {len(report['rejected'])}")
+
+        os.remove(csv_path)
+        os.remove("database/test_import.db")
+
+        print("\n Пакетная валидация работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в пакетной валидации: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_batch_reports():
+    """Тестирование потоковой генерации отчетов по истории"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 9: Потоковые отчеты по истории")
+    print("=" * 60)
+
+    import shutil
+    from database.db_manager import DatabaseManager
+    from modules.report import ReportGenerator
+
+    try:
+        db = DatabaseManager("database/test_reports.db")
+        for i in range(25):
+            db.save_calculation({
+                'frame_id': 1, 'frame_name': 'DJI F450', 'frame_mass': 282.0, 'frame_qty': 1,
+                'motor_id': 1, 'motor_name': 'DJI E305', 'motor_mass': 56.0, 'motor_qty': 4,
+                'total_mass': 282.0 + 56.0 * 4 + i
+            })
+
+        report_gen = ReportGenerator()
+        progress = []
+        count = report_gen.write_reports(db.iter_calculation_history(batch_size=7),
+                                         "test_reports.txt",
+                                         progress_callback=progress.append, progress_every=10)
+        assert count == 25, f"Ожидалось 25 отчетов, записано {count}"
+        assert progress == [10, 20, 25], f"Неверный прогресс: {progress}"
+        with open("test_reports.txt", encoding='utf-8') as f:
+            content = f.read()
+        assert content.count("ОТЧЕТ О МАССЕ") == 25 and "ID конфигурации: 25" in content
+        print(f"✓ Потоковая запись в один файл: {count} отчетов, прогресс {progress}")
+
+        count = report_gen.write_reports(db.iter_calculation_history(), "test_reports_dir/")
+        assert len(os.listdir("test_reports_dir")) == 25, "Не все отчеты записаны в директорию"
+        assert os.path.exists(os.path.join("test_reports_dir", "drone_report_1.txt"))
+        print("✓ Запись отчетов в директорию работает")
+
+        # Машиночитаемые форматы
+        import csv
+        import json
+        count = report_gen.write_reports(db.iter_calculation_history(), "test_reports.jsonl",
+                                         report_format='jsonl')
+        with open("test_reports.jsonl", encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert count == len(records) == 25 and records[0]['calc_id'] == 1
+        assert abs(sum(c['percentage'] for c in records[0]['components']) - 100) < 1e-6
+        print("✓ JSON Lines: отчет на строку")
+
+        report_gen.write_reports(db.iter_calculation_history(), "test_reports.json", report_format='json')
+        with open("test_reports.json", encoding='utf-8') as f:
+            assert len(json.load(f)) == 25, "JSON-массив содержит не все отчеты"
+        print("✓ JSON: массив отчетов")
+
+        report_gen.write_reports(db.iter_calculation_history(), "test_reports.csv", report_format='csv')
+        with open("test_reports.csv", encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 50 and rows[1]['component_type'] == 'motor' and rows[1]['quantity'] == '4'
+        print("✓ CSV: строка на компонент")
+
+        for filename in ("test_reports.jsonl", "test_reports.json", "test_reports.csv"):
+            os.remove(filename)
+
+        os.remove("test_reports.txt")
+        shutil.rmtree("test_reports_dir")
+        os.remove("database/test_reports.db")
+
+        print("\n Потоковые отчеты работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в потоковых отчетах: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_zip_export():
+    """Тестирование параллельного экспорта отчетов в архив"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 10: Экспорт отчетов в zip-архив")
+    print("=" * 60)
+
+    import zipfile
+    from database.db_manager import DatabaseManager
+    from modules.export import ReportExporter
+
+    try:
+        db = DatabaseManager("database/test_export.db")
+        for i in range(12):
+            db.save_calculation({
+                'frame_id': 4, 'frame_name': 'ZMR250', 'frame_mass': 95.0, 'frame_qty': 1,
+                'battery_id': 3, 'battery_name': 'ZOP 3S 1500mAh', 'battery_mass': 126.0,
+                'battery_qty': 1, 'total_mass': 221.0
+            })
+
+        exporter = ReportExporter(max_workers=2, batch_size=5)
+        result = exporter.export_zip(db.iter_calculation_history(), "test_export.zip",
+                                     include_charts=True)
+        with zipfile.ZipFile("test_export.zip") as archive:
+            names = archive.namelist()
+            assert archive.read("report_00000012.txt").decode('utf-8').count("ZMR250") >= 1
+            assert archive.read("chart_00000001.png").startswith(b"\x89PNG")
+        assert result['count'] == 12 and len(names) == 24, f"Неверное содержимое архива: {len(names)}"
+        assert names[:2] == ["report_00000001.txt", "chart_00000001.png"], "Недетерминированный порядок"
+        print(f"✓ Архив: {result['count']} отчетов, {result['reports_per_second']:.1f} отчетов/с")
+
+        # Отмена из progress_callback прерывает экспорт без ожидания очереди
+        from modules.task_runner import TaskCancelled
+        progress = []
+
+        def cancel(count):
+            progress.append(count)
+            raise TaskCancelled()
+
+        try:
+            exporter.export_zip(list(db.iter_calculation_history()) * 10, "test_export.zip",
+                                progress_callback=cancel)
+            assert False, "Отмена не прервала экспорт"
+        except TaskCancelled:
+            pass
+        assert progress == [5], f"Экспорт продолжен после отмены: {progress}"
+        print("✓ Отмена прерывает экспорт")
+
+        os.remove("test_export.zip")
+        os.remove("database/test_export.db")
+
+        print("\n Экспорт в архив работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в экспорте архива: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_report_cache():
+    """Тестирование кэша отчетов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 11: Кэш отчетов")
+    print("=" * 60)
+
+    import shutil
+    from modules.report import ReportGenerator
+    from modules.report_cache import ReportCache
+
+    try:
+        results = {
+            'components': {
+                'frame': {'name': 'Test Frame', 'unit_mass': 100.0, 'quantity': 1, 'total_mass': 100.0}
+            },
+            'total_mass': 100.0,
+            'component_count': 1
+        }
+
+        cached_gen = ReportGenerator(cache=ReportCache(max_entries=2, cache_dir="test_report_cache"))
+        first = cached_gen.generate_text_report(results, 7)
+        second = cached_gen.generate_text_report(results, 7)
+        body = lambda text: text.split("\n", 5)[5]
+        assert body(first) == body(second), "Тело отчета из кэша отличается"
+        assert body(first) == body(ReportGenerator().generate_text_report(results, 7))
+        assert cached_gen.cache.hits == 1 and cached_gen.cache.misses == 1
+        print("✓ Повторный отчет берется из кэша без изменений")
+
+        for calc_id in (8, 9):
+            cached_gen.generate_text_report(results, calc_id)
+        assert len(cached_gen.cache._entries) == 2, "LRU-вытеснение не работает"
+        print("✓ LRU-вытеснение работает")
+
+        # Дисковый уровень переживает пересоздание кэша
+        disk_gen = ReportGenerator(cache=ReportCache(cache_dir="test_report_cache"))
+        disk_gen.generate_text_report(results, 7)
+        assert disk_gen.cache.hits == 1, "Отчет не найден на диске"
+        print("✓ Дисковый уровень кэша работает")
+
+        key_v1 = ReportCache.make_key({'calc_id': 7}, 1)
+        assert key_v1 != ReportCache.make_key({'calc_id': 7}, 2), "Версия шаблона не влияет на ключ"
+        print("✓ Версия шаблона входит в ключ кэша")
+
+        # Генераторы с разными реестрами категорий на общем кэше
+        from modules.categories import WeightCategoryRegistry
+        shared = ReportCache(cache_dir="test_report_cache")
+        build = dict(results, total_mass=600.0)
+        default_body = body(ReportGenerator(cache=shared).generate_text_report(build, 10))
+        eu_registry = WeightCategoryRegistry.for_jurisdiction('eu')
+        eu_body = body(ReportGenerator(eu_registry, cache=shared).generate_text_report(build, 10))
+        assert eu_body != default_body and eu_registry.classify(600.0) in eu_body
+        assert eu_body == body(ReportGenerator(eu_registry).generate_text_report(build, 10))
+        print("✓ Реестр категорий входит в ключ кэша")
+
+        # Одновременные чтение и запись с вытеснением в памяти и на диске
+        import threading
+        concurrent = ReportCache(max_entries=4, cache_dir="test_report_cache/concurrent",
+                                 max_disk_bytes=2000)
+        errors = []
+
+        def worker(number):
+            try:
+                for i in range(300):
+                    key = ReportCache.make_key({'n': (number * 7 + i) % 40}, 1)
+                    if concurrent.get(key) is None:
+                        concurrent.put(key, "x" * 100)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        disk_bytes = sum(entry.stat().st_size for entry in os.scandir("test_report_cache/concurrent"))
+        assert not errors, f"Ошибки при параллельном доступе: {errors[:1]}"
+        assert len(concurrent._entries) <= 4 and concurrent._disk_bytes == disk_bytes <= 2000
+        print("✓ Кэш безопасен при обращении из нескольких потоков")
+
+        shutil.rmtree("test_report_cache")
+
+        print("\n Кэш отчетов работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в кэше отчетов: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_html_pdf_reports():
+    """Тестирование HTML и PDF отчетов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 12: HTML и PDF отчеты")
+    print("=" * 60)
+
+    import zipfile
+    from modules.export import ReportExporter
+    from modules.report import ReportGenerator
+    from modules.visualizer import DroneVisualizer
+
+    try:
+        results = {
+            'components': {
+                'frame': {'name': 'Frame <X>', 'unit_mass': 100.0, 'quantity': 1, 'total_mass': 100.0},
+                'motor': {'name': 'Motor', 'unit_mass': 30.0, 'quantity': 4, 'total_mass': 120.0}
+            },
+            'total_mass': 220.0,
+            'component_count': 2
+        }
+
+        report_gen = ReportGenerator(visualizer=DroneVisualizer())
+        html_text = report_gen.generate_html_report(results, 5)
+        assert html_text.count("data:image/png;base64,") == 2, "Диаграммы не встроены в HTML"
+        assert "Frame &lt;X&gt;" in html_text, "Названия не экранированы"
+        print("✓ HTML-отчет содержит встроенные диаграммы")
+
+        report_gen.save_pdf_report(results, "test_report.pdf", 5)
+        with open("test_report.pdf", 'rb') as f:
+            assert f.read(4) == b"%PDF", "Файл не является PDF"
+        assert report_gen.visualizer.chart_cache.hits == 2, "Диаграммы перерисованы для PDF"
+        os.remove("test_report.pdf")
+        print("✓ PDF-отчет использует уже готовые диаграммы")
+
+        result = ReportExporter(max_workers=1).export_zip(
+            [results], "test_html_reports.zip", report_format='html', include_charts=True)
+        with zipfile.ZipFile("test_html_reports.zip") as archive:
+            names = archive.namelist()
+        assert names == ["report_n00000001.html", "chart_n00000001.png"], names
+        assert result['count'] == 1
+        os.remove("test_html_reports.zip")
+        print("✓ Экспорт HTML-отчетов в архив работает")
+
+        print("\n HTML и PDF отчеты работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в HTML/PDF отчетах: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_comparison_report():
+    """Тестирование отчета сравнения конфигураций"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 13: Сравнение конфигураций")
+    print("=" * 60)
+
+    from database.db_manager import DatabaseManager
+    from modules.report import ReportGenerator
+
+    test_db_path = "database/test_comparison.db"
+    try:
+        db = DatabaseManager(test_db_path)
+        calc_ids = [
+            db.save_calculation({
+                'frame_id': 1, 'frame_name': f'Frame {i}', 'frame_mass': 100.0 + 10 * i, 'frame_qty': 1,
+                'motor_id': 1, 'motor_name': 'Motor', 'motor_mass': 30.0, 'motor_qty': 4,
+                'total_mass': 220.0 + 10 * i
+            })
+            for i in range(3)
+        ]
+        assert [r['id'] for r in db.get_calculations_by_ids(calc_ids[::-1])] == calc_ids[::-1]
+        # Больше MAX_QUERY_IDS: ID разных порций, отсутствующие ID и повтор
+        many_ids = [calc_ids[2]] + list(range(10 ** 6, 10 ** 6 + 1200)) + calc_ids
+        assert [r['id'] for r in db.get_calculations_by_ids(many_ids)] == [calc_ids[2]] + calc_ids
+        print("✓ Расчеты загружаются порциями в заданном порядке")
+
+        extra = {
+            'components': {'camera': {'name': 'Cam', 'unit_mass': 50.0, 'quantity': 1, 'total_mass': 50.0}},
+            'total_mass': 50.0,
+            'component_count': 1
+        }
+        report_gen = ReportGenerator()
+        data = report_gen.build_comparison_data(calc_ids + [extra], db)
+        assert data['slots'] == ['frame', 'motor', 'camera'], data['slots']
+        assert data['totals'].tolist() == [220.0, 230.0, 240.0, 50.0]
+        assert data['total_deltas'].tolist() == [0.0, 10.0, 20.0, -170.0]
+        assert data['slot_deltas'][3].tolist() == [-100.0, -120.0, 50.0]
+        assert data['names'][3][0] is None
+        print("✓ Слоты выровнены, итоги и разницы вычислены")
+
+        report = report_gen.generate_comparison_report(calc_ids, db)
+        assert "СРАВНЕНИЕ КОНФИГУРАЦИЙ" in report and "+20.0" in report
+        print("✓ Текстовый отчет сравнения сформирован")
+
+        try:
+            report_gen.build_comparison_data([999999], db)
+            assert False, "Отсутствующий ID не обнаружен"
+        except ValueError:
+            print("✓ Отсутствующий ID расчета обнаружен")
+
+        os.remove(test_db_path)
+
+        print("\n Сравнение конфигураций работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в сравнении конфигураций: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_figure_reuse():
+    """Тестирование повторного использования и освобождения фигур"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 14: Повторное использование фигур")
+    print("=" * 60)
+
+    import gc
+    import weakref
+    from modules.visualizer import DroneVisualizer
+
+    try:
+        viz = DroneVisualizer()
+        data = {'Корпус': 100.0, 'Двигатели': 200.0, 'Аккумулятор': 300.0}
+
+        fig = viz.update_pie_chart('test', data)
+        ax = fig.axes[0]
+        assert list(viz._canvases) == ['test'] and viz._canvases['test']['figure'] is fig
+        for i in range(10000):
+            if i % 1000 == 0:
+                # Смена набора компонентов - полная перерисовка на тех же осях
+                data = {f'Компонент {j}': 50.0 + j for j in range(3 + i // 1000 % 3)}
+            data = {name: mass + (i % 7) for name, mass in data.items()}
+            assert viz.update_pie_chart('test', data) is fig, "Фигура создана заново"
+            assert len(viz._canvases) == 1 and viz._canvases['test']['figure'] is fig
+
+        assert fig.axes == [ax] and len(ax.patches) == len(data), "Оси не переиспользуются"
+        print("✓ 10000 обновлений на одной фигуре и одних осях")
+
+        first = viz.render_pie_rgba(data, size=(2, 2))
+        pooled = viz._canvases['pie:(2, 2)']['figure']
+        second = viz.render_pie_rgba({'Корпус': 1.0, 'Рама': 2.0}, size=(2, 2))
+        assert viz._canvases['pie:(2, 2)']['figure'] is pooled and len(viz._canvases) == 2
+        assert first['size'] == second['size'] == (200, 200) and first['rgba'] != second['rgba']
+        print("✓ Круговые диаграммы пула рисуются на одной фигуре на размер")
+
+        viz.release('test')
+        viz.release('pie:(2, 2)')
+        assert viz._canvases == {} and not fig.axes and not pooled.axes, "Фигура не освобождена"
+        print("✓ Постоянные фигуры освобождаются явно")
+
+        refs = []
+        for i in range(100):
+            temporary = viz.create_bar_chart(data)
+            refs.append(weakref.ref(temporary))
+            viz.close_figure(temporary)
+            viz.render_chart_png('pie', data, title=str(i))
+        del temporary
+        gc.collect()
+        assert all(ref() is None for ref in refs), "Временные фигуры не освобождены"
+        assert viz._canvases == {}, "Временные фигуры попали в реестр постоянных"
+        print("✓ Временные фигуры освобождаются")
+
+        print("\n Повторное использование фигур работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в повторном использовании фигур: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_chart_cache():
+    """Тестирование кэша изображений диаграмм"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 15: Кэш изображений диаграмм")
+    print("=" * 60)
+
+    import shutil
+    from modules.chart_cache import ChartCache
+    from modules.visualizer import DroneVisualizer
+
+    try:
+        data = {'Корпус': 100.0, 'Двигатели': 200.0}
+        viz = DroneVisualizer(ChartCache(max_entries=2, cache_dir="test_chart_cache"))
+
+        first = viz.render_chart_png('pie', data, title="Тест", size=(4, 3))
+        assert first.startswith(b"\x89PNG"), "Результат не является PNG"
+        assert viz.render_chart_png('pie', dict(data), title="Тест", size=(4, 3)) == first
+        assert viz.chart_cache.hits == 1 and viz.chart_cache.misses == 1
+        print("✓ Одинаковая диаграмма берется из кэша")
+
+        viz.render_chart_png('pie', data, title="Тест", size=(6, 4))
+        viz.render_chart_png('bar', data, title="Тест", size=(4, 3))
+        assert viz.chart_cache.misses == 3, "Размер или тип не входят в ключ"
+        assert len(viz.chart_cache._entries) == 2, "LRU-вытеснение не работает"
+        print("✓ Размер и тип диаграммы входят в ключ, LRU-вытеснение работает")
+
+        restarted = DroneVisualizer(ChartCache(cache_dir="test_chart_cache"))
+        assert restarted.render_chart_png('pie', data, title="Тест", size=(4, 3)) == first
+        assert restarted.chart_cache.hits == 1, "Изображение не найдено на диске"
+        print("✓ Дисковый уровень кэша работает")
+
+        small = ChartCache(cache_dir="test_chart_cache", max_disk_bytes=len(first))
+        for i in range(3):
+            small.put(f"key{i}", first)
+        assert small._disk_bytes <= len(first), "Ограничение размера диска не соблюдается"
+        print("✓ Размер дискового уровня ограничен")
+
+        shutil.rmtree("test_chart_cache")
+
+        print("\n Кэш изображений диаграмм работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в кэше изображений диаграмм: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_chart_render_pool():
+    """Тестирование фоновой отрисовки диаграмм"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 16: Фоновая отрисовка диаграмм")
+    print("=" * 60)
+
+    import time
+    from modules.chart_renderer import ChartRenderPool
+    from modules.visualizer import DroneVisualizer
+
+    renderer = None
+    try:
+        viz = DroneVisualizer()
+        renderer = ChartRenderPool(viz, max_workers=1)
+        delivered = []
+
+        def wait_all():
+            deadline = time.time() + 60
+            while renderer.pending() and time.time() < deadline:
+                renderer.poll()
+                time.sleep(0.01)
+
+        renderer.request('main', 'pie', {'Корпус': 100.0, 'Двигатели': 100.0},
+                         lambda image: delivered.append(('old', image.size)), size=(4, 3))
+        for i in range(5):
+            renderer.request('main', 'pie', {'Корпус': 100.0, 'Двигатели': 200.0 + i},
+                             lambda image, i=i: delivered.append((i, image.size)), size=(4, 3))
+        renderer.request('history:1', 'bar', {'Корпус': 100.0},
+                         lambda image: delivered.append(('bar', image.size)))
+        renderer.cancel('history:1')
+        wait_all()
+
+        assert delivered == [(4, (400, 300))], delivered
+        print("✓ Замененные и отмененные запросы не доставляются")
+
+        cached = renderer.request('main', 'pie', {'Корпус': 100.0, 'Двигатели': 204.0},
+                                  lambda image: delivered.append(('cached', image.size)), size=(4, 3))
+        assert cached and delivered[-1] == ('cached', (400, 300)), "Кэш не использован"
+        print("✓ Готовая диаграмма передается сразу из кэша")
+
+        print("\n Фоновая отрисовка диаграмм работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в фоновой отрисовке диаграмм: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        if renderer is not None:
+            renderer.shutdown()
+
+
+def test_lazy_imports():
+    """Тестирование отложенной загрузки matplotlib и customtkinter"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 17: Отложенная загрузка зависимостей")
+    print("=" * 60)
+
+    import subprocess
+    from startup_benchmark import parse_importtime
+
+    def loaded_after(statement):
+        check = ("import sys\n" + statement + "\n"
+                 "print(','.join(m for m in ('matplotlib', 'customtkinter', 'tkinter') if m in sys.modules))")
+        process = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert process.returncode == 0, process.stderr
+        return process.stdout.strip()
+
+    try:
+        headless = loaded_after("import database.db_manager, modules.calculator, modules.report, modules.export")
+        assert headless == "", f"Расчетные модули загружают GUI-зависимости: {headless}"
+        print("✓ База данных, расчеты и отчеты импортируются без GUI-зависимостей")
+
+        assert loaded_after("import main") == "", "main.py загружает GUI при импорте"
+        assert "matplotlib" not in loaded_after(
+            "import modules.gui\nfrom modules.visualizer import DroneVisualizer\nDroneVisualizer()")
+        print("✓ matplotlib не загружается при запуске GUI")
+
+        assert "matplotlib" in loaded_after(
+            "from modules.visualizer import DroneVisualizer\nDroneVisualizer().create_pie_chart({'a': 1.0})")
+        print("✓ matplotlib загружается при первой диаграмме")
+
+        sample = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       100 |        100 |   typing\n"
+                  "import time:       200 |        300 | mod\n")
+        parsed = parse_importtime(sample)
+        assert parsed['total_us'] == 300 and parsed['loaded'] == {'typing', 'mod'}, parsed
+        print("✓ Вывод -X importtime разбирается корректно")
+
+        import io
+        from contextlib import redirect_stdout
+        from main import StartupTimer
+        timer = StartupTimer()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            timer.mark("Импорт модулей")
+            timer.mark("Окно показано")
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 2 and lines[0].strip().startswith("Импорт модулей:")
+        assert "с начала запуска" in lines[1]
+        print("✓ Этапы запуска выводятся с длительностью")
+
+        print("\n Отложенная загрузка зависимостей работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в отложенной загрузке зависимостей: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_history_analytics():
+    """Тестирование аналитики истории расчетов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 18: Аналитика истории расчетов")
+    print("=" * 60)
+
+    from database.db_manager import DatabaseManager
+    from modules.analytics import HistoryAnalytics
+
+    test_db_path = "database/test_analytics.db"
+    try:
+        db = DatabaseManager(test_db_path)
+        for i in range(30):
+            db.save_calculation({
+                'frame_name': f'Frame {i % 3}', 'frame_mass': 100.0 + i, 'frame_qty': 1,
+                'motor_name': 'Motor', 'motor_mass': 30.0, 'motor_qty': 4,
+                'total_mass': 220.0 + i
+            })
+
+        analytics = HistoryAnalytics(db, batch_size=7)
+        assert analytics.refresh() == 30 and len(analytics) == 30
+        summary = analytics.summary()
+        assert summary['count'] == 30 and summary['mean'] == 234.5
+        assert summary['min'] == 220.0 and summary['max'] == 249.0
+        print("✓ История загружена в столбцы порциями, сводка верна")
+
+        histogram = analytics.mass_histogram(bins=5)
+        assert histogram['counts'].sum() == 30 and len(histogram['edges']) == 6
+        trend = analytics.mean_mass_by_period('D')
+        assert trend['counts'].sum() == 30 and abs(trend['means'].mean() - 234.5) < 60
+        usage = analytics.component_usage(top=2)
+        assert usage['motor'] == [('Motor', 30)] and len(usage['frame']) == 2
+        share = analytics.slot_mass_share()
+        assert abs(sum(share.values()) - 1.0) < 1e-9 and set(share) == {'frame', 'motor'}
+        print("✓ Гистограмма, средняя масса по периодам, использование и доли вычислены")
+
+        assert analytics.mass_histogram(bins=5) is histogram, "Агрегат не кэшируется"
+        db.save_calculation({'camera_name': 'Cam', 'camera_mass': 50.0, 'total_mass': 50.0})
+        assert analytics.refresh() == 1, "Должна дочитываться только новая запись"
+        assert analytics.summary()['count'] == 31 and analytics.summary()['min'] == 50.0
+        assert analytics.component_usage()['camera'] == [('Cam', 1)]
+        assert analytics.mass_histogram(bins=5)['counts'].sum() == 31, "Кэш не сброшен"
+        print("✓ Новые записи дочитываются инкрементально")
+
+        first_id = int(analytics.ids[0])
+        db.delete_calculation(first_id)
+        analytics.refresh()
+        assert len(analytics) == 30 and first_id not in analytics.ids
+        print("✓ Удаление записей обнаруживается")
+
+        data = analytics.dashboard_data(bins=4, period='M')
+        assert set(data) == {'histogram', 'trend', 'usage', 'share'}
+        assert sum(data['histogram'].values()) == 30
+        print("✓ Данные панели аналитики сформированы")
+
+        # Недели начинаются с понедельника: 2026-10-18 - воскресенье
+        import sqlite3
+        stamps = ['2026-10-18 23:59:59', '2026-10-19 00:00:00', '2026-10-22 12:00:00',
+                  '2026-10-25 23:59:59', '2026-10-26 00:00:00']
+        conn = sqlite3.connect(test_db_path)
+        for calc_id, stamp in zip(analytics.ids[:5].tolist(), stamps):
+            conn.execute("UPDATE calculations_history SET timestamp = ? WHERE id = ?", (stamp, calc_id))
+        conn.execute("DELETE FROM calculations_history WHERE id > ?", (int(analytics.ids[4]),))
+        conn.commit()
+        conn.close()
+        weekly = HistoryAnalytics(db)
+        weekly.refresh()
+        weeks = weekly.mean_mass_by_period('W')
+        assert [str(day) for day in weeks['periods']] == ['2026-10-12', '2026-10-19', '2026-10-26']
+        assert weeks['counts'].tolist() == [1, 3, 1]
+        print("✓ Недели группируются с понедельника")
+
+        class RacingDb:
+            """База, в которую расчет сохраняется сразу после чтения границ"""
+
+            def __init__(self, db):
+                self.db = db
+
+            def __getattr__(self, name):
+                return getattr(self.db, name)
+
+            def get_calculation_history_bounds(self):
+                bounds = self.db.get_calculation_history_bounds()
+                self.db.save_calculation({'frame_name': 'Late', 'frame_mass': 1.0, 'total_mass': 1.0})
+                return bounds
+
+        racing = HistoryAnalytics(RacingDb(db))
+        assert racing.refresh() == 5 and len(racing) == 5, "Запись, сохраненная во время чтения, прочитана"
+        assert racing.refresh() == 1 and len(racing) == 6, "Новая запись не дочитана"
+        print("✓ Расчет, сохраненный во время обновления, не вызывает перечитывания")
+
+        os.remove(test_db_path)
+
+        print("\n Аналитика истории работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в аналитике истории: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_history_pager():
+    """Тестирование постраничного доступа к истории"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 19: Постраничный доступ к истории")
+    print("=" * 60)
+
+    from database.db_manager import DatabaseManager
+    from modules.history_pager import HistoryPager
+
+    test_db_path = "database/test_history_pager.db"
+    try:
+        db = DatabaseManager(test_db_path)
+        for i in range(25):
+            db.save_calculation({
+                'frame_name': f'Frame {i}', 'frame_mass': 100.0 + i, 'frame_qty': 1,
+                'motor_name': 'Motor', 'motor_mass': 30.0, 'motor_qty': 4,
+                'total_mass': 220.0 + i * 100
+            })
+
+        pager = HistoryPager(db, page_size=10, max_pages=2)
+        assert pager.reload() == 25 and len(pager) == 25
+        assert pager.pages_loaded == 1, "При открытии должна загружаться только первая страница"
+
+        newest = pager.get(0)
+        assert newest['frame_name'] == 'Frame 24' and pager.get(24)['frame_name'] == 'Frame 0'
+        assert pager.get(25) is None and pager.get(-1) is None
+        assert pager.pages_loaded == 2, "Должны загружаться только затронутые страницы"
+        print("✓ Записи читаются постранично, новые первыми")
+
+        pager.get(9)
+        assert pager.pages_loaded == 2, "Страница должна браться из памяти"
+        pager.get(15)
+        assert pager.pages_loaded == 3 and len(pager._pages) == 2
+        pager.get(24)
+        assert pager.pages_loaded == 4, "Вытесненная страница должна загружаться заново"
+        print("✓ В памяти хранится ограниченное число страниц")
+
+        ids = [row['id'] for row in db.get_calculation_page(None, 25)]
+        assert [row['id'] for row in db.get_calculation_page(ids[9], 10)] == ids[10:20]
+        assert db.get_calculation_boundary(None, 20) == ids[19]
+        assert db.get_calculation_boundary(ids[9], 10) == ids[19]
+        assert db.get_calculation_boundary(None, 30) is None
+        assert pager._boundaries[1] == ids[9] and pager._boundaries[2] == ids[19]
+
+        db.delete_calculation(ids[3])
+        pager.reload()
+        assert [pager.get(i)['id'] for i in range(24)] == ids[:3] + ids[4:]
+        assert pager.get(24) is None
+        print("✓ Страницы читаются по ключу (id < граница), без OFFSET")
+
+        assert newest['category'] == pager.calculator.get_weight_category(newest['total_mass'])
+        assert HistoryPager.distribution(newest) == {'Корпус': 124.0, 'Двигатели (x4)': 120.0}
+        assert "Двигатели: Motor x4 (30.0г каждый)" in HistoryPager.components_text(newest)
+        print("✓ Категория, состав и распределение массы сформированы")
+
+        os.remove(test_db_path)
+
+        print("\n Постраничный доступ к истории работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в постраничном доступе к истории: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_task_runner():
+    """Тестирование фоновых задач GUI"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 20: Фоновые задачи")
+    print("=" * 60)
+
+    import threading
+    import time
+    from modules.task_runner import TaskRunner
+
+    def wait(runner, timeout=10.0):
+        deadline = time.perf_counter() + timeout
+        while runner.busy() and time.perf_counter() < deadline:
+            runner.poll()
+            time.sleep(0.01)
+        runner.poll()
+        assert not runner.busy(), "Задачи не завершились"
+
+    runner = TaskRunner(max_workers=2)
+    try:
+        results, progress, errors = [], [], []
+        main_thread = threading.get_ident()
+
+        def count(context, n):
+            for i in range(1, n + 1):
+                context.progress(i, n)
+            return threading.get_ident()
+
+        runner.submit('count', count, 5, on_done=results.append,
+                      on_progress=lambda done, total, text: progress.append((done, total, threading.get_ident())))
+        wait(runner)
+        assert len(results) == 1 and results[0] != main_thread, "Задача должна выполняться в рабочем потоке"
+        assert [p[0] for p in progress] == [1, 2, 3, 4, 5] and all(p[2] == main_thread for p in progress)
+        print("✓ Задача выполнена в потоке, прогресс передан в главный поток")
+
+        runner.submit('fail', lambda context: 1 / 0, on_done=results.append, on_error=errors.append)
+        wait(runner)
+        assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError) and len(results) == 1
+        print("✓ Исключение передано обработчику ошибок")
+
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow(context, value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value
+
+        results.clear()
+        assert runner.submit('slow', slow, 1, on_done=results.append) is True
+        started.wait(5)
+        assert runner.submit('slow', slow, 2, on_done=results.append) is False
+        assert runner.submit('slow', slow, 3, on_done=results.append) is False
+        release.set()
+        wait(runner)
+        assert calls == [1, 3] and results == [3], f"Запросы не объединены: {calls}, {results}"
+        print("✓ Повторные запросы объединены в один повторный запуск")
+
+        def cancellable(context):
+            for i in range(1000):
+                time.sleep(0.005)
+                context.progress(i)
+            return 'done'
+
+        results.clear()
+        runner.submit('cancel', cancellable, on_done=results.append)
+        time.sleep(0.05)
+        runner.cancel('cancel')
+        assert not runner.busy()
+        time.sleep(0.05)
+        runner.poll()
+        assert results == [], "Результат отмененной задачи не должен передаваться"
+        print("✓ Отмена прерывает задачу и отбрасывает результат")
+
+        print("\n Фоновые задачи работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в фоновых задачах: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        runner.shutdown()
+
+
+def test_live_calculation():
+    """Тестирование живого пересчета конфигурации"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 21: Живой пересчет")
+    print("=" * 60)
+
+    from modules.calculator import DroneCalculator
+    from modules.live_calculation import LiveCalculation
+
+    try:
+        calc = DroneCalculator()
+        live = LiveCalculation(calc)
+        frame = {'id': 1, 'name': 'Frame', 'mass': 150.0}
+        motor = {'id': 2, 'name': 'Motor', 'mass': 30.0}
+        assert not live and live.total_mass == 0.0
+
+        assert live.set_component('motor', motor, 4) is True
+        assert live.set_component('frame', frame) is True
+        assert live.total_mass == 270.0
+        assert list(live.components_data) == ['frame', 'motor'], "Слоты должны идти по порядку"
+        expected = calc.calculate_total_mass(live.components_data)
+        assert live.results() == expected
+        assert live.category == calc.get_weight_category(270.0)
+        print("✓ Масса, результаты и категория совпадают с полным расчетом")
+
+        results = live.results()
+        version = live.version
+        assert live.set_component('motor', motor, 4) is False, "Повтор не должен менять расчет"
+        assert live.results() is results and live.version == version
+        print("✓ Повторный выбор не вызывает пересчета")
+
+        assert live.set_component('motor', motor, 6) is True
+        assert live.total_mass == 330.0 and live.results() is not results
+        assert live.distribution() == calc.get_mass_distribution(live.components_data)
+        assert live.set_component('motor', None) is True and live.total_mass == 150.0
+        live.clear()
+        assert not live and live.results()['total_mass'] == 0
+        print("✓ Изменение и удаление слота пересчитывают только его вклад")
+
+        print("\n Живой пересчет работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в живом пересчете: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_component_index():
+    """Тестирование поискового индекса компонентов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 22: Поисковый индекс компонентов")
+    print("=" * 60)
+
+    import time
+    from modules.component_index import ComponentIndex
+
+    try:
+        index = ComponentIndex([
+            {'id': 1, 'name': 'T-Motor F60 Pro', 'mass': 33.0},
+            {'id': 2, 'name': 'EMAX ECO II 2306', 'mass': 31.5},
+            {'id': 3, 'name': 'iFlight XING 2207', 'mass': 32.0},
+            {'id': 4, 'name': 'EMAX ECO II 2306', 'mass': 31.5},
+            {'id': 5, 'name': 'Pro Motor', 'mass': 40.0}
+        ])
+        assert [c['id'] for c in index.search('emax')] == [2, 4]
+        assert [c['id'] for c in index.search('pro')] == [5, 1], "Совпадение начала названия идет первым"
+        assert [c['id'] for c in index.search('eco 2306')] == [2, 4]
+        assert [c['id'] for c in index.search('xing 2306')] == []
+        assert len(index.search('', limit=3)) == 3 and index.search('zzz') == []
+        print("✓ Поиск по началу названия и словам названия")
+
+        index.add({'id': 6, 'name': 'Zeta Motor', 'mass': 20.0})
+        assert index.remove(4) is True and index.remove(4) is False
+        index.add({'id': 2, 'name': 'EMAX Eco 2207', 'mass': 30.0})
+        assert [c['id'] for c in index.search('motor')] == [1, 5, 6]
+        assert [c['id'] for c in index.search('emax 2207')] == [2] and 4 not in index
+        assert index.get(2)['mass'] == 30.0 and len(index) == 5
+        print("✓ Добавление, изменение и удаление обновляют индекс")
+
+        names = ['Alpha', 'Beta', 'Gamma', 'Delta']
+        big = ComponentIndex(
+            {'id': i, 'name': f"{names[i % 4]} X{i} {i % 97}", 'mass': 1.0} for i in range(50000)
+        )
+        started = time.perf_counter()
+        for query in ['a', 'beta x1', 'x', '42', 'gamma 5', 'delta x49']:
+            for _ in range(100):
+                assert len(big.search(query, limit=8)) <= 8
+        elapsed = time.perf_counter() - started
+        assert big.search('beta x1')[0]['name'].startswith('Beta X1')
+        assert elapsed < 2.0, f"Поиск слишком медленный: {elapsed:.2f} с"
+        print(f"✓ 600 запросов к каталогу из 50000 компонентов: {elapsed * 1000:.1f} мс")
+
+        print("\n Поисковый индекс компонентов работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в поисковом индексе: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_change_events():
+    """Тестирование уведомлений об изменениях базы данных"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 23: Уведомления об изменениях")
+    print("=" * 60)
+
+    from database.db_manager import DatabaseManager
+    from modules.component_index import ComponentIndex
+
+    test_db_path = "database/test_change_events.db"
+    try:
+        db = DatabaseManager(test_db_path)
+        events = []
+        db.subscribe(events.append)
+
+        component_id = db.add_component('motors', {'name': 'Event Motor', 'mass': 25.0})
+        assert events[-1] == {'table': 'motors', 'inserted': [component_id], 'updated': [], 'deleted': []}
+        db.update_component('motors', component_id, {'mass': 26.0})
+        assert events[-1]['updated'] == [component_id]
+        db.delete_component('motors', component_id)
+        assert events[-1]['deleted'] == [component_id]
+        print("✓ Добавление, изменение и удаление компонента передают ID")
+
+        db.add_components('motors', [{'name': f'Bulk {i}', 'mass': 10.0 + i} for i in range(1200)])
+        inserted = events[-1]['inserted']
+        assert len(inserted) == 1200
+        rows = db.get_components_by_ids('motors', inserted)
+        assert [row['id'] for row in rows] == inserted, "ID пакетной вставки не совпадают со строками"
+        assert rows[0]['name'] == 'Bulk 0' and rows[-1]['name'] == 'Bulk 1199'
+        print("✓ Пакетная вставка передает ID всех строк, строки читаются порциями")
+
+        calc_id = db.save_calculation({'total_mass': 100.0})
+        assert events[-1] == {'table': 'calculations_history', 'inserted': [calc_id], 'updated': [], 'deleted': []}
+        db.unsubscribe(events.append)
+        count = len(events)
+        db.delete_calculation(calc_id)
+        assert len(events) == count, "После отписки события не должны приходить"
+        print("✓ События истории и отписка работают")
+
+        components = db.get_components('motors')
+        index = ComponentIndex(components[:10])
+        index.add_many(components[10:])
+        index.add_many([dict(components[0], name='Renamed Motor')] + components[1:40])
+        rebuilt = ComponentIndex([dict(components[0], name='Renamed Motor')] + components[1:])
+        for query in ['bulk 11', 'renamed', 'motor', '']:
+            assert index.search(query, 15) == rebuilt.search(query, 15), query
+        print("✓ Пакетное обновление индекса совпадает с полным построением")
+
+        os.remove(test_db_path)
+
+        print("\n Уведомления об изменениях работают корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в уведомлениях об изменениях: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_batch_cli():
+    """Тестирование командной строки пакетных расчетов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 24: Командная строка пакетных расчетов")
+    print("=" * 60)
+
+    import csv
+    import io
+    import json
+    import shutil
+    import cli
+    from database.db_manager import DatabaseManager
+
+    test_db_path = "database/test_batch_cli.db"
+    reports_dir = "database/test_cli_reports"
+    try:
+        db = DatabaseManager(test_db_path)
+        frame_id = db.add_component('frames', {'name': 'CLI Frame', 'mass': 300.0})
+        motor_id = db.add_component('motors', {'name': 'CLI Motor', 'mass': 50.0})
+        del db
+
+        csv_input = (
+            "label,frame,motor,motor_qty\n"
+            f"ids,{frame_id},{motor_id},4\n"
+            "names,cli frame,CLI Motor,\n"
+            "unknown,Missing Frame,,\n"
+            f"bad_qty,{frame_id},{motor_id},x\n"
+            "empty,,,\n"
+        )
+        rows = list(cli.read_configurations(io.StringIO(csv_input), 'csv'))
+        output = io.StringIO()
+        stats = cli.run(rows, output, test_db_path, workers=1, chunk_size=2)
+        results = list(csv.DictReader(io.StringIO(output.getvalue())))
+        assert [r['total_mass'] for r in results] == ['500.0', '350.0', '', '', '']
+        assert results[0]['category'] and results[0]['error'] == ''
+        assert 'Missing Frame' in results[2]['error'] and results[3]['error'] and results[4]['error']
+        assert stats['rows'] == 5 and stats['valid'] == 2 and stats['rejected'] == 3
+        print("✓ Конфигурации по ID и названиям рассчитаны, ошибки строк отклонены")
+
+        jsonl_input = "\n".join(json.dumps(row) for row in rows) + "\n"
+        jsonl_rows = list(cli.read_configurations(io.StringIO(jsonl_input), 'jsonl'))
+        parallel = io.StringIO()
+        cli.run(jsonl_rows, parallel, test_db_path, workers=2, chunk_size=2)
+        assert parallel.getvalue() == output.getvalue(), "Параллельный вывод отличается от последовательного"
+        print("✓ JSON Lines и параллельный расчет дают тот же результат в том же порядке")
+
+        cli.run(rows, io.StringIO(), test_db_path, output_format='jsonl',
+                reports_dir=reports_dir, report_format='json')
+        assert sorted(os.listdir(reports_dir)) == ['report_00000001.json', 'report_00000002.json']
+        with open(os.path.join(reports_dir, 'report_00000001.json'), encoding='utf-8') as f:
+            assert json.load(f)['total_mass'] == 500.0
+        print("✓ Отчеты по валидным конфигурациям записаны")
+
+        shutil.rmtree(reports_dir)
+        os.remove(test_db_path)
+
+        print("\n Командная строка пакетных расчетов работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в командной строке пакетных расчетов: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_calculation_service():
+    """Тестирование HTTP-сервиса расчетов"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 25: HTTP-сервис расчетов")
+    print("=" * 60)
+
+    import http.client
+    import json
+    import threading
+    from database.db_manager import DatabaseManager
+    from modules.service import BackgroundServer
+
+    test_db_path = "database/test_service.db"
+    background = None
+    try:
+        db = DatabaseManager(test_db_path)
+        frame_id = db.add_component('frames', {'name': 'Service Frame', 'mass': 300.0})
+        motor_id = db.add_component('motors', {'name': 'Service Motor', 'mass': 50.0})
+        background = BackgroundServer(db, batch_window=0.01)
+        port = background.start()
+
+        def request(method, path, body=None, connection=None):
+            connection = connection or http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            connection.request(method, path, body=json.dumps(body) if body is not None else None)
+            response = connection.getresponse()
+            data = response.read().decode('utf-8')
+            if response.getheader('Content-Type').startswith('application/json'):
+                data = json.loads(data)
+            return response.status, data
+
+        status, found = request('GET', '/components/motor?q=service')
+        assert status == 200 and [c['id'] for c in found] == [motor_id]
+        assert request('GET', f'/components/frame/{frame_id}')[1]['name'] == 'Service Frame'
+        db.add_component('motors', {'name': 'Service Motor Pro', 'mass': 60.0})
+        assert len(request('GET', '/components/motor?q=service')[1]) == 2, "Кэш каталога не обновлен"
+        print("✓ Поиск по каталогу и обновление кэша после изменения")
+
+        configuration = {'frame': frame_id, 'motor': 'service motor', 'motor_qty': 4}
+        status, result = request('POST', '/calculate', {'configuration': configuration, 'save': True})
+        assert status == 200 and result['total_mass'] == 500.0 and result['calc_id']
+        assert result['components']['motor']['quantity'] == 4
+        status, result = request('POST', '/calculate', {'configuration': {'frame': 'Missing'}})
+        assert status == 400 and 'Missing' in result['error']
+        status, batch = request('POST', '/calculate/batch', {'configurations': [
+            configuration, {'motor': motor_id, 'motor_qty': -1}, {}]})
+        assert [r['total_mass'] for r in batch['results']] == [500.0, None, None]
+        assert all(r['error'] for r in batch['results'][1:])
+        print("✓ Одиночный и пакетный расчет, ошибки конфигураций")
+
+        def client(results):
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            for qty in range(1, 11):
+                results.append(request('POST', '/calculate', {
+                    'configuration': {'motor': motor_id, 'motor_qty': qty}}, connection)[1]['total_mass'])
+
+        results = []
+        threads = [threading.Thread(target=client, args=(results,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == sorted(50.0 * qty for qty in range(1, 11) for _ in range(8))
+        batcher = background.service.batcher
+        assert batcher.batches < batcher.requests, "Одновременные расчеты не объединены в пакеты"
+        print(f"✓ {batcher.requests} одиночных расчетов выполнены {batcher.batches} пакетами")
+
+        status, history = request('GET', '/history?limit=10')
+        assert status == 200 and history['count'] == 1 and history['items'][0]['total_mass'] == 500.0
+        assert history['limit'] == 10 and history['next'] is None
+        calc_id = history['items'][0]['id']
+        assert request('GET', f'/history?before={calc_id}')[1]['items'] == []
+        status, report = request('GET', f'/history/{calc_id}/report?format=json')
+        assert status == 200 and report['total_mass'] == 500.0 and report['calc_id'] == calc_id
+        status, report = request('POST', '/report', {'configuration': configuration, 'format': 'text'})
+        assert status == 200 and 'Service Frame' in report
+        print("✓ История и отчеты")
+
+        assert request('GET', '/history/999999')[0] == 404
+        assert request('GET', '/unknown')[0] == 404
+        assert request('DELETE', '/history')[0] == 405
+        assert request('GET', f'/history/{calc_id}/report?format=pdf')[0] == 400
+
+        # Строка запроса длиннее лимита StreamReader
+        import socket
+        with socket.create_connection(('127.0.0.1', port), timeout=10) as raw:
+            raw.sendall(b'GET /' + b'a' * 70000 + b' HTTP/1.1\r\n\r\n')
+            response = b''
+            while True:
+                chunk = raw.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+        assert response.startswith(b'HTTP/1.1 400 ') and b'Connection: close' in response
+
+        assert request('POST', '/report', {'configuration': configuration, 'format': ['json']})[0] == 400
+        assert request('POST', '/report', {'format': 'json'})[0] == 400
+        assert request('POST', '/calculate', {'configuration': {'frame': {'id': 1}}})[0] == 400
+
+        # Ошибка сервера не выдается за ошибку клиента
+        async def broken(calc_id):
+            raise KeyError('frame_mass')
+        background.service.get_calculation = broken
+        status, result = request('GET', f'/history/{calc_id}')
+        assert status == 500 and 'frame_mass' in result['error']
+        del background.service.get_calculation
+        print("✓ Ошибки запросов возвращают коды 400/404/405, ошибки сервера - 500")
+
+        background.stop()
+        background = None
+        os.remove(test_db_path)
+
+        print("\n HTTP-сервис расчетов работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в HTTP-сервисе расчетов: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if background is not None:
+            background.stop()
+
+
+def test_database_concurrency():
+    """Тестирование потокобезопасности менеджера базы данных"""
+    print("\n" + "=" * 60)
+    print("ТЕСТ 26: Параллельный доступ к базе данных")
+    print("=" * 60)
+
+    import sqlite3
+    import threading
+    from database.db_manager import DatabaseManager
+
+    test_db_path = "database/test_concurrency.db"
+    try:
+        db = DatabaseManager(test_db_path)
+        # Второй менеджер того же файла - как другой процесс со своими соединениями
+        other = DatabaseManager(test_db_path, busy_timeout=0.05)
+        events = []
+        db.subscribe(events.append)
+        base_motors = len(db.get_components('motors'))
+
+        errors = []
+        kept = []
+
+        def worker(number):
+            manager = db if number % 2 == 0 else other
+            try:
+                for i in range(25):
+                    component_id = manager.add_component('motors', {'name': f'T{number}-{i}', 'mass': 10.0 + i})
+                    assert manager.get_component_by_id('motors', component_id)['name'] == f'T{number}-{i}'
+                    manager.update_component('motors', component_id, {'mass': 20.0 + i})
+                    manager.save_calculation({'total_mass': float(i), 'motor_id': component_id})
+                    manager.get_calculation_page(None, 10)
+                    manager.get_components('motors')
+                    if i % 5 == 0:
+                        manager.delete_component('motors', component_id)
+                    else:
+                        kept.append(component_id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors, f"Ошибки потоков: {errors[:3]}"
+        motors = db.get_components('motors')
+        assert len(motors) == base_motors + len(kept) == base_motors + 16 * 20
+        assert all(c['mass'] >= 20.0 for c in db.get_components_by_ids('motors', kept))
+        assert db.get_calculation_history_bounds()[0] == 16 * 25
+        # Менеджер уведомляет о своих изменениях: 8 потоков x (25 x 3 записи + 5 удалений)
+        assert len(events) == 8 * (25 * 3 + 5)
+        print(f"✓ 16 потоков выполнили {16 * 25 * 6} операций без ошибок, данные согласованы")
+
+        try:
+            db.add_component('motors', {'no_such_column': 1})
+            raise AssertionError("Ожидалась ошибка записи")
+        except sqlite3.OperationalError:
+            pass
+        assert len(db.get_components('motors')) == len(motors), "Ошибочная запись не откатилась"
+        print("✓ Ошибка одной записи не влияет на данные")
+
+        # Внешняя транзакция держит блокировку дольше busy_timeout: запись повторяется
+        blocker = sqlite3.connect(test_db_path, isolation_level=None, check_same_thread=False)
+        blocker.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.3, lambda: blocker.execute("COMMIT"))
+        release.start()
+        calc_id = other.save_calculation({'total_mass': 1.0})
+        release.join()
+        blocker.close()
+        assert calc_id and other.get_calculations_by_ids([calc_id])
+        print("✓ Запись дождалась снятия внешней блокировки (повтор с задержкой)")
+
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return 'ok'
+
+        assert db._retry(flaky) == 'ok' and len(attempts) == 3
+        try:
+            db._retry(lambda: (_ for _ in ()).throw(sqlite3.OperationalError("no such table: x")))
+            raise AssertionError("Ошибка, не связанная с блокировкой, не должна повторяться")
+        except sqlite3.OperationalError as e:
+            assert 'no such table' in str(e)
+        print("✓ Повторяются только ошибки занятой базы данных")
+
+        count = db.get_calculation_history_bounds()[0]
+        assert DatabaseManager(test_db_path).get_calculation_history_bounds()[0] == count
+        print("✓ История сохраняется при создании нового менеджера")
+
+        os.remove(test_db_path)
+
+        print("\n Параллельный доступ к базе данных работает корректно!")
+        return True
+
+    except Exception as e:
+        print(f"\n Ошибка в параллельном доступе к базе данных: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Главная функция тестирования"""
     print("\n" + "=" * 60)
@@ -222,6 +1788,28 @@ def main():
     results.append(("Калькулятор", test_calculator()))
     results.append(("Визуализация", test_visualizer()))
     results.append(("Генерация отчетов", test_report_generator()))
+    results.append(("Пакетные расчеты", test_analysis()))
+    results.append(("Параллельный перебор", test_sweep()))
+    results.append(("Весовые категории", test_categories()))
+    results.append(("Пакетная валидация", test_bulk_validation()))
+    results.append(("Потоковые отчеты", test_batch_reports()))
+    results.append(("Экспорт в архив", test_zip_export()))
+    results.append(("Кэш отчетов", test_report_cache()))
+    results.append(("HTML и PDF отчеты", test_html_pdf_reports()))
+    results.append(("Сравнение конфигураций", test_comparison_report()))
+    results.append(("Повторное использование фигур", test_figure_reuse()))
+    results.append(("Кэш диаграмм", test_chart_cache()))
+    results.append(("Фоновая отрисовка диаграмм", test_chart_render_pool()))
+    results.append(("Отложенная загрузка", test_lazy_imports()))
+    results.append(("Аналитика истории", test_history_analytics()))
+    results.append(("Постраничная история", test_history_pager()))
+    results.append(("Фоновые задачи", test_task_runner()))
+    results.append(("Живой пересчет", test_live_calculation()))
+    results.append(("Поисковый индекс", test_component_index()))
+    results.append(("Уведомления об изменениях", test_change_events()))
+    results.append(("Командная строка", test_batch_cli()))
+    results.append(("HTTP-сервис", test_calculation_service()))
+    results.append(("Параллельный доступ к БД", test_database_concurrency()))
 
     # Итоговые результаты
     print("\n" + "=" * 60)